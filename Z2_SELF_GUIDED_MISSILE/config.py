@@ -1,6 +1,11 @@
+import os
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import BaseModel
-from typing import List
+from typing import List, Literal
+
+# Relative paths in the settings are resolved against the package, not the working directory
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
 # Launcher settings
@@ -50,9 +55,33 @@ class FuzzyRules(BaseModel):
 
 class FuzzySettings(BaseModel):
     fuzzy_rules: FuzzyRules = FuzzyRules()
+    # Inference of the launcher scan: "discrete" as in skfuzzy, "analytic" on the breakpoints of the
+    # membership functions or "lookup" from precomputed control surfaces, see fuzzy_logic/engine.py and lookup.py
+    inference: Literal["discrete", "analytic", "lookup"] = "discrete"
+    lookup_resolution: int = 65
 
 class Settings(BaseSettings):
     launcher_settings: LauncherSettings = LauncherSettings()
     missile_settings: MissileSettings = MissileSettings()
     fuzzy_settings: FuzzySettings = FuzzySettings()
     model_config = SettingsConfigDict()
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Reads the settings once, later calls return the same object.
+
+    :return: The settings.
+    """
+    return Settings()
+
+
+def package_path(path: str) -> str:
+    """
+    Resolves a path relative to the package directory, absolute paths are kept.
+
+    :param path: The path, e.g. a rules url from the settings.
+    :return: The absolute path.
+    """
+    return os.path.normpath(os.path.join(PACKAGE_DIR, path))
@@ -0,0 +1,145 @@
+import argparse
+import time
+import numpy as np
+
+from skfuzzy import control as ctrl
+from typing import Dict, List, Tuple
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.engine import FuzzyEngine
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.threat_level import get_threat_level_engine
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.shot_decision import get_shot_decision_engine
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.missile_choice import get_missile_choice_engine
+
+
+def sample_inputs(engine: FuzzyEngine, count: int, rng: np.random.Generator) -> List[Dict[str, float]]:
+    """
+    Draws random inputs from the universes of the antecedents.
+    Binary antecedents, such as weapon, get one of their two values.
+
+    :param engine: The controller to draw inputs for.
+    :param count: Number of input sets.
+    :param rng: Random number generator.
+    :return: The input sets, by antecedent name.
+    """
+    columns = {}
+    for name, antecedent in engine.antecedents.items():
+        universe = antecedent.universe
+        if len(universe) <= 2:
+            columns[name] = rng.choice(universe, count)
+        else:
+            columns[name] = rng.uniform(universe.min(), universe.max(), count)
+    return [{name: float(values[i]) for name, values in columns.items()} for i in range(count)]
+
+
+def per_call_evaluate(engine: FuzzyEngine, inputs: Dict[str, float]) -> float:
+    """
+    Runs the inference the way the controllers used to, building the control system on every call.
+
+    :param engine: The controller whose rules are used.
+    :param inputs: Crisp value of every antecedent, by its name.
+    :return: The defuzzified output.
+    """
+    simulation = ctrl.ControlSystemSimulation(ctrl.ControlSystem(engine.rules))
+    for name, value in inputs.items():
+        simulation.input[name] = value
+    simulation.compute()
+    return simulation.output[engine.consequent.label]
+
+
+def difference(expected: np.ndarray, actual: np.ndarray) -> Tuple[float, int]:
+    """
+    Compares the outputs of two paths, NaN where no rule fires.
+
+    :param expected: Outputs of the reference path.
+    :param actual: Outputs of the path checked.
+    :return: The largest difference where both are defined and the number of outputs defined by one path only.
+    """
+    expected, actual = np.asarray(expected, dtype=float), np.asarray(actual, dtype=float)
+    mismatches = int(np.count_nonzero(np.isnan(expected) != np.isnan(actual)))
+    defined = ~np.isnan(expected) & ~np.isnan(actual)
+    return float(np.max(np.abs(expected[defined] - actual[defined]), initial=0.0)), mismatches
+
+
+def benchmark(engine: FuzzyEngine, samples: List[Dict[str, float]], batch_size: int) -> Dict[str, float]:
+    """
+    Times the per-call path against the compiled engine, its batch and its analytic inference on the same inputs.
+    The batch and analytic inferences are timed on a batch of batch_size inputs, repeating the samples.
+
+    :param engine: The controller to benchmark.
+    :param samples: The input sets.
+    :param batch_size: Number of inputs evaluated by one batch inference.
+    :return: Microseconds per evaluation of every path, the speedup of the engine, and for the engine, the batch
+        and the analytic inference the largest difference of the outputs from the per-call path and the number
+        of outputs where only one of them is NaN, see difference.
+    """
+    start = time.perf_counter()
+    expected = [per_call_evaluate(engine, inputs) for inputs in samples]
+    per_call = time.perf_counter() - start
+
+    # The skfuzzy control system is built on first use, that is not part of an evaluation
+    engine.simulation
+    start = time.perf_counter()
+    actual = [engine.evaluate(**inputs) for inputs in samples]
+    compiled = time.perf_counter() - start
+
+    columns = {name: np.array([inputs[name] for inputs in samples]) for name in engine.antecedents}
+    batch = engine.evaluate_batch(**columns)
+    analytic = engine.evaluate_analytic(**columns)
+    columns = {name: np.resize(values, batch_size) for name, values in columns.items()}
+    start = time.perf_counter()
+    engine.evaluate_batch(**columns)
+    batched = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.evaluate_analytic(**columns)
+    analytic_seconds = time.perf_counter() - start
+
+    max_error, nan_mismatches = difference(expected, actual)
+    batch_max_error, batch_nan_mismatches = difference(expected, batch)
+    analytic_max_error, analytic_nan_mismatches = difference(expected, analytic)
+    return {
+        "per_call_us": per_call / len(samples) * 1e6,
+        "engine_us": compiled / len(samples) * 1e6,
+        "speedup": per_call / compiled,
+        "batch_us": batched / batch_size * 1e6,
+        "analytic_us": analytic_seconds / batch_size * 1e6,
+        "max_error": max_error,
+        "batch_max_error": batch_max_error,
+        "analytic_max_error": analytic_max_error,
+        "nan_mismatches": nan_mismatches + batch_nan_mismatches + analytic_nan_mismatches,
+    }
+
+
+def main():
+    """
+    Benchmarks the compiled fuzzy controllers against building them on every call,
+    exits with an error if the outputs differ by more than the tolerances or are NaN for one path only.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark of the compiled fuzzy controllers.")
+    parser.add_argument("--samples", type=int, default=20, help="input sets per controller")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the inputs")
+    parser.add_argument("--batch-size", type=int, default=1000, help="inputs evaluated by one batch inference")
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="largest accepted output difference")
+    parser.add_argument("--analytic-tolerance", type=float, default=0.05,
+                        help="largest accepted output difference of the analytic inference")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    engines = {"threat_level": get_threat_level_engine(), "shot_decision": get_shot_decision_engine(),
+               "missile_choice": get_missile_choice_engine()}
+    failed = False
+    for name, engine in engines.items():
+        result = benchmark(engine, sample_inputs(engine, args.samples, rng), args.batch_size)
+        failed |= max(result["max_error"], result["batch_max_error"]) > args.tolerance
+        failed |= result["analytic_max_error"] > args.analytic_tolerance
+        failed |= result["nan_mismatches"] > 0
+        print(f"{name:15} per call {result['per_call_us']:9.1f} us  engine {result['engine_us']:8.1f} us  "
+              f"speedup {result['speedup']:5.1f}x  max error {result['max_error']:.2e}  "
+              f"batch {result['batch_us']:6.1f} us  max error {result['batch_max_error']:.2e}  "
+              f"analytic {result['analytic_us']:5.1f} us  max error {result['analytic_max_error']:.2e}  "
+              f"NaN mismatches {result['nan_mismatches']}")
+    if failed:
+        raise SystemExit(f"Outputs differ by more than {args.tolerance} ({args.analytic_tolerance} analytic) "
+                         f"or are NaN for one path only.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,317 @@
+import json
+import numpy as np
+from functools import cached_property, reduce
+from operator import and_
+from typing import Callable, Dict, List, Optional, Tuple
+
+from skfuzzy import control as ctrl
+from Z2_SELF_GUIDED_MISSILE.config import get_settings, package_path
+
+
+def defuzzify_batch(variable: ctrl.Consequent, cuts: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Centroid defuzzification of many clipped outputs at once, computed the way skfuzzy does it:
+    the universe is upsampled with the points where each term crosses its cut, the aggregated
+    membership is evaluated on those points and integrated as a piecewise linear function.
+
+    :param variable: The output variable.
+    :param cuts: Activation of every term fired by the rules, one value per evaluation.
+    :return: The defuzzified outputs, NaN where no term is activated.
+    """
+    universe = variable.universe.astype(float)
+    count = len(next(iter(cuts.values())))
+    points = [np.broadcast_to(universe, (count, len(universe)))]
+    for label, cut in cuts.items():
+        mf = variable[label].mf
+        cut = cut[:, None]
+        # A zero cut only counts the points where the term rises above zero, as in skfuzzy
+        above = np.where(cut == 0, mf > cut, mf >= cut)
+        crossing = above[:, 1:] != above[:, :-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = universe[:-1] + (cut - mf[:-1]) * np.diff(universe) / np.diff(mf)
+        # Points that are not crossings repeat the end of the universe, a segment of zero width adds nothing
+        points.append(np.where(crossing, x, universe[-1]))
+    x = np.sort(np.concatenate(points, axis=1), axis=1)
+
+    membership = np.zeros_like(x)
+    for label, cut in cuts.items():
+        clipped = np.minimum(cut[:, None], np.interp(x, universe, variable[label].mf, left=0.0, right=0.0))
+        np.maximum(membership, clipped, membership)
+
+    return centroid_batch(x, membership)
+
+
+def centroid_batch(x: np.ndarray, membership: np.ndarray) -> np.ndarray:
+    """
+    Centroids of piecewise linear membership functions, integrated exactly between the given points.
+
+    :param x: Sorted points, one row per function.
+    :param membership: Membership at the points.
+    :return: The centroids, NaN where the membership is zero everywhere.
+    """
+    # Area and first moment of every trapezoid between two neighbouring points
+    width = np.diff(x, axis=1)
+    y1, y2 = membership[:, :-1], membership[:, 1:]
+    area = 0.5 * width * (y1 + y2)
+    moment = width * width / 3 * (y2 + 0.5 * y1) + x[:, :-1] * area
+    result = moment.sum(axis=1) / np.fmax(area.sum(axis=1), np.finfo(float).eps)
+    result[membership.sum(axis=1) == 0] = np.nan
+    return result
+
+
+def breakpoints(universe: np.ndarray, mf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compresses a sampled membership function to the points where its slope changes.
+    Interpolating between them gives the same function as interpolating between all samples,
+    a triangle sampled on any universe keeps at most four points.
+
+    :param universe: The universe of the variable.
+    :param mf: Membership at every point of the universe.
+    :return: The points and the membership at them.
+    """
+    universe = universe.astype(float)
+    mf = mf.astype(float)
+    slopes = np.diff(mf) / np.diff(universe)
+    kinks = np.flatnonzero(~np.isclose(slopes[1:], slopes[:-1], rtol=0.0, atol=1e-12)) + 1
+    keep = np.concatenate(([0], kinks, [len(universe) - 1]))
+    return universe[keep], mf[keep]
+
+
+def defuzzify_analytic(terms: Dict[str, Tuple[np.ndarray, np.ndarray]], cuts: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Exact centroid defuzzification of clipped piecewise linear terms, such as triangles, in closed form.
+    Between the breakpoints of the terms, the points where they cross their cuts and the points where
+    two clipped terms intersect, the aggregated membership is linear, so integrating over those few
+    points is exact and the cost does not depend on the resolution of the universe.
+
+    :param terms: Breakpoints of every term of the output variable, see breakpoints.
+    :param cuts: Activation of every term fired by the rules, one value per evaluation.
+    :return: The defuzzified outputs, NaN where no term is activated.
+    """
+    count = len(next(iter(cuts.values())))
+    fixed = np.unique(np.concatenate([terms[label][0] for label in cuts]))
+    # Points that are not crossings repeat the start of the universe, a segment of zero width adds nothing
+    points = [np.broadcast_to(fixed, (count, len(fixed)))]
+    for label, cut in cuts.items():
+        bx, by = terms[label]
+        cut = cut[:, None]
+        crossing = (by[:-1] - cut) * (by[1:] - cut) < 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = bx[:-1] + (cut - by[:-1]) * np.diff(bx) / np.diff(by)
+        points.append(np.where(crossing, x, fixed[0]))
+    x = np.sort(np.concatenate(points, axis=1), axis=1)
+
+    # Every clipped term is linear between these points, two of them intersect at most once in each interval
+    clipped = [np.minimum(cut[:, None], np.interp(x, *terms[label])) for label, cut in cuts.items()]
+    for i, first in enumerate(clipped):
+        for second in clipped[i + 1:]:
+            difference = first - second
+            left, right = difference[:, :-1], difference[:, 1:]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                intersection = x[:, :-1] + np.diff(x, axis=1) * left / (left - right)
+            points.append(np.where(left * right < 0, intersection, fixed[0]))
+    x = np.sort(np.concatenate(points, axis=1), axis=1)
+
+    membership = np.zeros_like(x)
+    for label, cut in cuts.items():
+        np.maximum(membership, np.minimum(cut[:, None], np.interp(x, *terms[label])), membership)
+    return centroid_batch(x, membership)
+
+
+class FuzzyEngine:
+    """
+    Fuzzy controller compiled once from its variable definitions and a rules JSON file.
+    The skfuzzy control system and its simulation are built on the first scalar evaluation and reused by
+    the later ones, so an evaluation only fuzzifies the inputs, fires the rules and defuzzifies the output.
+    The batch and analytic inferences do not need them.
+    """
+
+    def __init__(self, antecedents: List[ctrl.Antecedent], consequent: ctrl.Consequent, rules_path: str):
+        """
+        Compiles the controller.
+
+        :param antecedents: Input variables, named as in the rule conditions.
+        :param consequent: Output variable, its terms are the rule actions.
+        :param rules_path: Path to the rules JSON file, a list of {"conditions": {...}, "action": ...}.
+        """
+        self.antecedents = {antecedent.label: antecedent for antecedent in antecedents}
+        self.consequent = consequent
+        self.rules_path = rules_path
+        rules = self.load_rules(rules_path)
+        self.rules = self.compile_rules(rules)
+        # The same rules as plain term names, for the batch inference
+        self.conditions: List[Tuple[List[Tuple[str, str]], str]] = [
+            (list(rule['conditions'].items()), rule['action']) for rule in rules]
+        # Membership functions reduced to their breakpoints, for the analytic inference
+        self.breakpoints = {(name, label): breakpoints(antecedent.universe, term.mf)
+                            for name, antecedent in self.antecedents.items()
+                            for label, term in antecedent.terms.items()}
+        self.output_breakpoints = {label: breakpoints(consequent.universe, term.mf)
+                                   for label, term in consequent.terms.items()}
+        self._simulation: Optional[ctrl.ControlSystemSimulation] = None
+
+    @property
+    def simulation(self) -> ctrl.ControlSystemSimulation:
+        """
+        Returns the skfuzzy simulation of the controller, building the control system on first use.
+        Building it takes most of the time of compiling a controller.
+
+        :return: The simulation.
+        """
+        if self._simulation is None:
+            # Results of repeated inputs are cached by skfuzzy, the cache is flushed every 1000 runs
+            self._simulation = ctrl.ControlSystemSimulation(ctrl.ControlSystem(self.rules))
+        return self._simulation
+
+    @staticmethod
+    def load_rules(rules_path: str) -> List[dict]:
+        """
+        Reads the rules from a JSON file.
+
+        :param rules_path: Path to the rules JSON file.
+        :return: The rules as loaded from the file.
+        """
+        with open(rules_path, 'r') as file:
+            return json.load(file)
+
+    def compile_rules(self, rules: List[dict]) -> List[ctrl.Rule]:
+        """
+        Turns the rules loaded from JSON into skfuzzy rules, the conditions of a rule are joined with AND.
+
+        :param rules: Rules as loaded from the JSON file.
+        :return: The skfuzzy rules.
+        :raises ValueError: If a rule refers to an unknown variable.
+        """
+        formatted_rules = []
+        for rule in rules:
+            conditions = rule['conditions']
+            unknown = set(conditions) - set(self.antecedents)
+            if unknown:
+                raise ValueError(f"Unknown variables {sorted(unknown)} in {self.rules_path}.")
+            antecedent = reduce(and_, (self.antecedents[name][term] for name, term in conditions.items()))
+            formatted_rules.append(ctrl.Rule(antecedent, self.consequent[rule['action']]))
+        return formatted_rules
+
+    def evaluate(self, **inputs: float) -> float:
+        """
+        Runs the inference for a single set of inputs.
+
+        :param inputs: Crisp value of every antecedent, by its name.
+        :return: The defuzzified output.
+        """
+        for name, value in inputs.items():
+            self.simulation.input[name] = value
+        self.simulation.compute()
+        return self.simulation.output[self.consequent.label]
+
+    def fuzzify_batch(self, inputs: Dict[str, np.ndarray],
+                      analytic: bool = False) -> Dict[Tuple[str, str], np.ndarray]:
+        """
+        Computes the membership of many inputs in every term of every antecedent.
+        Inputs outside a universe are clipped to it, as skfuzzy does.
+
+        :param inputs: Crisp values of every antecedent, by its name.
+        :param analytic: Whether to interpolate between the breakpoints instead of the whole universe.
+        :return: Membership degrees, by antecedent name and term.
+        """
+        memberships = {}
+        for name, antecedent in self.antecedents.items():
+            universe = antecedent.universe
+            values = np.clip(np.asarray(inputs[name], dtype=float), universe.min(), universe.max())
+            for label, term in antecedent.terms.items():
+                if analytic:
+                    memberships[name, label] = np.interp(values, *self.breakpoints[name, label])
+                else:
+                    memberships[name, label] = np.interp(values, universe, term.mf, left=0.0, right=0.0)
+        return memberships
+
+    def activate_batch(self, memberships: Dict[Tuple[str, str], np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Fires the rules: the firing strength of a rule is the minimum of its conditions,
+        the activation of an output term the maximum over the rules leading to it.
+
+        :param memberships: Membership degrees, by antecedent name and term.
+        :return: Activation of every output term fired by the rules.
+        """
+        cuts = {}
+        for conditions, action in self.conditions:
+            firing = reduce(np.fmin, (memberships[condition] for condition in conditions))
+            cuts[action] = np.fmax(cuts[action], firing) if action in cuts else firing
+        return cuts
+
+    def evaluate_batch(self, **inputs: np.ndarray) -> np.ndarray:
+        """
+        Runs the inference for many sets of inputs in one pass: memberships, rule firing strengths
+        (minimum of the conditions), activation of the output terms (maximum over the rules) and
+        centroid defuzzification are computed in NumPy, with the results of evaluate.
+
+        :param inputs: Crisp values of every antecedent, by its name, as arrays of the same length.
+        :return: The defuzzified outputs, NaN where no rule fires.
+        """
+        cuts = self.activate_batch(self.fuzzify_batch(inputs))
+        return defuzzify_batch(self.consequent, cuts)
+
+    def evaluate_analytic(self, **inputs: np.ndarray) -> np.ndarray:
+        """
+        Runs the inference for many sets of inputs on the breakpoints of the membership functions,
+        with the exact centroid of the clipped output terms. The cost does not depend on the
+        resolution of the universes. Where two output terms cross between two points of the
+        universe, skfuzzy misses the intersection, so the results differ from evaluate_batch there.
+
+        :param inputs: Crisp values of every antecedent, by its name, as arrays of the same length.
+        :return: The defuzzified outputs, NaN where no rule fires.
+        """
+        cuts = self.activate_batch(self.fuzzify_batch(inputs, analytic=True))
+        return defuzzify_analytic(self.output_breakpoints, cuts)
+
+
+class LazyController:
+    """
+    Fuzzy controller of a module, built on first use from its variables and the rules named in the settings.
+    Creating it builds nothing, so the modules defining controllers are cheap to import. The engine, its
+    lookup table and the batch inference chosen by the inference setting are each built once and reused.
+    """
+
+    def __init__(self, rules: str, variables: Callable[[], Tuple[List[ctrl.Antecedent], ctrl.Consequent]]):
+        """
+        :param rules: Name of the rules in the fuzzy_rules settings, e.g. 'threat'.
+        :param variables: Builds the input variables and the output variable of the controller.
+        """
+        self.rules = rules
+        self.variables = variables
+
+    @cached_property
+    def engine(self) -> FuzzyEngine:
+        """
+        Returns the compiled controller.
+
+        :return: The engine, with the rules path resolved against the package.
+        """
+        antecedents, consequent = self.variables()
+        url = getattr(get_settings().fuzzy_settings.fuzzy_rules, self.rules)['url']
+        return FuzzyEngine(antecedents, consequent, package_path(url))
+
+    @cached_property
+    def lookup(self) -> 'FuzzyLookupTable':
+        """
+        Returns the sampled control surface of the controller, see fuzzy_logic/lookup.py.
+
+        :return: The lookup table, built or loaded from the cache on its first evaluation.
+        """
+        # Imported here, the lookup module depends on this one
+        from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.lookup import FuzzyLookupTable
+        return FuzzyLookupTable(self.engine, get_settings().fuzzy_settings.lookup_resolution)
+
+    @cached_property
+    def batch(self) -> Callable[..., np.ndarray]:
+        """
+        Returns the batch inference chosen in the settings: "discrete" as in skfuzzy, "analytic" or "lookup".
+
+        :return: The batch inference, called with the inputs by antecedent name.
+        """
+        inference = get_settings().fuzzy_settings.inference
+        if inference == "lookup":
+            return self.lookup.evaluate_batch
+        if inference == "analytic":
+            return self.engine.evaluate_analytic
+        return self.engine.evaluate_batch
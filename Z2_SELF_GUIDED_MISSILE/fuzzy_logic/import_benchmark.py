@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from Z2_SELF_GUIDED_MISSILE.config import PACKAGE_DIR
+
+# Run in a fresh interpreter, so nothing is imported yet, and in a temporary directory,
+# so relative paths that depend on the working directory fail
+CHILD = '''
+import json
+import time
+start = time.perf_counter()
+import numpy, pygame, pydantic_settings, skfuzzy
+dependencies = time.perf_counter()
+import Z2_SELF_GUIDED_MISSILE.models.launcher
+launcher = time.perf_counter()
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.threat_level import calculate_threat_level_batch
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.shot_decision import calculate_shot_rightness_batch
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.missile_choice import calculate_required_missile_batch
+calculate_threat_level_batch(numpy.ones(1), numpy.ones(1), numpy.full(1, 500.0))
+calculate_shot_rightness_batch(numpy.full(1, 50.0), numpy.full(1, 600.0), numpy.full(1, 500.0))
+calculate_required_missile_batch(numpy.full(1, 500.0), numpy.full(1, 600.0), numpy.full(1, 500.0))
+first_use = time.perf_counter()
+print(json.dumps({"dependencies": dependencies - start, "launcher": launcher - dependencies,
+                  "first_use": first_use - launcher}))
+'''
+
+
+def measure(runs: int) -> dict:
+    """
+    Imports the launcher in fresh interpreters and times the import and the first fuzzy evaluation.
+
+    :param runs: Number of interpreters started.
+    :return: Median seconds of importing the dependencies, importing the launcher and building the
+        fuzzy controllers on first use.
+    """
+    environment = dict(os.environ, PYTHONPATH=os.path.dirname(PACKAGE_DIR))
+    timings = []
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, '-c', CHILD], cwd=directory, env=environment,
+                                    capture_output=True, text=True, check=True).stdout
+            timings.append(json.loads(output.splitlines()[-1]))
+    return {stage: statistics.median(timing[stage] for timing in timings) for stage in timings[0]}
+
+
+def main():
+    """
+    Prints the import time of the launcher and the time the fuzzy controllers take on first use.
+    """
+    parser = argparse.ArgumentParser(description="Import time benchmark of the launcher.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start")
+    args = parser.parse_args()
+
+    for stage, seconds in measure(args.runs).items():
+        print(f"{stage:13} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import numpy as np
+from typing import Dict, List, Optional, Union
+
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.engine import FuzzyEngine
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+DEFAULT_RESOLUTION = 65
+# Grid points evaluated by one batch inference while the table is built
+BUILD_CHUNK = 20_000
+# Version of the table contents, part of the hash so tables of an older version are rebuilt
+TABLE_FORMAT = 2
+
+
+class FuzzyLookupTable:
+    """
+    Control surface of a fuzzy controller sampled on a regular grid over the universes of its three inputs.
+    Outputs are answered by trilinear interpolation between the grid points, a few array lookups per input.
+    Grid points where no rule fires are kept as NaN and left out of the interpolation.
+    The table is built on first use and cached on disk, keyed by a hash of the rules, the membership
+    functions and the grid, so any change of those builds a new table.
+    """
+
+    def __init__(self, engine: FuzzyEngine, resolution: Union[int, Dict[str, int]] = DEFAULT_RESOLUTION,
+                 cache_dir: Optional[str] = CACHE_DIR):
+        """
+        :param engine: The controller to sample.
+        :param resolution: Grid points per input, for all inputs or by input name. Binary inputs,
+            such as weapon, are sampled on their two values only.
+        :param cache_dir: Directory of the cached tables, None to build the table in memory only.
+        """
+        self.engine = engine
+        self.cache_dir = cache_dir
+        self.axes: List[np.ndarray] = []
+        for name, antecedent in engine.antecedents.items():
+            universe = antecedent.universe.astype(float)
+            points = resolution if isinstance(resolution, int) else resolution.get(name, DEFAULT_RESOLUTION)
+            if len(universe) <= 2:
+                self.axes.append(universe)
+            else:
+                self.axes.append(np.linspace(universe.min(), universe.max(), points))
+        self.key = self.hash()
+        self._table: Optional[np.ndarray] = None
+
+    def hash(self) -> str:
+        """
+        Hashes everything the table depends on: the rules, the universes and membership functions of all
+        variables and the grid.
+
+        :return: Hex digest of the definitions.
+        """
+        digest = hashlib.sha256(json.dumps([TABLE_FORMAT, self.engine.conditions]).encode())
+        for variable in [*self.engine.antecedents.values(), self.engine.consequent]:
+            digest.update(variable.label.encode())
+            digest.update(np.asarray(variable.universe, dtype=float).tobytes())
+            for label, term in variable.terms.items():
+                digest.update(label.encode())
+                digest.update(np.asarray(term.mf, dtype=float).tobytes())
+        for axis in self.axes:
+            digest.update(axis.tobytes())
+        return digest.hexdigest()
+
+    @property
+    def path(self) -> Optional[str]:
+        """
+        Returns the file of the cached table.
+
+        :return: Path to the table, None if the table is not cached.
+        """
+        if self.cache_dir is None:
+            return None
+        name = os.path.splitext(os.path.basename(self.engine.rules_path))[0]
+        return os.path.join(self.cache_dir, f"{name}-{self.key[:16]}.npz")
+
+    @property
+    def table(self) -> np.ndarray:
+        """
+        Returns the sampled control surface, loading it from the cache or building it on first use.
+
+        :return: Outputs at the grid points, one axis per input.
+        """
+        if self._table is None:
+            if self.path is not None and os.path.exists(self.path):
+                with np.load(self.path) as cached:
+                    self._table = cached['table']
+            else:
+                self._table = self.build()
+                if self.path is not None:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    # Written under a temporary name first, a reader never sees half a table
+                    temporary = f"{self.path}.{os.getpid()}.tmp.npz"
+                    np.savez_compressed(temporary, table=self._table, key=self.key)
+                    os.replace(temporary, self.path)
+        return self._table
+
+    def build(self) -> np.ndarray:
+        """
+        Evaluates the controller at every grid point with the batch inference.
+        Points where no rule fires are stored as NaN, as the batch inference returns them.
+
+        :return: Outputs at the grid points, one axis per input.
+        """
+        grid = np.meshgrid(*self.axes, indexing='ij')
+        names = list(self.engine.antecedents)
+        flat = [points.ravel() for points in grid]
+        table = np.empty(flat[0].size)
+        for start in range(0, table.size, BUILD_CHUNK):
+            chunk = {name: points[start:start + BUILD_CHUNK] for name, points in zip(names, flat)}
+            table[start:start + BUILD_CHUNK] = self.engine.evaluate_batch(**chunk)
+        return table.reshape(grid[0].shape)
+
+    def evaluate_batch(self, **inputs: np.ndarray) -> np.ndarray:
+        """
+        Interpolates the outputs for many sets of inputs, a drop-in replacement of FuzzyEngine.evaluate_batch.
+        Inputs outside a universe are clipped to it. Corners of the cell where no rule fires are left out and
+        the weights of the others are scaled to sum to 1, so an undefined point does not pull its neighbours
+        towards 0.
+
+        :param inputs: Crisp values of every antecedent, by its name, as arrays of the same length.
+        :return: The interpolated outputs, NaN where no rule fires at any corner of the cell.
+        """
+        table = self.table
+        corners = [()]
+        weights = [1.0]
+        for name, axis in zip(self.engine.antecedents, self.axes):
+            values = np.clip(np.asarray(inputs[name], dtype=float), axis[0], axis[-1])
+            # Index of the grid cell and the position inside it, from 0 to 1
+            index = np.clip(np.searchsorted(axis, values, side='right') - 1, 0, len(axis) - 2)
+            fraction = (values - axis[index]) / (axis[index + 1] - axis[index])
+            corners = [corner + (i,) for corner in corners for i in (index, index + 1)]
+            weights = [weight * w for weight in weights for w in (1 - fraction, fraction)]
+        total = 0.0
+        defined_weight = 0.0
+        for corner, weight in zip(corners, weights):
+            values = table[corner]
+            defined = ~np.isnan(values)
+            total = total + np.where(defined, weight * values, 0.0)
+            defined_weight = defined_weight + np.where(defined, weight, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(defined_weight > 0, total / defined_weight, np.nan)
+
+    def evaluate(self, **inputs: float) -> float:
+        """
+        Interpolates the output for a single set of inputs.
+
+        :param inputs: Crisp value of every antecedent, by its name.
+        :return: The interpolated output.
+        """
+        return float(self.evaluate_batch(**{name: np.array([value]) for name, value in inputs.items()})[0])
+
+    def error_report(self, samples: int = 10_000, seed: int = 0) -> Dict[str, float]:
+        """
+        Measures the interpolation error against the batch inference on random inputs from the universes.
+        Inputs where no rule fires are left out.
+
+        :param samples: Number of random input sets.
+        :param seed: Seed of the inputs.
+        :return: Largest, mean and 99th percentile absolute error, and the number of inputs compared.
+        """
+        rng = np.random.default_rng(seed)
+        inputs = {name: rng.choice(axis, samples) if len(axis) <= 2 else rng.uniform(axis[0], axis[-1], samples)
+                  for name, axis in zip(self.engine.antecedents, self.axes)}
+        expected = self.engine.evaluate_batch(**inputs)
+        defined = ~np.isnan(expected)
+        error = np.abs(self.evaluate_batch(**inputs)[defined] - expected[defined])
+        return {
+            "max_error": float(error.max()),
+            "mean_error": float(error.mean()),
+            "p99_error": float(np.percentile(error, 99)),
+            "samples": int(defined.sum()),
+        }
@@ -1,47 +1,52 @@
-import json
 import numpy as np
 import skfuzzy as fuzz
 
+from typing import List, Tuple
 from skfuzzy import control as ctrl
-from Z2_SELF_GUIDED_MISSILE.config import Settings
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.engine import FuzzyEngine, LazyController
 
-# Antecedents
-distance = ctrl.Antecedent(np.arange(0, 3001, 1), 'distance')
-distance['close'] = fuzz.trimf(distance.universe, [0, 0, 1500])
-distance['medium'] = fuzz.trimf(distance.universe, [1400, 1800, 2200])
-distance['far'] = fuzz.trimf(distance.universe, [2000, 3000, 3000])
 
-speed = ctrl.Antecedent(np.arange(0, 1501, 1), 'speed')
-speed['slow'] = fuzz.trimf(speed.universe, [0, 0, 500])
-speed['medium'] = fuzz.trimf(speed.universe, [250, 500, 750])
-speed['fast'] = fuzz.trimf(speed.universe, [500, 1500, 1500])
+def _variables() -> Tuple[List[ctrl.Antecedent], ctrl.Consequent]:
+    """
+    Defines the inputs of the missile choice controller, distance, speed and altitude, and its output.
+
+    :return: The antecedents and the consequent.
+    """
+    # Antecedents
+    distance = ctrl.Antecedent(np.arange(0, 3001, 1), 'distance')
+    distance['close'] = fuzz.trimf(distance.universe, [0, 0, 1500])
+    distance['medium'] = fuzz.trimf(distance.universe, [1400, 1800, 2200])
+    distance['far'] = fuzz.trimf(distance.universe, [2000, 3000, 3000])
 
-altitude = ctrl.Antecedent(np.arange(0, 10001, 1), 'altitude')
-altitude['low'] = fuzz.trimf(altitude.universe, [0, 0, 1000])
-altitude['medium'] = fuzz.trimf(altitude.universe, [500, 1000, 5000])
-altitude['high'] = fuzz.trimf(altitude.universe, [4000, 10000, 10000])
+    speed = ctrl.Antecedent(np.arange(0, 1501, 1), 'speed')
+    speed['slow'] = fuzz.trimf(speed.universe, [0, 0, 500])
+    speed['medium'] = fuzz.trimf(speed.universe, [250, 500, 750])
+    speed['fast'] = fuzz.trimf(speed.universe, [500, 1500, 1500])
 
-# Consequent
-missile_type = ctrl.Consequent(np.arange(0, 3, 1), 'fire_missile')
-missile_type['short'] = fuzz.trimf(missile_type.universe, [0, 0, 1])
-missile_type['medium'] = fuzz.trimf(missile_type.universe, [0, 1, 2])
-missile_type['long'] = fuzz.trimf(missile_type.universe, [1, 2, 2])
+    altitude = ctrl.Antecedent(np.arange(0, 10001, 1), 'altitude')
+    altitude['low'] = fuzz.trimf(altitude.universe, [0, 0, 1000])
+    altitude['medium'] = fuzz.trimf(altitude.universe, [500, 1000, 5000])
+    altitude['high'] = fuzz.trimf(altitude.universe, [4000, 10000, 10000])
 
-# Rules
-formatted_rules = []
+    # Consequent
+    missile_type = ctrl.Consequent(np.arange(0, 3, 1), 'fire_missile')
+    missile_type['short'] = fuzz.trimf(missile_type.universe, [0, 0, 1])
+    missile_type['medium'] = fuzz.trimf(missile_type.universe, [0, 1, 2])
+    missile_type['long'] = fuzz.trimf(missile_type.universe, [1, 2, 2])
 
-# Get rules from json file
-with open(Settings().fuzzy_settings.fuzzy_rules.missile_choice['url'], 'r') as file:
-    rules = json.load(file)
+    return [distance, speed, altitude], missile_type
 
-    for rule in rules:
-        conditions = rule['conditions']
-        action = rule['action']
 
-        formatted_rules.append(
-            ctrl.Rule(distance[conditions['distance']] &
-                      speed[conditions['speed']] &
-                      altitude[conditions['altitude']], missile_type[action]))
+_controller = LazyController('missile_choice', _variables)
+
+
+def get_missile_choice_engine() -> FuzzyEngine:
+    """
+    Returns the missile choice controller, compiled on its first use.
+
+    :return: The compiled controller.
+    """
+    return _controller.engine
 
 
 def calculate_required_missile(distance_input: float, speed_input: float, altitude_input: float) -> float:
@@ -52,16 +57,16 @@ def calculate_required_missile(distance_input: float, speed_input: float, altitu
     :param altitude_input: altitude of the object
     :return: missile choice
     """
-    # Simulate threat level
-    fire_missile_ctrl = ctrl.ControlSystem(formatted_rules)
-    fire_missile_sim = ctrl.ControlSystemSimulation(fire_missile_ctrl)
-
-    # Pin inputs to simulation
-    fire_missile_sim.input['distance'] = distance_input
-    fire_missile_sim.input['speed'] = speed_input
-    fire_missile_sim.input['altitude'] = altitude_input
+    return get_missile_choice_engine().evaluate(distance=distance_input, speed=speed_input, altitude=altitude_input)
 
-    # Process simulation data
-    fire_missile_sim.compute()
 
-    return fire_missile_sim.output['fire_missile']
+def calculate_required_missile_batch(distance_input: np.ndarray, speed_input: np.ndarray,
+                                     altitude_input: np.ndarray) -> np.ndarray:
+    """
+    Function that calculates missile choices for many objects at once
+    :param distance_input: distances between launcher and the objects
+    :param speed_input: speeds of the objects
+    :param altitude_input: altitudes of the objects
+    :return: missile choices, NaN where no rule fires
+    """
+    return _controller.batch(distance=distance_input, speed=speed_input, altitude=altitude_input)
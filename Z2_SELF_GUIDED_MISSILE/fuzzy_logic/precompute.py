@@ -0,0 +1,38 @@
+import argparse
+import time
+
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.lookup import DEFAULT_RESOLUTION, FuzzyLookupTable
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.threat_level import get_threat_level_engine
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.shot_decision import get_shot_decision_engine
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.missile_choice import get_missile_choice_engine
+
+
+def main():
+    """
+    Builds the lookup tables of the fuzzy controllers into the cache and reports their interpolation error,
+    exits with an error if the 99th percentile error of a table is above the tolerance.
+    """
+    parser = argparse.ArgumentParser(description="Precomputes the lookup tables of the fuzzy controllers.")
+    parser.add_argument("--resolution", type=int, default=DEFAULT_RESOLUTION, help="grid points per input")
+    parser.add_argument("--samples", type=int, default=10_000, help="random inputs of the error report")
+    parser.add_argument("--tolerance", type=float, help="largest accepted 99th percentile error, none by default")
+    args = parser.parse_args()
+
+    engines = {"threat_level": get_threat_level_engine(), "shot_decision": get_shot_decision_engine(),
+               "missile_choice": get_missile_choice_engine()}
+    failed = False
+    for name, engine in engines.items():
+        lookup = FuzzyLookupTable(engine, args.resolution)
+        start = time.perf_counter()
+        lookup.table
+        seconds = time.perf_counter() - start
+        report = lookup.error_report(args.samples)
+        failed |= args.tolerance is not None and report["p99_error"] > args.tolerance
+        print(f"{name:15} {lookup.table.shape} in {seconds:6.2f} s  max error {report['max_error']:.3g}  "
+              f"mean {report['mean_error']:.3g}  p99 {report['p99_error']:.3g}  {lookup.path}")
+    if failed:
+        raise SystemExit(f"Interpolation error above {args.tolerance}.")
+
+
+if __name__ == '__main__':
+    main()
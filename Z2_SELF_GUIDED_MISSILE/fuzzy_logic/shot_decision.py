@@ -1,54 +1,57 @@
-import json
 import numpy as np
 import skfuzzy as fuzz
 
+from typing import List, Tuple
 from skfuzzy import control as ctrl
-from Z2_SELF_GUIDED_MISSILE.config import Settings
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.engine import FuzzyEngine, LazyController
 
 
-# Antecedents
-# TODO: przenieść do sterowania pociskiem
-# temperature = ctrl.Antecedent(np.arange(0, 131, 1), 'temperature')
-# temperature['low'] = fuzz.trimf(temperature.universe, [0, 0, 30])
-# temperature['medium'] = fuzz.trimf(temperature.universe, [25, 50, 80])
-# temperature['high'] = fuzz.trimf(temperature.universe, [70, 100, 130])/
+def _variables() -> Tuple[List[ctrl.Antecedent], ctrl.Consequent]:
+    """
+    Defines the inputs of the shot decision controller, threat level, speed and altitude, and its output.
 
-threat_level = ctrl.Antecedent(np.arange(0, 101, 1), 'threat_level')
-threat_level['low'] = fuzz.trimf(threat_level.universe, [0, 0, 30])
-threat_level['medium'] = fuzz.trimf(threat_level.universe, [20, 50, 80])
-threat_level['high'] = fuzz.trimf(threat_level.universe, [70, 100, 100])
+    :return: The antecedents and the consequent.
+    """
+    # Antecedents
+    # TODO: przenieść do sterowania pociskiem
+    # temperature = ctrl.Antecedent(np.arange(0, 131, 1), 'temperature')
+    # temperature['low'] = fuzz.trimf(temperature.universe, [0, 0, 30])
+    # temperature['medium'] = fuzz.trimf(temperature.universe, [25, 50, 80])
+    # temperature['high'] = fuzz.trimf(temperature.universe, [70, 100, 130])/
 
-speed = ctrl.Antecedent(np.arange(0, 1501, 1), 'speed')
-speed['slow'] = fuzz.trimf(speed.universe, [0, 0, 500])
-speed['medium'] = fuzz.trimf(speed.universe, [250, 500, 750])
-speed['fast'] = fuzz.trimf(speed.universe, [500, 1500, 1500])
+    threat_level = ctrl.Antecedent(np.arange(0, 101, 1), 'threat_level')
+    threat_level['low'] = fuzz.trimf(threat_level.universe, [0, 0, 30])
+    threat_level['medium'] = fuzz.trimf(threat_level.universe, [20, 50, 80])
+    threat_level['high'] = fuzz.trimf(threat_level.universe, [70, 100, 100])
 
-altitude = ctrl.Antecedent(np.arange(0, 10001, 1), 'altitude')
-altitude['low'] = fuzz.trimf(altitude.universe, [5000, 10000, 10000])
-altitude['medium'] = fuzz.trimf(altitude.universe, [2000, 3000, 5000])
-altitude['high'] = fuzz.trimf(altitude.universe, [0, 0, 2000])
+    speed = ctrl.Antecedent(np.arange(0, 1501, 1), 'speed')
+    speed['slow'] = fuzz.trimf(speed.universe, [0, 0, 500])
+    speed['medium'] = fuzz.trimf(speed.universe, [250, 500, 750])
+    speed['fast'] = fuzz.trimf(speed.universe, [500, 1500, 1500])
 
-# Consequent
-do_shot = ctrl.Consequent(np.arange(0, 101, 1), 'fire_missile')
-do_shot['no'] = fuzz.trimf(do_shot.universe, [0, 0, 0.5])
-do_shot['yes'] = fuzz.trimf(do_shot.universe, [0.5, 1, 1])
+    altitude = ctrl.Antecedent(np.arange(0, 10001, 1), 'altitude')
+    altitude['low'] = fuzz.trimf(altitude.universe, [5000, 10000, 10000])
+    altitude['medium'] = fuzz.trimf(altitude.universe, [2000, 3000, 5000])
+    altitude['high'] = fuzz.trimf(altitude.universe, [0, 0, 2000])
 
-# Rules
-formatted_rules = []
+    # Consequent
+    do_shot = ctrl.Consequent(np.arange(0, 101, 1), 'fire_missile')
+    do_shot['no'] = fuzz.trimf(do_shot.universe, [0, 0, 0.5])
+    do_shot['yes'] = fuzz.trimf(do_shot.universe, [0.5, 1, 1])
 
-# Get rules from json file
-# TODO: Można dorobić funkcję statyczną do tego
-with open(Settings().fuzzy_settings.fuzzy_rules.shot_decision['url'], 'r') as file:
-    rules = json.load(file)
+    return [threat_level, speed, altitude], do_shot
 
-    for rule in rules:
-        conditions = rule['conditions']
-        action = rule['action']
 
-        formatted_rules.append(
-            ctrl.Rule(threat_level[conditions['threat_level']] &
-                      speed[conditions['speed']] &
-                      altitude[conditions['altitude']], do_shot[action]))
+_controller = LazyController('shot_decision', _variables)
+
+
+def get_shot_decision_engine() -> FuzzyEngine:
+    """
+    Returns the shot decision controller, compiled on its first use.
+
+    :return: The compiled controller.
+    """
+    return _controller.engine
 
 
 def calculate_shot_rightness(threat_level_input: float, speed_input: float, altitude_input: float) -> float:
@@ -59,16 +62,17 @@ def calculate_shot_rightness(threat_level_input: float, speed_input: float, alti
     :param altitude_input: object altitude
     :return: does launcher should launch the missile
     '''
-    # Simulate threat level
-    do_shot_ctrl = ctrl.ControlSystem(formatted_rules)
-    do_shot_sim = ctrl.ControlSystemSimulation(do_shot_ctrl)
+    return get_shot_decision_engine().evaluate(threat_level=threat_level_input, speed=speed_input,
+                                               altitude=altitude_input)
 
-    # Pin inputs to simulation
-    do_shot_sim.input['threat_level'] = threat_level_input
-    do_shot_sim.input['speed'] = speed_input
-    do_shot_sim.input['altitude'] = altitude_input
 
-    # Process simulation data
-    do_shot_sim.compute()
-
-    return do_shot_sim.output['fire_missile']
+def calculate_shot_rightness_batch(threat_level_input: np.ndarray, speed_input: np.ndarray,
+                                   altitude_input: np.ndarray) -> np.ndarray:
+    '''
+    Function that calculates rightness of launching the missile at many objects at once
+    :param threat_level_input: threat levels that the objects exert
+    :param speed_input: object speeds
+    :param altitude_input: object altitudes
+    :return: rightness of launching at each object, NaN where no rule fires
+    '''
+    return _controller.batch(threat_level=threat_level_input, speed=speed_input, altitude=altitude_input)
@@ -1,46 +1,50 @@
-import json
 import numpy as np
 import skfuzzy as fuzz
 
+from typing import List, Tuple
 from skfuzzy import control as ctrl
-from Z2_SELF_GUIDED_MISSILE.config import Settings
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.engine import FuzzyEngine, LazyController
 
 
-# Antecedents
-motion = ctrl.Antecedent(np.array([0, 1]), 'motion')  # 0: Stationary, 1: Moving
-motion['stationary'] = fuzz.trimf(motion.universe, [0, 0, 0])
-motion['moving'] = fuzz.trimf(motion.universe, [1, 1, 1])
+def _variables() -> Tuple[List[ctrl.Antecedent], ctrl.Consequent]:
+    """
+    Defines the inputs of the threat level controller, motion, weapon and distance, and its output.
 
-weapon = ctrl.Antecedent(np.array([0, 1]), 'weapon')  # 0: Unarmed, 1: Armed
-weapon['unarmed'] = fuzz.trimf(weapon.universe, [0, 0, 0])
-weapon['armed'] = fuzz.trimf(weapon.universe, [1, 1, 1])
+    :return: The antecedents and the consequent.
+    """
+    # Antecedents
+    motion = ctrl.Antecedent(np.array([0, 1]), 'motion')  # 0: Stationary, 1: Moving
+    motion['stationary'] = fuzz.trimf(motion.universe, [0, 0, 0])
+    motion['moving'] = fuzz.trimf(motion.universe, [1, 1, 1])
 
-distance = ctrl.Antecedent(np.arange(0, 2001, 1), 'distance')
-distance['close'] = fuzz.trimf(distance.universe, [0, 0, 1000])
-distance['medium'] = fuzz.trimf(distance.universe, [1000, 1500, 2000])
-distance['far'] = fuzz.trimf(distance.universe, [1500, 2000, 2000])
+    weapon = ctrl.Antecedent(np.array([0, 1]), 'weapon')  # 0: Unarmed, 1: Armed
+    weapon['unarmed'] = fuzz.trimf(weapon.universe, [0, 0, 0])
+    weapon['armed'] = fuzz.trimf(weapon.universe, [1, 1, 1])
 
-# Consequent
-threat_level = ctrl.Consequent(np.arange(0, 101, 1), 'threat_level')
-threat_level['low'] = fuzz.trimf(threat_level.universe, [0, 0, 50])
-threat_level['medium'] = fuzz.trimf(threat_level.universe, [25, 50, 75])
-threat_level['high'] = fuzz.trimf(threat_level.universe, [50, 100, 100])
+    distance = ctrl.Antecedent(np.arange(0, 2001, 1), 'distance')
+    distance['close'] = fuzz.trimf(distance.universe, [0, 0, 1000])
+    distance['medium'] = fuzz.trimf(distance.universe, [1000, 1500, 2000])
+    distance['far'] = fuzz.trimf(distance.universe, [1500, 2000, 2000])
 
-# Rules
-formatted_rules = []
+    # Consequent
+    threat_level = ctrl.Consequent(np.arange(0, 101, 1), 'threat_level')
+    threat_level['low'] = fuzz.trimf(threat_level.universe, [0, 0, 50])
+    threat_level['medium'] = fuzz.trimf(threat_level.universe, [25, 50, 75])
+    threat_level['high'] = fuzz.trimf(threat_level.universe, [50, 100, 100])
 
-# Get rules from json file
-with open(Settings().fuzzy_settings.fuzzy_rules.threat['url'], 'r') as file:
-    rules = json.load(file)
+    return [motion, weapon, distance], threat_level
 
-    for rule in rules:
-        conditions = rule['conditions']
-        action = rule['action']
 
-        formatted_rules.append(
-            ctrl.Rule(motion[conditions['motion']] &
-                      weapon[conditions['weapon']] &
-                      distance[conditions['distance']], threat_level[action]))
+_controller = LazyController('threat', _variables)
+
+
+def get_threat_level_engine() -> FuzzyEngine:
+    """
+    Returns the threat level controller, compiled on its first use.
+
+    :return: The compiled controller.
+    """
+    return _controller.engine
 
 
 def calculate_threat_level(motion: float, weapon: float, distance: float) -> float:
@@ -51,16 +55,15 @@ def calculate_threat_level(motion: float, weapon: float, distance: float) -> flo
     :param distance: distance between launcher and the object
     :return: threat level
     '''
-    # Simulate threat level
-    threat_level_ctrl = ctrl.ControlSystem(formatted_rules)
-    threat_level_sim = ctrl.ControlSystemSimulation(threat_level_ctrl)
+    return get_threat_level_engine().evaluate(motion=motion, weapon=weapon, distance=distance)
 
-    # Pin inputs to simulation
-    threat_level_sim.input['motion'] = motion
-    threat_level_sim.input['weapon'] = weapon
-    threat_level_sim.input['distance'] = distance
 
-    # Process simulation data
-    threat_level_sim.compute()
-
-    return threat_level_sim.output['threat_level']
+def calculate_threat_level_batch(motion: np.ndarray, weapon: np.ndarray, distance: np.ndarray) -> np.ndarray:
+    '''
+    Function that calculates threat levels of many objects at once
+    :param motion: does each object move
+    :param weapon: does each object have a weapon
+    :param distance: distances between launcher and the objects
+    :return: threat levels, NaN where no rule fires
+    '''
+    return _controller.batch(motion=motion, weapon=weapon, distance=distance)
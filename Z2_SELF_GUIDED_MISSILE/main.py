@@ -6,11 +6,16 @@
 import asyncio
 import json
 import pygame
+from Z2_SELF_GUIDED_MISSILE.config import package_path
 from Z2_SELF_GUIDED_MISSILE.map.terrain import Terrain
 from Z2_SELF_GUIDED_MISSILE.setting_panel.panel import Panel
 from Z2_SELF_GUIDED_MISSILE.models.missile import Missile
 from models.launcher import Launcher
 from Z2_SELF_GUIDED_MISSILE.models.ufo import UFO
+from Z2_SELF_GUIDED_MISSILE.models.scan_pipeline import ScanPipeline
+
+# Seconds between scans, the batch fuzzy inference is fast enough to scan every frame
+SCAN_INTERVAL = 1 / 60
 
 
 def initialize_game(config):
@@ -77,18 +82,16 @@ async def handle_events(panel):
     return True
 
 
-async def scan_in_background(launcher, detected_ufo_list):
+async def scan_in_background(pipeline, launcher):
     """
     Continuously scans for UFOs within range in the background.
+    The fuzzy inference runs in the worker processes of the pipeline, which publishes every result at once,
+    so the render loop never sees an empty or half-filled list, and drops results older than the published one.
 
+    :param pipeline: The scan pipeline storing the detected UFOs in pipeline.results.
     :param launcher: The launcher performing the scan.
-    :param detected_ufo_list: List to store detected UFOs.
     """
-    while True:
-        detected_ufo_in_range = await asyncio.to_thread(launcher.scan)
-        detected_ufo_list.clear()
-        detected_ufo_list.extend(detected_ufo_in_range)
-        await asyncio.sleep(0.5)
+    await pipeline.run(launcher, SCAN_INTERVAL)
 
 
 def get_threat_level_color(threat_level):
@@ -146,10 +149,10 @@ async def main_loop(screen, screen_width, config, panel, launcher):
     model = UFO(speed=0, max_speed=600, altitude=500, temperature=70, x=screen_width + 25, y=1,
                 screen_width=config["GAME"]["screen_width"], width=80, height=40)
     terrain = Terrain(screen_width, config["MAP"])
-    detected_ufo_list = []
-    asyncio.create_task(scan_in_background(launcher, detected_ufo_list))
+    pipeline = ScanPipeline()
+    scan_task = asyncio.create_task(scan_in_background(pipeline, launcher))
 
-    image_plane = pygame.image.load('texture/plane.png')
+    image_plane = pygame.image.load(package_path('texture/plane.png'))
     image_plane = pygame.transform.scale(image_plane, (80, 40))
     image_model = image_plane.convert_alpha()
     image_model.set_alpha(128)
@@ -163,22 +166,25 @@ async def main_loop(screen, screen_width, config, panel, launcher):
         altitude = values["altitude"]
         model.move_y(altitude)
         launcher.draw(screen)
-        draw_detected_ufo(detected_ufo_list, screen)
+        draw_detected_ufo(pipeline.results.detected, screen)
 
         for ufo in ufo_list:
             screen.blit(image_model if ufo.uuid == model.uuid else image_plane, (ufo.x, ufo.y))
-            ufo.move()
+        UFO.manager.move_all()
 
         pygame.display.flip()
         clock.tick(60)
         await asyncio.sleep(0.01)
 
+    scan_task.cancel()
+    pipeline.close()
+
 
 if __name__ == '__main__':
     """
     Entry point for the game. Initializes components and starts the main loop.
     """
-    with open('./config.json', 'r') as file:
+    with open(package_path('config.json'), 'r') as file:
         config = json.load(file)
 
     screen, screen_width, screen_height = initialize_game(config)
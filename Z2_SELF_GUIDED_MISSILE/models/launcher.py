@@ -1,17 +1,46 @@
 import asyncio
 import math
+import numpy as np
 import pygame
 from pydantic import BaseModel, conint, field_validator, Field
 from uuid import UUID, uuid4
 from typing import List, Optional, Tuple, Dict
 
-from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.threat_level import calculate_threat_level
-from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.shot_decision import calculate_shot_rightness
-from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.missile_choice import calculate_required_missile
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.threat_level import calculate_threat_level_batch
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.shot_decision import calculate_shot_rightness_batch
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.missile_choice import calculate_required_missile_batch
 from Z2_SELF_GUIDED_MISSILE.models.missile import Missile
 from Z2_SELF_GUIDED_MISSILE.models.ufo import UFO
 
 
+def evaluate_targets(distance: np.ndarray, speed: np.ndarray, altitude: np.ndarray,
+                     weapon: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Runs the fuzzy inference of a scan for many targets at once.
+    It only takes plain arrays, so a process pool can run it on a snapshot of the targets.
+
+    :param distance: Distances of the targets from the launcher in pixels.
+    :param speed: Speeds of the targets in km/h.
+    :param altitude: Altitudes of the targets in meters.
+    :param weapon: Weapon states of the targets, 0 or 1.
+    :return: Threat levels, shot rightness and required missiles of the targets.
+    """
+    threat_levels = calculate_threat_level_batch(motion=np.ones(len(distance)), weapon=np.asarray(weapon, dtype=float),
+                                                 distance=np.asarray(distance, dtype=float) * 10)
+    # No rule fires on the edges between terms, e.g. at a distance of exactly 1000, that counts as no threat.
+    # It is replaced before the shot decision, which would otherwise ignore the missing threat level
+    threat_levels = np.nan_to_num(threat_levels)
+    shot_rightness = calculate_shot_rightness_batch(threat_level_input=threat_levels, speed_input=speed,
+                                                    altitude_input=altitude)
+    shot_rightness = np.nan_to_num(shot_rightness)
+    required_missile = np.zeros(len(distance))
+    # to_shoot = shot_rightness > 0.5
+    # required_missile[to_shoot] = calculate_required_missile_batch(distance_input=distance[to_shoot],
+    #                                                               speed_input=speed[to_shoot],
+    #                                                               altitude_input=altitude[to_shoot])
+    return threat_levels, shot_rightness, required_missile
+
+
 class Launcher(BaseModel):
     """
     Represents a missile launcher capable of detecting and engaging UFOs within range.
@@ -55,40 +84,50 @@ class Launcher(BaseModel):
             raise ValueError(f"Cannot add more missiles. Limit is {self.missiles_limit}.")
         self.missiles.append(missile)
 
-    def ufo_in_range(self) -> List[List]:
+    def ufo_in_range(self, radius: Optional[float] = None) -> List[List]:
         """
-        Detects UFOs within the launcher's maximum range.
+        Detects UFOs within the launcher's maximum range, or within a given radius.
+        Only the UFOs in the cells of the spatial index around the launcher are measured.
 
+        :param radius: Radius in pixels, the maximum range if not given.
         :return: A list of UFOs along with their distances from the launcher.
         """
-        detected_ufo_in_range = []
-        for ufo in UFO.all():
-            distance = ((self.x - (ufo.x if self.x < ufo.x + ufo.width // 2 else ufo.x + ufo.width)) ** 2 + (
-                    ufo.y + ufo.height // 2 - self.y) ** 2) ** 0.5
-            if distance <= self.max_range:
-                detected_ufo_in_range.append([ufo, distance])
-        return detected_ufo_in_range
+        ufos, _, distances = UFO.manager.in_radius(self.x, self.y, self.max_range if radius is None else radius)
+        return [[ufo, float(distance)] for ufo, distance in zip(ufos, distances)]
+
+    def ufo_in_rings(self) -> Dict[str, List[List]]:
+        """
+        Sorts the UFOs within the longest range into the range rings, from the shortest one outwards.
+        A UFO belongs to the shortest ring that reaches it.
+
+        :return: The UFOs along with their distances, by ring name.
+        """
+        rings = sorted(self.range, key=self.range.get)
+        detected = {ring: [] for ring in rings}
+        if not rings:
+            return detected
+        ufos, _, distances = UFO.manager.in_radius(self.x, self.y, self.range[rings[-1]])
+        bounds = np.array([self.range[ring] for ring in rings], dtype=float)
+        for ufo, distance, ring in zip(ufos, distances, np.searchsorted(bounds, distances, side='left')):
+            detected[rings[ring]].append([ufo, float(distance)])
+        return detected
 
     def scan(self) -> List[List]:
         """
         Scans for UFOs within range and calculates their threat levels and required actions.
+        All detected UFOs are evaluated together by the batch fuzzy inference, on the columns of the UFO manager.
 
         :return: A list containing data about each detected UFO.
         """
-        scan_ufo = []
-        for ufo_model in self.ufo_in_range():
-            ufo, distance = ufo_model
-            threat_level = calculate_threat_level(motion=1, weapon=ufo.weapon, distance=distance * 10)
-            shot_rightness = calculate_shot_rightness(threat_level_input=threat_level, speed_input=ufo.speed,
-                                                      altitude_input=ufo.altitude)
-            required_missile = 0
-            # if shot_rightness > 0.5:
-                # required_missile = calculate_required_missile(distance_input=distance, speed_input=ufo.speed,
-                #                                              altitude_input=ufo.altitude)
-                # required_missile = self.get_missile_by_fuzzy_value(required_missile)
-            scan_ufo.append([ufo, threat_level, shot_rightness, required_missile])
-
-        return scan_ufo
+        ufos, slots, distance = UFO.manager.in_radius(self.x, self.y, self.max_range)
+        if not ufos:
+            return []
+        columns = UFO.manager.columns
+        threat_levels, shot_rightness, required_missile = evaluate_targets(
+            distance, columns["speed"][slots], columns["altitude"][slots], columns["weapon"][slots])
+        # required_missile = [self.get_missile_by_fuzzy_value(value) for value in required_missile]
+        return [[ufo, float(threat_level), float(rightness), int(missile)]
+                for ufo, threat_level, rightness, missile in zip(ufos, threat_levels, shot_rightness, required_missile)]
 
     def draw_dashed_circle(self, screen, color, center, radius, start_angle, end_angle, dash_length=10):
         """
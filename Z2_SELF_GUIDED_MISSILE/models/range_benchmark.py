@@ -0,0 +1,99 @@
+import argparse
+import time
+import numpy as np
+from typing import List
+
+from Z2_SELF_GUIDED_MISSILE.models.launcher import Launcher
+from Z2_SELF_GUIDED_MISSILE.models.ufo import UFO
+
+SCREEN_WIDTH = 500
+
+
+def spawn_ufos(count: int, rng: np.random.Generator) -> List[UFO]:
+    """
+    Spawns UFOs at random positions over the sky, the way the panel creates them.
+
+    :param count: Number of UFOs.
+    :param rng: Random number generator.
+    :return: The UFOs, registered with the manager.
+    """
+    return [UFO(speed=float(rng.uniform(0, 600)), max_speed=600, altitude=float(rng.uniform(0, 10_000)),
+                temperature=100, x=float(rng.uniform(-80, SCREEN_WIDTH + 25)), y=float(rng.uniform(-19, 380)),
+                screen_width=SCREEN_WIDTH, width=80, height=40, weapon=int(rng.integers(0, 2)))
+            for _ in range(count)]
+
+
+def linear_in_range(launcher: Launcher) -> List[List]:
+    """
+    Detects UFOs within range the way the launcher used to, measuring every UFO.
+
+    :param launcher: The launcher scanning.
+    :return: A list of UFOs along with their distances from the launcher.
+    """
+    detected_ufo_in_range = []
+    for ufo in UFO.all():
+        distance = ((launcher.x - (ufo.x if launcher.x < ufo.x + ufo.width // 2 else ufo.x + ufo.width)) ** 2 + (
+                ufo.y + ufo.height // 2 - launcher.y) ** 2) ** 0.5
+        if distance <= launcher.max_range:
+            detected_ufo_in_range.append([ufo, distance])
+    return detected_ufo_in_range
+
+
+def main():
+    """
+    Times the range detection of launchers over many UFOs, measuring every UFO against the spatial index,
+    exits with an error if they detect different UFOs.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark of the launcher range detection.")
+    parser.add_argument("--ufos", type=int, default=10_000, help="simultaneous UFOs")
+    parser.add_argument("--launchers", type=int, default=10, help="launchers scanning every frame")
+    parser.add_argument("--frames", type=int, default=10, help="frames timed")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the UFOs and launchers")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    spawn_ufos(args.ufos, rng)
+    launchers = [Launcher(missiles_limit=5, default_reload_time=1, x=int(rng.integers(0, SCREEN_WIDTH)), y=420,
+                          width=50, height=25, color=(255, 255, 255), range={"SHORT": 100, "MEDIUM": 150, "LONG": 200},
+                          max_range=200)
+                 for _ in range(args.launchers)]
+
+    linear = indexed = rebuild = rings = moving = 0.0
+    detected = 0
+    for _ in range(args.frames):
+        start = time.perf_counter()
+        UFO.manager.move_all()
+        moving += time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = [linear_in_range(launcher) for launcher in launchers]
+        linear += time.perf_counter() - start
+
+        start = time.perf_counter()
+        UFO.manager.spatial_index()
+        rebuild += time.perf_counter() - start
+        start = time.perf_counter()
+        actual = [launcher.ufo_in_range() for launcher in launchers]
+        indexed += time.perf_counter() - start
+        start = time.perf_counter()
+        for launcher in launchers:
+            launcher.ufo_in_rings()
+        rings += time.perf_counter() - start
+
+        for launcher_expected, launcher_actual in zip(expected, actual):
+            if [ufo.uuid for ufo, _ in launcher_expected] != [ufo.uuid for ufo, _ in launcher_actual]:
+                raise SystemExit("The spatial index detects different UFOs than measuring every UFO.")
+            detected += len(launcher_actual)
+
+    queries = args.frames * args.launchers
+    print(f"{args.ufos} UFOs, {args.launchers} launchers, {detected / queries:.0f} UFOs in range on average")
+    print(f"movement       {moving / args.frames * 1000:8.3f} ms per frame")
+    print(f"linear scan    {linear / queries * 1000:8.3f} ms per launcher")
+    print(f"grid rebuild   {rebuild / args.frames * 1000:8.3f} ms per frame")
+    print(f"grid query     {indexed / queries * 1000:8.3f} ms per launcher")
+    print(f"grid rings     {rings / queries * 1000:8.3f} ms per launcher")
+    print(f"speedup        {linear / (rebuild + indexed):8.1f}x per frame, grid rebuild included")
+
+
+if __name__ == '__main__':
+    main()
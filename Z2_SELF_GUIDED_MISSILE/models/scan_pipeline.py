@@ -0,0 +1,217 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, NamedTuple, Optional, Tuple
+
+from Z2_SELF_GUIDED_MISSILE.models.launcher import Launcher, evaluate_targets
+from Z2_SELF_GUIDED_MISSILE.models.ufo import UFO
+
+# Targets evaluated by one task of the process pool
+CHUNK_SIZE = 256
+
+logger = logging.getLogger(__name__)
+
+
+class ScanSnapshot(NamedTuple):
+    """
+    State of the targets in range of a launcher, copied when the scan starts.
+    Moving the UFOs later does not change it.
+    """
+    generation: int
+    ufos: List[UFO]
+    distance: np.ndarray
+    speed: np.ndarray
+    altitude: np.ndarray
+    weapon: np.ndarray
+
+
+class ScanResult(NamedTuple):
+    """
+    Published outcome of a scan, stamped with the generation of its snapshot.
+    """
+    generation: int
+    detected: Tuple[list, ...]
+
+
+class ScanResults:
+    """
+    Latest published scan result, read by the render loop.
+    A result replaces the previous one in a single assignment, so a reader sees either the old or the new
+    result, never a half-filled one. Results older than the published one arrive too late and are dropped.
+    """
+
+    def __init__(self):
+        """Initializes the results with an empty result before the first scan."""
+        self.latest = ScanResult(generation=-1, detected=())
+        self.published = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    @property
+    def detected(self) -> Tuple[list, ...]:
+        """
+        Returns the detected UFOs of the latest result.
+
+        :return: The UFOs along with their threat levels, shot rightness and required missiles.
+        """
+        return self.latest.detected
+
+    def publish(self, result: ScanResult) -> bool:
+        """
+        Publishes a result unless a result of a newer snapshot was published already.
+
+        :param result: The result to publish.
+        :return: Whether the result was published.
+        """
+        with self._lock:
+            if result.generation <= self.latest.generation:
+                self.dropped += 1
+                return False
+            self.latest = result
+            self.published += 1
+            return True
+
+
+def warm_up():
+    """
+    Builds the fuzzy controllers of a worker process before its first task.
+    """
+    evaluate_targets(np.full(1, 100.0), np.full(1, 600.0), np.full(1, 500.0), np.ones(1))
+
+
+class ScanPipeline:
+    """
+    Scans in the background: the targets in range are snapshotted on the event loop, their fuzzy inference is
+    split into chunks and fanned out to a process pool, outside the GIL of the render loop, and the result is
+    published to ScanResults with the generation of its snapshot.
+    Several scans may be in flight at once, one that finishes after a newer one is dropped.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE):
+        """
+        Starts the process pool.
+
+        :param workers: Number of worker processes, all cores but the one of the render loop by default.
+        :param chunk_size: Targets evaluated by one task.
+        """
+        self.workers = workers or max((os.cpu_count() or 1) - 1, 1)
+        self.chunk_size = chunk_size
+        self.executor = self.start_pool()
+        self.results = ScanResults()
+        self._generations = itertools.count()
+
+    def __enter__(self) -> 'ScanPipeline':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start_pool(self) -> ProcessPoolExecutor:
+        """
+        Creates the process pool, its workers are spawned as in chomp_game/Chomp_Parallel.py, never forked
+        from the render loop with its pygame state.
+
+        :return: The process pool.
+        """
+        return ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=warm_up)
+
+    def restart(self, broken: ProcessPoolExecutor):
+        """
+        Replaces a process pool that lost a worker, the scans started afterwards run in the new pool.
+        Scans in flight on the same broken pool fail too, the pool is replaced only once.
+
+        :param broken: The pool the failed scan ran in.
+        """
+        if self.executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.executor = self.start_pool()
+
+    def close(self):
+        """
+        Stops the process pool, pending tasks are cancelled.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self, launcher: Launcher) -> ScanSnapshot:
+        """
+        Copies the state of the targets in range of a launcher and stamps it with the next generation.
+
+        :param launcher: The launcher scanning.
+        :return: The snapshot.
+        """
+        ufos, slots, distance = UFO.manager.in_radius(launcher.x, launcher.y, launcher.max_range)
+        columns = UFO.manager.columns
+        return ScanSnapshot(generation=next(self._generations), ufos=ufos, distance=distance,
+                            speed=columns["speed"][slots], altitude=columns["altitude"][slots],
+                            weapon=columns["weapon"][slots])
+
+    async def evaluate(self, snapshot: ScanSnapshot) -> ScanResult:
+        """
+        Runs the fuzzy inference of a snapshot in the process pool, a chunk of targets per task.
+
+        :param snapshot: The targets.
+        :return: The result, stamped with the generation of the snapshot.
+        """
+        loop = asyncio.get_running_loop()
+        chunks = [slice(start, start + self.chunk_size) for start in range(0, len(snapshot.ufos), self.chunk_size)]
+        outputs = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, evaluate_targets, snapshot.distance[chunk], snapshot.speed[chunk],
+                                 snapshot.altitude[chunk], snapshot.weapon[chunk])
+            for chunk in chunks))
+        detected = tuple(
+            [ufo, float(threat_level), float(rightness), int(missile)]
+            for chunk, (threat_levels, shot_rightness, required_missile) in zip(chunks, outputs)
+            for ufo, threat_level, rightness, missile in zip(snapshot.ufos[chunk], threat_levels, shot_rightness,
+                                                             required_missile))
+        return ScanResult(generation=snapshot.generation, detected=detected)
+
+    async def scan(self, launcher: Launcher) -> bool:
+        """
+        Scans once: snapshot, inference in the process pool and publishing.
+
+        :param launcher: The launcher scanning.
+        :return: Whether the result was published, False if a newer one was published first.
+        """
+        return self.results.publish(await self.evaluate(self.snapshot(launcher)))
+
+    async def run(self, launcher: Launcher, interval: float):
+        """
+        Starts a scan every interval, as long as fewer scans than workers are in flight.
+        A failed scan is logged and scanning goes on, in a new process pool if a worker died.
+
+        :param launcher: The launcher scanning.
+        :param interval: Seconds between the starts of two scans.
+        """
+        in_flight = asyncio.Semaphore(self.workers)
+        # Scans in flight, with the process pool each one runs in
+        tasks = {}
+
+        def finished(task: asyncio.Task):
+            executor = tasks.pop(task)
+            in_flight.release()
+            if task.cancelled():
+                return
+            try:
+                task.result()
+            except BrokenProcessPool:
+                logger.exception("A scan worker died, restarting the process pool")
+                self.restart(executor)
+            except Exception:
+                logger.exception("Scan failed")
+
+        try:
+            while True:
+                await in_flight.acquire()
+                task = asyncio.create_task(self.scan(launcher))
+                tasks[task] = self.executor
+                task.add_done_callback(finished)
+                await asyncio.sleep(interval)
+        finally:
+            for task in list(tasks):
+                task.cancel()
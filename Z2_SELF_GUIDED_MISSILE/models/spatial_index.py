@@ -0,0 +1,96 @@
+import numpy as np
+from typing import Tuple
+
+# Side of a grid cell in pixels, a query of the longest launcher range covers about 8 x 8 cells
+DEFAULT_CELL_SIZE = 64
+
+
+class UniformGrid:
+    """
+    Uniform grid over the positions of UFOs, built from a snapshot of their columns.
+    The UFOs are sorted by cell, so the UFOs of a column of cells are one slice of the sorted order and a
+    radius query only looks at the columns and rows overlapping the circle instead of every UFO.
+    Distances are measured the way the launcher measures them: from the launcher to the nearer vertical
+    edge of the UFO, at half its height.
+    """
+
+    def __init__(self, ids: np.ndarray, x: np.ndarray, y: np.ndarray, width: np.ndarray, height: np.ndarray,
+                 cell_size: float = DEFAULT_CELL_SIZE):
+        """
+        Builds the grid.
+
+        :param ids: Identifiers of the UFOs returned by the queries, in ascending order.
+        :param x: X-coordinates of the UFOs, the snapshot is not updated when they move.
+        :param y: Y-coordinates of the UFOs.
+        :param width: Widths of the UFOs.
+        :param height: Heights of the UFOs.
+        :param cell_size: Side of a grid cell in pixels.
+        """
+        self.ids = np.asarray(ids)
+        self.cell_size = cell_size
+        self.x = np.asarray(x, dtype=float)
+        self.width = np.asarray(width, dtype=float)
+        self.center_x = self.x + self.width // 2
+        self.center_y = np.asarray(y, dtype=float) + np.asarray(height, dtype=float) // 2
+        # The measured edge is at most a width away from the centre, queries are widened by that much
+        self.margin = float(self.width.max()) if len(self) else 0.0
+
+        column = np.floor(self.center_x / cell_size).astype(np.int64)
+        row = np.floor(self.center_y / cell_size).astype(np.int64)
+        self.origin = (int(column.min()), int(row.min())) if len(self) else (0, 0)
+        self.columns = int(column.max()) - self.origin[0] + 1 if len(self) else 0
+        self.rows = int(row.max()) - self.origin[1] + 1 if len(self) else 0
+        keys = (column - self.origin[0]) * self.rows + (row - self.origin[1])
+        self.order = np.argsort(keys, kind='stable')
+        self.keys = keys[self.order]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def candidates(self, x: float, y: float, radius: float) -> np.ndarray:
+        """
+        Finds the UFOs in the cells overlapping the square around a circle, widened by the margin.
+
+        :param x: X-coordinate of the centre of the circle.
+        :param y: Y-coordinate of the centre of the circle.
+        :param radius: Radius of the circle in pixels.
+        :return: Indices of the candidate UFOs, in no particular order.
+        """
+        reach = radius + self.margin
+        first_column = max(int(np.floor((x - reach) / self.cell_size)) - self.origin[0], 0)
+        last_column = min(int(np.floor((x + reach) / self.cell_size)) - self.origin[0], self.columns - 1)
+        first_row = max(int(np.floor((y - reach) / self.cell_size)) - self.origin[1], 0)
+        last_row = min(int(np.floor((y + reach) / self.cell_size)) - self.origin[1], self.rows - 1)
+        if first_column > last_column or first_row > last_row:
+            return np.empty(0, dtype=np.int64)
+        columns = np.arange(first_column, last_column + 1) * self.rows
+        starts = np.searchsorted(self.keys, columns + first_row, side='left')
+        ends = np.searchsorted(self.keys, columns + last_row, side='right')
+        return np.concatenate([self.order[start:end] for start, end in zip(starts, ends)])
+
+    def distances(self, x: float, y: float, indices: np.ndarray) -> np.ndarray:
+        """
+        Measures the distance from a point to the nearer vertical edge of some UFOs, at half their height.
+
+        :param x: X-coordinate of the point.
+        :param y: Y-coordinate of the point.
+        :param indices: Indices of the UFOs.
+        :return: The distances in pixels.
+        """
+        left = self.x[indices]
+        edge = np.where(x < self.center_x[indices], left, left + self.width[indices])
+        return ((x - edge) ** 2 + (self.center_y[indices] - y) ** 2) ** 0.5
+
+    def query(self, x: float, y: float, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the UFOs within a radius of a point.
+
+        :param x: X-coordinate of the point.
+        :param y: Y-coordinate of the point.
+        :param radius: Radius in pixels, inclusive.
+        :return: Identifiers of the UFOs, in ascending order, and their distances.
+        """
+        indices = np.sort(self.candidates(x, y, radius))
+        distance = self.distances(x, y, indices)
+        inside = distance <= radius
+        return self.ids[indices[inside]], distance[inside]
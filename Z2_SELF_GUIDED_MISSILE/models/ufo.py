@@ -1,26 +1,154 @@
+import numpy as np
 from pydantic import BaseModel, confloat, Field, conint
 from uuid import UUID, uuid4
-from typing import ClassVar
+from typing import ClassVar, Dict, List, Optional, Tuple
+
+from Z2_SELF_GUIDED_MISSILE.models.spatial_index import UniformGrid
+
+# Converts a speed in km/h to pixels per frame
+SPEED_TO_PIXELS = 0.0027778
+# Columns of the UFO attributes and their types, attributes that are not given are NaN
+COLUMNS = {
+    "speed": float,
+    "max_speed": float,
+    "altitude": float,
+    "temperature": float,
+    "width": float,
+    "height": float,
+    "x": float,
+    "y": float,
+    "weapon": int,
+    "screen_width": int,
+}
+INITIAL_CAPACITY = 64
 
 
 class UFOManager:
     """
-    A class to manage all UFO instances.
+    A class to manage all UFO instances, storing their attributes as NumPy columns.
+    Every UFO occupies a slot, the same row of every column. Slots of removed UFOs are reused by new ones,
+    so movement, culling and range queries run on whole columns instead of one UFO at a time.
 
     Attributes:
         UFOs (dict): A dictionary holding all UFO objects with their UUIDs as keys.
+        columns (dict): A NumPy array of every attribute, by name, with one row per slot.
+        views (list): The UFO object of every slot, None for free slots.
+        alive (np.ndarray): Whether a slot is occupied.
+        version (int): Counter increased whenever a UFO is added, removed or moved.
     """
-    def __init__(self):
-        """Initializes an empty manager for UFOs."""
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        """
+        Initializes an empty manager for UFOs.
+
+        :param capacity: Number of slots allocated up front, more are allocated when they run out.
+        """
         self.UFOs = {}
+        self.columns: Dict[str, np.ndarray] = {name: np.zeros(capacity, dtype=kind) for name, kind in COLUMNS.items()}
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.views: List[Optional['UFO']] = [None] * capacity
+        self.free: List[int] = list(range(capacity - 1, -1, -1))
+        self.version = 0
+        self._index: Optional[UniformGrid] = None
+        self._index_version = -1
 
-    def add_instance(self, ufo: 'UFO'):
+    def _grow(self):
         """
-        Adds a UFO instance to the manager.
+        Doubles the number of slots.
+        """
+        capacity = len(self.alive)
+        self.columns = {name: np.concatenate([column, np.zeros(capacity, dtype=column.dtype)])
+                        for name, column in self.columns.items()}
+        self.alive = np.concatenate([self.alive, np.zeros(capacity, dtype=bool)])
+        self.views.extend([None] * capacity)
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def add_instance(self, ufo: 'UFO', data: 'UFOData'):
+        """
+        Adds a UFO instance to the manager, storing its attributes in a free slot.
 
         :param ufo: An instance of the UFO class to add.
+        :param data: The validated attributes of the UFO.
         """
+        if not self.free:
+            self._grow()
+        slot = self.free.pop()
+        for name, column in self.columns.items():
+            value = getattr(data, name)
+            column[slot] = np.nan if value is None else value
+        ufo.slot = slot
+        self.views[slot] = ufo
+        self.alive[slot] = True
         self.UFOs[ufo.uuid] = ufo
+        self.version += 1
+
+    def remove_instance(self, ufo_uuid: UUID):
+        """
+        Removes a UFO instance from the manager and frees its slot.
+        The UFO object keeps the attributes it had when it was removed.
+
+        :param ufo_uuid: The UUID of the UFO to remove.
+        """
+        ufo = self.UFOs.pop(ufo_uuid)
+        slot = ufo.slot
+        ufo.detach({name: column[slot].item() for name, column in self.columns.items()})
+        self.alive[slot] = False
+        self.views[slot] = None
+        self.free.append(slot)
+        self.version += 1
+
+    def moved(self):
+        """
+        Marks the positions of the UFOs as changed, the spatial index is rebuilt on the next query.
+        """
+        self.version += 1
+
+    def move_all(self, frames: float = 1) -> List['UFO']:
+        """
+        Moves all UFOs to the left based on their speed and removes those that left the screen.
+
+        :param frames: Number of frames to move the UFOs by.
+        :return: The UFOs removed.
+        """
+        alive, x = self.alive, self.columns["x"]
+        x[alive] -= self.columns["speed"][alive] * SPEED_TO_PIXELS * frames
+        self.moved()
+        removed = [self.views[slot] for slot in np.flatnonzero(alive & (x + 80 < 0))]  # UFOs off the screen
+        for ufo in removed:
+            self.remove_instance(ufo.uuid)
+        return removed
+
+    def spatial_index(self) -> UniformGrid:
+        """
+        Returns a uniform grid over the current positions of all UFOs, identified by their slots.
+        The grid is rebuilt only when a UFO was added, removed or moved since it was built,
+        so all range queries of a frame share one grid.
+
+        :return: The spatial index.
+        """
+        version = self.version
+        if self._index is None or self._index_version != version:
+            slots = np.flatnonzero(self.alive)
+            self._index = UniformGrid(slots, *(self.columns[name][slots] for name in ("x", "y", "width", "height")))
+            self._index_version = version
+        return self._index
+
+    def in_radius(self, x: float, y: float, radius: float) -> Tuple[List['UFO'], np.ndarray, np.ndarray]:
+        """
+        Finds the UFOs within a radius of a point, see UniformGrid.query.
+
+        :param x: X-coordinate of the point.
+        :param y: Y-coordinate of the point.
+        :param radius: Radius in pixels, inclusive.
+        :return: The UFOs in the order of their slots, their slots and their distances.
+        """
+        slots, distances = self.spatial_index().query(x, y, radius)
+        ufos = [self.views[slot] for slot in slots]
+        # A UFO removed by the main loop since the grid was built is left out
+        present = np.array([ufo is not None for ufo in ufos], dtype=bool)
+        if not present.all():
+            ufos = [ufo for ufo in ufos if ufo is not None]
+            slots, distances = slots[present], distances[present]
+        return ufos, slots, distances
 
     def get_instance(self, ufo_uuid: UUID) -> 'UFO':
         """
@@ -35,9 +163,9 @@ class UFOManager:
         """
         Retrieves all UFO instances managed by this class.
 
-        :return: A list of all UFO instances.
+        :return: A list of all UFO instances, in the order of their slots.
         """
-        return list(self.UFOs.values())
+        return [ufo for ufo in list(self.views) if ufo is not None]
 
 
 def altitude_to_y(altitude: float) -> int:
@@ -53,9 +181,51 @@ def altitude_to_y(altitude: float) -> int:
     return round(y_position)
 
 
-class UFO(BaseModel):
+class UFOData(BaseModel):
+    """
+    Validated attributes of a new UFO, see UFO.
+    """
+    uuid: UUID = Field(default_factory=uuid4)
+    speed: confloat() = None
+    max_speed: confloat(gt=0) = None
+    altitude: confloat() = None
+    temperature: confloat() = None
+    width: confloat() = None
+    height: confloat() = None
+    x: confloat() = None
+    y: confloat() = None
+    weapon: conint(ge=0, le=1) = 0
+    screen_width: conint(ge=0)
+
+
+def _column(name: str, kind: type) -> property:
+    """
+    Creates a property reading and writing the column of an attribute at the slot of a UFO.
+
+    :param name: Name of the attribute.
+    :param kind: Type the value is returned as.
+    :return: The property.
+    """
+    def get(self):
+        if self.slot is None:
+            return self._values[name]
+        return kind(UFO.manager.columns[name][self.slot])
+
+    def set(self, value):
+        if self.slot is None:
+            self._values[name] = value
+        else:
+            UFO.manager.columns[name][self.slot] = value
+            UFO.manager.moved()
+
+    return property(get, set, doc=f"The {name} of the UFO, stored in the column of the manager.")
+
+
+class UFO:
     """
     Represents a UFO with attributes for speed, altitude, dimensions, and screen position.
+    The attributes are validated on creation and stored in the columns of the UFOManager,
+    a UFO object is a view of its slot.
 
     Attributes:
         uuid (UUID): Unique identifier for the UFO.
@@ -70,37 +240,55 @@ class UFO(BaseModel):
         screen_width (int): Width of the screen in pixels.
         manager (ClassVar[UFOManager]): A class-level manager for all UFO instances.
         weapon (int): Weapon state of the UFO, either 0 (off) or 1 (on).
+        slot (int): Row of the UFO in the columns of the manager, None once it was removed.
     """
-    uuid: UUID = Field(default_factory=uuid4)
-    speed: confloat() = None
-    max_speed: confloat(gt=0) = None
-    altitude: confloat() = None
-    temperature: confloat() = None
-    width: confloat() = None
-    height: confloat() = None
-    x: confloat() = None
-    y: confloat() = None
-    weapon: conint(ge=0, le=1) = 0
-    screen_width: conint(ge=0)
+    __slots__ = ('uuid', 'slot', '_values')
     manager: ClassVar[UFOManager] = UFOManager()
 
+    speed = _column("speed", float)
+    max_speed = _column("max_speed", float)
+    altitude = _column("altitude", float)
+    temperature = _column("temperature", float)
+    width = _column("width", float)
+    height = _column("height", float)
+    x = _column("x", float)
+    y = _column("y", float)
+    weapon = _column("weapon", int)
+    screen_width = _column("screen_width", int)
+
     def __init__(self, **data):
         """
         Initializes a new UFO instance and registers it with the UFOManager.
 
         :param data: Keyword arguments to initialize the UFO attributes.
+        :raises pydantic.ValidationError: If an attribute is invalid.
+        """
+        validated = UFOData(**data)
+        self.uuid = validated.uuid
+        self.slot: Optional[int] = None
+        self._values: Optional[dict] = None
+        UFO.manager.add_instance(self, validated)
+
+    def __repr__(self) -> str:
+        return f"UFO(uuid={self.uuid}, x={self.x}, y={self.y}, speed={self.speed}, altitude={self.altitude})"
+
+    def detach(self, values: dict):
+        """
+        Keeps the attributes of the UFO in the object once its slot is freed.
+
+        :param values: The attributes, by name.
         """
-        super().__init__(**data)
-        UFO.manager.add_instance(self)
+        self._values = values
+        self.slot = None
 
     def move(self):
         """
         Updates the X-coordinate of the UFO based on its speed.
         Removes the UFO from the manager if it moves off the left edge of the screen.
         """
-        self.x -= (self.speed * 0.0027778)  # Convert speed to pixels per frame
-        if self.x + 80 < 0:  # Check if UFO is off the screen
-            del UFO.manager.UFOs[self.uuid]
+        self.x -= (self.speed * SPEED_TO_PIXELS)  # Convert speed to pixels per frame
+        if self.slot is not None and self.x + 80 < 0:  # Check if UFO is off the screen
+            UFO.manager.remove_instance(self.uuid)
 
     def move_y(self, altitude: float):
         """
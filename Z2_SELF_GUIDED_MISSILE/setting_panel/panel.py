@@ -1,4 +1,5 @@
 import pygame
+from Z2_SELF_GUIDED_MISSILE.config import package_path
 from Z2_SELF_GUIDED_MISSILE.models.ufo import UFO
 from Z2_SELF_GUIDED_MISSILE.setting_panel.slider import Slider
 from Z2_SELF_GUIDED_MISSILE.setting_panel.button import Button
@@ -179,7 +180,7 @@ class Panel:
                 f"Speed: {round(self.selected_ufo.speed)} km/h",
                 f"Weapon: {"yes" if self.selected_ufo.weapon == 1 else "no"}"
             ]
-            image_plane = pygame.image.load('texture/plane.png')
+            image_plane = pygame.image.load(package_path('texture/plane.png'))
             image_plane = pygame.transform.scale(image_plane, (160, 80))
             screen.blit(image_plane, (self.screen_size[0] + (250 - 160), 225))
             for i, detail in enumerate(details):
@@ -0,0 +1,259 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from uuid import UUID
+
+# The results are printed as JSON, pygame must not print its greeting first
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+from pydantic import BaseModel, confloat, conint
+from typing import Dict, List, Optional, Tuple
+
+from Z2_SELF_GUIDED_MISSILE.config import package_path
+from Z2_SELF_GUIDED_MISSILE.models.launcher import Launcher
+from Z2_SELF_GUIDED_MISSILE.models.ufo import UFO, UFOManager, altitude_to_y
+
+# UFO speeds are converted to pixels per frame of the game, which runs at 60 frames per second
+FRAME_RATE = 60
+DEFAULT_SCENARIO = package_path('simulation/scenarios/swarm.json')
+
+
+class LauncherSpec(BaseModel):
+    """
+    A launcher of a scenario, the other attributes are those of the launcher of the game.
+    """
+    x: conint(ge=0)
+    y: conint(ge=0) = 420
+    max_range: conint(ge=0) = 200
+    range: Dict[str, int] = {"SHORT": 100, "MEDIUM": 150, "LONG": 200}
+
+
+class Wave(BaseModel):
+    """
+    A group of UFOs entering the screen from the right, one every spacing seconds.
+    Speed and altitude are drawn uniformly from their bounds, the weapon is on with the given probability.
+    """
+    start: confloat(ge=0) = 0
+    count: conint(ge=0)
+    spacing: confloat(ge=0) = 0
+    every: Optional[confloat(gt=0)] = None
+    speed: Tuple[float, float] = (100, 600)
+    altitude: Tuple[float, float] = (0, 10_000)
+    weapon: confloat(ge=0, le=1) = 0.5
+
+
+class Scenario(BaseModel):
+    """
+    Everything a simulation runs, apart from the seed.
+
+    Attributes:
+        name (str): Name of the scenario.
+        duration (float): Simulated seconds.
+        timestep (float): Simulated seconds per step.
+        scan_interval (float): Simulated seconds between two scans of the launchers.
+        screen_width (int): Width of the sky in pixels, UFOs enter at its right edge.
+        launchers (list): The launchers.
+        waves (list): The waves of UFOs, a wave with every set repeats until the end.
+    """
+    name: str
+    duration: confloat(gt=0)
+    timestep: confloat(gt=0) = 1 / FRAME_RATE
+    scan_interval: confloat(gt=0) = 0.5
+    screen_width: conint(gt=0) = 500
+    launchers: List[LauncherSpec]
+    waves: List[Wave]
+
+    @classmethod
+    def load(cls, path: str) -> 'Scenario':
+        """
+        Reads a scenario from a JSON file.
+
+        :param path: Path to the scenario.
+        :return: The scenario.
+        """
+        with open(path, 'r') as file:
+            return cls(**json.load(file))
+
+
+class SimulationResult(BaseModel):
+    """
+    Outcome of a simulation, the same for the same scenario and seed.
+
+    Attributes:
+        events (list): Every spawn, first detection, first engagement decision and escape of a UFO,
+            as (step, kind, number of the UFO in the order of spawning).
+        digest (str): Hash of the events and the threat levels of every scan, to compare runs.
+    """
+    scenario: str
+    seed: int
+    steps: int
+    simulated_seconds: float
+    scans: int
+    spawned: int
+    detected: int
+    engaged: int
+    escaped: int
+    max_threat: float
+    mean_threat: float
+    events: List[Tuple[int, str, int]]
+    digest: str
+
+
+class Simulation:
+    """
+    Deterministic headless simulation of a scenario with a fixed timestep.
+    Every step spawns the UFOs due, moves all UFOs by the timestep and, every scan interval, scans with
+    every launcher, so the result depends on the scenario and the seed only, never on the wall clock or
+    the frame rate. Nothing is drawn, a simulation runs as fast as the scans allow.
+    The simulation owns UFO.manager from its creation, the UFOs of the game are not touched.
+    """
+
+    def __init__(self, scenario: Scenario, seed: int = 0):
+        """
+        Prepares the simulation.
+
+        :param scenario: The scenario to run.
+        :param seed: Seed of the attributes of the UFOs.
+        """
+        self.scenario = scenario
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.manager = UFOManager()
+        UFO.manager = self.manager
+        self.launchers = [Launcher(missiles_limit=5, default_reload_time=1, width=50, height=25,
+                                   color=(255, 255, 255), **spec.model_dump())
+                          for spec in scenario.launchers]
+        self.total_steps = round(scenario.duration / scenario.timestep)
+        self.scan_every = max(round(scenario.scan_interval / scenario.timestep), 1)
+        self.schedule = self.plan_spawns()
+        self.step_number = 0
+        self.numbers: Dict[UUID, int] = {}
+        self.detected: Dict[int, int] = {}
+        self.engaged: Dict[int, int] = {}
+        self.events: List[Tuple[int, str, int]] = []
+        self.threats: List[float] = []
+        self.scans = 0
+        self.digest = hashlib.sha256()
+
+    def plan_spawns(self) -> Dict[int, List[Wave]]:
+        """
+        Computes the steps at which the UFOs of every wave are spawned.
+
+        :return: The waves spawning a UFO, by step.
+        """
+        schedule = defaultdict(list)
+        timestep = self.scenario.timestep
+        for wave in self.scenario.waves:
+            start = wave.start
+            while start < self.scenario.duration:
+                for i in range(wave.count):
+                    step = round((start + i * wave.spacing) / timestep)
+                    if step < self.total_steps:
+                        schedule[step].append(wave)
+                if wave.every is None:
+                    break
+                start += wave.every
+        return schedule
+
+    def spawn(self, wave: Wave) -> UFO:
+        """
+        Spawns a UFO of a wave at the right edge of the sky.
+
+        :param wave: The wave of the UFO.
+        :return: The UFO.
+        """
+        speed = self.rng.uniform(*wave.speed)
+        altitude = self.rng.uniform(*wave.altitude)
+        weapon = int(self.rng.random() < wave.weapon)
+        ufo = UFO(uuid=UUID(bytes=self.rng.bytes(16), version=4), speed=speed, max_speed=600,
+                  altitude=altitude, temperature=100, x=self.scenario.screen_width + 25,
+                  y=altitude_to_y(altitude) - 20, screen_width=self.scenario.screen_width, width=80, height=40,
+                  weapon=weapon)
+        self.numbers[ufo.uuid] = len(self.numbers)
+        self.events.append((self.step_number, "spawn", self.numbers[ufo.uuid]))
+        return ufo
+
+    def scan(self):
+        """
+        Scans with every launcher and records the first detection and engagement decision of every UFO.
+        """
+        self.scans += 1
+        for launcher in self.launchers:
+            for ufo, threat_level, shot_rightness, _ in launcher.scan():
+                number = self.numbers[ufo.uuid]
+                self.threats.append(threat_level)
+                self.digest.update(np.array([number, threat_level, shot_rightness], dtype=float).tobytes())
+                if number not in self.detected:
+                    self.detected[number] = self.step_number
+                    self.events.append((self.step_number, "detect", number))
+                if shot_rightness > 0.5 and number not in self.engaged:
+                    self.engaged[number] = self.step_number
+                    self.events.append((self.step_number, "engage", number))
+
+    def step(self):
+        """
+        Advances the simulation by one timestep.
+        """
+        for wave in self.schedule.pop(self.step_number, []):
+            self.spawn(wave)
+        for ufo in self.manager.move_all(frames=self.scenario.timestep * FRAME_RATE):
+            self.events.append((self.step_number, "escape", self.numbers[ufo.uuid]))
+        if self.step_number % self.scan_every == 0:
+            self.scan()
+        self.step_number += 1
+
+    def run(self) -> SimulationResult:
+        """
+        Runs the remaining steps of the scenario.
+
+        :return: The outcome of the simulation.
+        """
+        while self.step_number < self.total_steps:
+            self.step()
+        self.digest.update(json.dumps(self.events).encode())
+        return SimulationResult(
+            scenario=self.scenario.name,
+            seed=self.seed,
+            steps=self.step_number,
+            simulated_seconds=self.step_number * self.scenario.timestep,
+            scans=self.scans,
+            spawned=len(self.numbers),
+            detected=len(self.detected),
+            engaged=len(self.engaged),
+            escaped=sum(kind == "escape" for _, kind, _ in self.events),
+            max_threat=max(self.threats, default=0.0),
+            mean_threat=float(np.mean(self.threats)) if self.threats else 0.0,
+            events=self.events,
+            digest=self.digest.hexdigest(),
+        )
+
+
+def main():
+    """
+    Runs a scenario headless and prints its outcome as JSON.
+    """
+    parser = argparse.ArgumentParser(description="Deterministic headless simulation of a scenario.")
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO, help="path to the scenario JSON file")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the UFOs")
+    parser.add_argument("--duration", type=float, help="simulated seconds, those of the scenario by default")
+    parser.add_argument("--events", action="store_true", help="include every event in the output")
+    args = parser.parse_args()
+
+    scenario = Scenario.load(args.scenario)
+    if args.duration is not None:
+        scenario = scenario.model_copy(update={"duration": args.duration})
+    start = time.perf_counter()
+    result = Simulation(scenario, args.seed).run()
+    seconds = time.perf_counter() - start
+
+    output = result.model_dump(exclude=None if args.events else {"events"})
+    output["wall_seconds"] = seconds
+    print(json.dumps(output, indent=2))
+
+
+if __name__ == '__main__':
+    main()
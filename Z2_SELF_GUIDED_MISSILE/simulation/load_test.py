@@ -0,0 +1,231 @@
+import argparse
+import json
+import os
+import platform
+import time
+
+# The results are printed as JSON, pygame must not print its greeting first
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+# Frames are drawn off-screen, no window is opened
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+from typing import Dict, List
+
+from Z2_SELF_GUIDED_MISSILE.config import get_settings, package_path
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.threat_level import calculate_threat_level_batch
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.shot_decision import calculate_shot_rightness_batch
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.missile_choice import calculate_required_missile_batch
+from Z2_SELF_GUIDED_MISSILE.models.launcher import Launcher
+from Z2_SELF_GUIDED_MISSILE.models.ufo import UFO, UFOManager, altitude_to_y
+
+SCREEN_WIDTH = 500
+SCREEN_HEIGHT = 600
+# Bounds of the sliders of the control panel
+SPEED = (10, 1500)
+ALTITUDE = (50, 10_000)
+STAGES = ["movement", "ufo_in_range", "threat_level", "shot_decision", "missile_choice", "scan", "rendering"]
+DEFAULT_BASELINE = package_path('simulation/load_test_baseline.json')
+
+
+def spawn_ufo(rng: np.random.Generator, x: float) -> UFO:
+    """
+    Spawns a UFO with a random speed, altitude and weapon, the way the panel creates them.
+
+    :param rng: Random number generator.
+    :param x: X-coordinate of the UFO.
+    :return: The UFO.
+    """
+    altitude = float(rng.uniform(*ALTITUDE))
+    return UFO(speed=float(rng.uniform(*SPEED)), max_speed=600, altitude=altitude, temperature=100, x=x,
+               y=altitude_to_y(altitude) - 20, screen_width=SCREEN_WIDTH, width=80, height=40,
+               weapon=int(rng.integers(0, 2)))
+
+
+def create_launchers(count: int) -> List[Launcher]:
+    """
+    Places launchers evenly along the ground.
+
+    :param count: Number of launchers.
+    :return: The launchers.
+    """
+    return [Launcher(missiles_limit=5, default_reload_time=1, x=round(SCREEN_WIDTH * (i + 1) / (count + 1)), y=420,
+                     width=50, height=25, color=(255, 255, 255), range={"SHORT": 100, "MEDIUM": 150, "LONG": 200},
+                     max_range=200)
+            for i in range(count)]
+
+
+def render(screen: pygame.Surface, image: pygame.Surface, launchers: List[Launcher], detected: List[List]):
+    """
+    Draws a frame the way the main loop does, without flipping the display.
+
+    :param screen: The surface drawn on.
+    :param image: Image of a UFO.
+    :param launchers: The launchers.
+    :param detected: The detected UFOs with their threat levels and shot decisions.
+    """
+    screen.fill((105, 156, 245))
+    for launcher in launchers:
+        launcher.draw(screen)
+    for ufo, threat_level, shot_rightness, _ in detected:
+        pygame.draw.rect(screen, (255, 0, 0), pygame.Rect(ufo.x - 10, ufo.y - 10, ufo.width + 20, ufo.height + 20), 2)
+        bar_y = ufo.y + ufo.height + 12
+        pygame.draw.rect(screen, (255, 0, 0), pygame.Rect(ufo.x - 5, bar_y, ufo.width * threat_level / 100 - 5, 5))
+        pygame.draw.circle(screen, (255, 0, 0) if shot_rightness > 0.5 else (0, 255, 0),
+                           (ufo.x + ufo.width + 2, bar_y + 2), 5)
+    for ufo in UFO.all():
+        screen.blit(image, (ufo.x, ufo.y))
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """
+    Summarizes the latencies of a stage.
+
+    :param timings: Seconds of every frame.
+    :return: Mean, median, 95th percentile and largest latency in milliseconds.
+    """
+    milliseconds = np.array(timings) * 1000
+    return {
+        "mean_ms": float(milliseconds.mean()),
+        "median_ms": float(np.median(milliseconds)),
+        "p95_ms": float(np.percentile(milliseconds, 95)),
+        "max_ms": float(milliseconds.max()),
+    }
+
+
+def run_swarm(size: int, launcher_count: int, frames: int, seed: int) -> dict:
+    """
+    Spawns a swarm over the sky and times every stage of a frame against it.
+    UFOs leaving the screen are replaced at its right edge, so the size of the swarm stays the same.
+
+    :param size: Number of UFOs.
+    :param launcher_count: Number of launchers.
+    :param frames: Frames timed.
+    :param seed: Seed of the swarm.
+    :return: The latencies of every stage, see summarize, and the average number of UFOs in range per launcher.
+    """
+    rng = np.random.default_rng(seed)
+    UFO.manager = UFOManager()
+    for _ in range(size):
+        spawn_ufo(rng, float(rng.uniform(-80, SCREEN_WIDTH + 25)))
+    launchers = create_launchers(launcher_count)
+    # A display mode is needed to convert the image to the format of the screen, as the main loop does
+    screen = pygame.display.set_mode((SCREEN_WIDTH * 2, SCREEN_HEIGHT))
+    image = pygame.transform.scale(pygame.image.load(package_path('texture/plane.png')), (80, 40)).convert_alpha()
+
+    timings = {stage: [] for stage in STAGES}
+    in_range = 0
+    for _ in range(frames):
+        start = time.perf_counter()
+        removed = UFO.manager.move_all()
+        timings["movement"].append(time.perf_counter() - start)
+        for _ in removed:
+            spawn_ufo(rng, SCREEN_WIDTH + 25)
+
+        stage = dict.fromkeys(STAGES[1:-1], 0.0)
+        detected = []
+        for launcher in launchers:
+            start = time.perf_counter()
+            ufos, slots, distance = UFO.manager.in_radius(launcher.x, launcher.y, launcher.max_range)
+            stage["ufo_in_range"] += time.perf_counter() - start
+            in_range += len(ufos)
+            columns = UFO.manager.columns
+            speed, altitude = columns["speed"][slots], columns["altitude"][slots]
+
+            start = time.perf_counter()
+            threat_levels = np.nan_to_num(calculate_threat_level_batch(
+                motion=np.ones(len(ufos)), weapon=columns["weapon"][slots], distance=distance * 10))
+            stage["threat_level"] += time.perf_counter() - start
+            start = time.perf_counter()
+            calculate_shot_rightness_batch(threat_level_input=threat_levels, speed_input=speed,
+                                           altitude_input=altitude)
+            stage["shot_decision"] += time.perf_counter() - start
+            start = time.perf_counter()
+            calculate_required_missile_batch(distance_input=distance, speed_input=speed, altitude_input=altitude)
+            stage["missile_choice"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            detected.extend(launcher.scan())
+            stage["scan"] += time.perf_counter() - start
+        for name, seconds in stage.items():
+            timings[name].append(seconds)
+
+        start = time.perf_counter()
+        render(screen, image, launchers, detected)
+        timings["rendering"].append(time.perf_counter() - start)
+
+    return {
+        "ufos": size,
+        "in_range_per_launcher": in_range / (frames * launcher_count),
+        "stages": {name: summarize(values) for name, values in timings.items()},
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, floor_ms: float) -> List[dict]:
+    """
+    Compares the median latency of every stage of every swarm with a baseline.
+
+    :param results: The results of this run.
+    :param baseline: The results of an earlier run.
+    :param tolerance: Largest accepted relative slowdown, e.g. 0.25 for 25 %.
+    :param floor_ms: Slowdowns of fewer milliseconds are accepted, they are below the noise of the timer.
+    :return: The stages slower than the baseline by more than the tolerance.
+    """
+    regressions = []
+    for size, swarm in results["swarms"].items():
+        previous = baseline.get("swarms", {}).get(size)
+        if previous is None:
+            continue
+        for stage, latency in swarm["stages"].items():
+            if stage not in previous["stages"]:
+                continue
+            before, after = previous["stages"][stage]["median_ms"], latency["median_ms"]
+            if after > before * (1 + tolerance) and after - before > floor_ms:
+                regressions.append({"ufos": int(size), "stage": stage, "baseline_ms": before, "median_ms": after,
+                                    "ratio": after / before if before else float("inf")})
+    return regressions
+
+
+def main():
+    """
+    Runs the load test and prints its results as JSON, exits with an error if a stage is slower than the baseline.
+    """
+    parser = argparse.ArgumentParser(description="Load test of the launcher scan against swarms of UFOs.")
+    parser.add_argument("--swarms", type=int, nargs="+", default=[100, 1_000, 10_000], help="numbers of UFOs")
+    parser.add_argument("--launchers", type=int, default=1, help="launchers scanning every frame")
+    parser.add_argument("--frames", type=int, default=30, help="frames timed per swarm")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the swarms")
+    parser.add_argument("--output", help="file to write the results to, besides printing them")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="results to compare with, if the file exists")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="largest accepted relative slowdown")
+    parser.add_argument("--floor-ms", type=float, default=0.05, help="smallest slowdown counted as a regression")
+    args = parser.parse_args()
+
+    results = {
+        "config": {"launchers": args.launchers, "frames": args.frames, "seed": args.seed,
+                   "inference": get_settings().fuzzy_settings.inference},
+        "machine": {"python": platform.python_version(), "numpy": np.__version__, "processor": platform.machine()},
+        "swarms": {str(size): run_swarm(size, args.launchers, args.frames, args.seed) for size in args.swarms},
+    }
+    regressions = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as file:
+            regressions = compare(results, json.load(file), args.tolerance, args.floor_ms)
+        results["regressions"] = regressions
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            file.write(output)
+    if regressions:
+        raise SystemExit(f"{len(regressions)} stages are slower than the baseline {args.baseline}.")
+
+
+if __name__ == '__main__':
+    main()
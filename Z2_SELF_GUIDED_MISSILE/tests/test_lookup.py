@@ -0,0 +1,41 @@
+import numpy as np
+
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.lookup import DEFAULT_RESOLUTION, FuzzyLookupTable
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.threat_level import get_threat_level_engine
+from Z2_SELF_GUIDED_MISSILE.fuzzy_logic.shot_decision import get_shot_decision_engine
+
+
+def compare(engine, inputs):
+    """
+    Evaluates a controller exactly and from a lookup table at the default resolution.
+
+    :param engine: The controller.
+    :param inputs: Crisp values of every antecedent, by its name.
+    :return: The exact and the interpolated outputs.
+    """
+    lookup = FuzzyLookupTable(engine, DEFAULT_RESOLUTION, cache_dir=None)
+    inputs = {name: np.asarray(values, dtype=float) for name, values in inputs.items()}
+    return engine.evaluate_batch(**inputs), lookup.evaluate_batch(**inputs)
+
+
+def test_threat_level_next_to_no_fire_node():
+    # No rule fires at a distance of exactly 1000, a node of the grid
+    distance = np.array([960, 980, 990, 1000, 1010, 1020, 1040])
+    ones = np.ones(len(distance))
+    exact, interpolated = compare(get_threat_level_engine(), {"motion": ones, "weapon": ones, "distance": distance})
+    assert np.array_equal(np.isnan(exact), np.isnan(interpolated))
+    assert np.nanmax(np.abs(exact - interpolated)) < 1
+
+
+def test_shot_decision_next_to_no_fire_node():
+    # No rule fires at an altitude of exactly 5000, a plane of nodes of the grid
+    altitude = np.array([4900, 4950, 4980, 5000, 5020, 5050, 5100])
+    threat_level = np.full(len(altitude), 75.0)
+    speed = np.full(len(altitude), 600.0)
+    exact, interpolated = compare(get_shot_decision_engine(),
+                                  {"threat_level": threat_level, "speed": speed, "altitude": altitude})
+    assert np.array_equal(np.isnan(exact), np.isnan(interpolated))
+    assert np.nanmax(np.abs(exact - interpolated)) < 0.05
+    # The lookup table takes the same fire decisions
+    defined = ~np.isnan(exact)
+    assert np.array_equal(exact[defined] > 0.5, interpolated[defined] > 0.5)
@@ -5,41 +5,147 @@ class Chomp(TwoPlayerGame):
         self.players: list[Player] = players
         self.max_x: int = max_x
         self.max_y: int = max_y
-        self.board: list[list[int]] = [[1 for _ in range(self.max_x)] for _ in range(self.max_y)]
+        # Every reachable position is a staircase (Young diagram), so the board is stored
+        # as the heights of its columns: heights[x] is the number of uneaten fields in column x.
+        self.heights: tuple[int, ...] = (max_y,) * max_x
+        # Heights before each move made, unmake_move restores them
+        self.undo_stack: list[tuple[int, ...]] = []
         self.current_player: int = 1
 
-    def possible_moves(self) -> list[str]:
+    @property
+    def board(self) -> list[list[int]]:
+        """
+        Builds the board as a max_y x max_x grid of ints (1 - available, 0 - eaten).
+        Kept for display purposes, the game itself works on column heights.
+
+        Returns:
+        list[list[int]]:Returning value
+        """
+        return [[1 if y < height else 0 for height in self.heights] for y in range(self.max_y)]
+
+    def is_available(self, x: int, y: int) -> bool:
+        """
+        Checks whether the field with zero-based coordinates (x, y) has not been eaten yet.
+
+        Parameters:
+        x (int): The zero-based x-coordinate of the field.
+        y (int): The zero-based y-coordinate of the field.
+
+        Returns:
+        bool:Returning value
+        """
+        return y < self.heights[x]
+
+    def move_at(self, x: int, y: int) -> int:
+        """
+        Returns the move that eats the field with zero-based coordinates (x, y).
+        Moves are the row-major indexes of the fields, y * max_x + x, so 0 is the poisoned field.
+
+        Parameters:
+        x (int): The zero-based x-coordinate of the field.
+        y (int): The zero-based y-coordinate of the field.
+
+        Returns:
+        int:Returning value
+        """
+        return y * self.max_x + x
+
+    def field(self, move: int) -> tuple[int, int]:
+        """
+        Returns the zero-based coordinates (x, y) of the field eaten by the move.
+
+        Parameters:
+        move (int): The move.
+
+        Returns:
+        tuple[int, int]:Returning value
+        """
+        y, x = divmod(move, self.max_x)
+        return x, y
+
+    def move_to_str(self, move: int) -> str:
+        """
+        Describes the move with the one-based coordinates of its field, e.g. '(3, 4)'.
+
+        Parameters:
+        move (int): The move.
+
+        Returns:
+        str:Returning value
+        """
+        x, y = self.field(move)
+        return f"({x + 1}, {y + 1})"
+
+    def possible_moves(self) -> list[int]:
         """
         function required by easyAI, lists possible moves.
-        forwards list of strings e.g. '11' which represents 'xy' coordinates
+        forwards list of ints, the row-major indexes of the available fields, starting with 0 (the poisoned field)
 
         Returns:
-        list[str]:Returning value
+        list[int]:Returning value
         """
-        moves = ["11"]
-        for y in range(self.max_y):
-            for x in range(self.max_x):
-                if self.board[y][x] == 1 and not (x == 0 and y == 0):
-                    moves.append(f"{x + 1}{y + 1}")
+        moves = []
+        heights = self.heights
+        max_x = self.max_x
+        width = len(heights) - heights.count(0)
+        for y in range(heights[0]):
+            # Heights never grow to the right, so each row is a prefix of the one below
+            while heights[width - 1] <= y:
+                width -= 1
+            start = y * max_x
+            moves.extend(range(start, start + width))
         return moves
 
-    def make_move(self, move: str):
+    def make_move(self, move: int):
         """
         Cuts the board based on field coordinates.
 
         Parameters:
-        move (str): A string representing a move, where the string is made up of two digits, e.g., '11'.
-        The string is split into two parts: the first digit represents the x-coordinate, and the second digit
-        represents the y-coordinate of the move on a grid or board.
+        move (int): The row-major index of the eaten field, y * max_x + x, see move_at.
+        """
+        y, x = divmod(move, self.max_x)
+
+        heights = self.heights
+        self.undo_stack.append(heights)
+        if y < heights[x]:  # Check if the field is available
+            # Cut the board - every column from x onwards is lowered to y
+            self.heights = heights[:x] + tuple(height if height < y else y for height in heights[x:])
+
+    def unmake_move(self, move: int):
         """
-        x = int(move[0]) - 1
-        y = int(move[1]) - 1
+        function used by easyAI, takes back the last move made. With it Negamax searches on a single
+        game object instead of copying the game for every node.
 
-        if self.board[y][x] == 1:  # Check if the field is available
-            # Cut the board
-            for i in range(y, self.max_y):
-                for j in range(x, self.max_x):
-                    self.board[i][j] = 0
+        Parameters:
+        move (int): The move to take back, it has to be the last move made.
+        """
+        # Tuples are immutable, so the previous heights are the whole undo record
+        self.heights = self.undo_stack.pop()
+
+    def copy(self) -> 'Chomp':
+        """
+        function used by easyAI instead of deepcopy, the heights tuple is immutable,
+        so only the undo stack is copied and the players are shared.
+
+        Returns:
+        Chomp:Returning value
+        """
+        game = type(self).__new__(type(self))
+        game.__dict__.update(self.__dict__)
+        game.undo_stack = self.undo_stack.copy()
+        return game
+
+    def ttentry(self) -> tuple[int, ...]:
+        """
+        function used by easyAI transposition tables, describes the position.
+        Columns that are fully eaten are skipped, so the key does not depend on the board size.
+
+        Returns:
+        tuple[int, ...]:Returning value
+        """
+        heights = self.heights
+        # Heights never grow to the right, so the eaten columns are all at the end
+        return heights[:len(heights) - heights.count(0)]
 
     def win(self) -> bool:
         """
@@ -48,7 +154,7 @@ class Chomp(TwoPlayerGame):
         Returns:
         bool:Returning value
         """
-        return self.board[0][0] == 0
+        return self.heights[0] == 0
 
     def is_over(self) -> bool:
         """
@@ -76,4 +182,4 @@ class Chomp(TwoPlayerGame):
         Returns:
         int:Returning value
         """
-        return 100 if self.win() else 0
\ No newline at end of file
+        return 100 if self.win() else 0
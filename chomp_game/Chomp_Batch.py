@@ -0,0 +1,162 @@
+import numpy as np
+
+# Batches are 2-D arrays of column heights, one position per row, all of the same board width.
+# Moves are the same row-major indexes as in Chomp, y * width + x, so 0 is the poisoned field.
+
+
+def to_batch(positions: list[tuple[int, ...]]) -> np.ndarray:
+    """
+    Stacks positions of the same board width into a batch.
+
+    Parameters:
+    positions (list[tuple[int, ...]]): Column heights of the positions, e.g. Chomp.heights.
+
+    Returns:
+    np.ndarray: The batch, one position per row.
+    """
+    return np.array(positions, dtype=np.int32).reshape(len(positions), -1)
+
+
+def win(heights: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Chomp.win: the poisoned field is eaten, the player to move has won.
+
+    Parameters:
+    heights (np.ndarray): The batch.
+
+    Returns:
+    np.ndarray: Flag per position.
+    """
+    return heights[:, 0] == 0
+
+
+def only_poison(heights: np.ndarray) -> np.ndarray:
+    """
+    Finds the positions where only the poisoned field is left, lost for the player to move.
+
+    Parameters:
+    heights (np.ndarray): The batch.
+
+    Returns:
+    np.ndarray: Flag per position.
+    """
+    return heights.sum(axis=1) == 1
+
+
+def move_counts(heights: np.ndarray, poison: bool = True) -> np.ndarray:
+    """
+    Counts the legal moves of every position.
+
+    Parameters:
+    heights (np.ndarray): The batch.
+    poison (bool): Whether eating the poisoned field counts as a move.
+
+    Returns:
+    np.ndarray: Number of moves per position.
+    """
+    counts = heights.sum(axis=1)
+    return counts if poison else counts - (heights[:, 0] > 0)
+
+
+def legal_mask(heights: np.ndarray, max_y: int, poison: bool = True) -> np.ndarray:
+    """
+    Vectorized Chomp.possible_moves as masks: mask[n, y, x] is set when the field (x, y) of position n is available.
+    Flattening a mask row-major gives the moves, mask.reshape(len(heights), -1)[n, move].
+
+    Parameters:
+    heights (np.ndarray): The batch.
+    max_y (int): The board height.
+    poison (bool): Whether eating the poisoned field counts as a move.
+
+    Returns:
+    np.ndarray: The N x max_y x width masks.
+    """
+    mask = np.arange(max_y)[None, :, None] < heights[:, None, :]
+    if not poison:
+        mask[:, 0, 0] = False
+    return mask
+
+
+def make_moves(heights: np.ndarray, moves: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Chomp.make_move: plays one move in every position.
+
+    Parameters:
+    heights (np.ndarray): The batch.
+    moves (np.ndarray): One move per position.
+
+    Returns:
+    np.ndarray: The positions after the moves, the batch is not modified.
+    """
+    y, x = np.divmod(moves, heights.shape[1])
+    # Every column from x onwards is lowered to y, fields already eaten stay eaten
+    cut = np.arange(heights.shape[1])[None, :] >= x[:, None]
+    return np.where(cut, np.minimum(heights, y[:, None]), heights)
+
+
+def successors(heights: np.ndarray, max_y: int, poison: bool = True) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Lists the positions reachable in one move from every position of the batch, in the order of Chomp.possible_moves.
+
+    Parameters:
+    heights (np.ndarray): The batch.
+    max_y (int): The board height.
+    poison (bool): Whether to include the moves eating the poisoned field.
+
+    Returns:
+    tuple[np.ndarray, np.ndarray, np.ndarray]: The successor positions, the index of the position each one
+    comes from and the move leading to it.
+    """
+    parents, y, x = np.nonzero(legal_mask(heights, max_y, poison))
+    moves = y * heights.shape[1] + x
+    return make_moves(heights[parents], moves), parents, moves
+
+
+def random_moves(heights: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Picks a random move other than eating the poisoned field in every position, uniformly over the available fields.
+    Every position needs at least one such move, see only_poison.
+
+    Parameters:
+    heights (np.ndarray): The batch.
+    rng (np.random.Generator): Random number generator.
+
+    Returns:
+    np.ndarray: One move per position.
+    """
+    rows = np.arange(len(heights))
+    sizes = heights.cumsum(axis=1)
+    # Index of the eaten field counted column by column, skipping the poisoned one at the bottom of column 0
+    picks = (rng.random(len(heights)) * (sizes[:, -1] - 1)).astype(sizes.dtype) + 1
+    x = (sizes <= picks[:, None]).sum(axis=1)
+    y = picks - (sizes[rows, x] - heights[rows, x])
+    return y * heights.shape[1] + x
+
+
+def known_lost(heights: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Chomp_Theory.known_result: finds the positions with a known result.
+
+    Parameters:
+    heights (np.ndarray): The batch, with at least one eaten column at the end of every position.
+
+    Returns:
+    np.ndarray: 1 where the player to move loses, 0 where they win, -1 where the result is not known.
+    An empty board, with the poisoned field eaten, is won by the player to move, as in Chomp.win.
+    """
+    top = heights[:, 0]
+    second = heights[:, 1]
+    width = np.count_nonzero(heights, axis=1)
+    lost = np.full(len(heights), -1, dtype=np.int32)
+    # Two columns, the transpose of two rows
+    two_columns = width == 2
+    lost[two_columns] = top[two_columns] == second[two_columns] + 1
+    two_rows = top == 2
+    lost[two_rows] = width[two_rows] == np.count_nonzero(heights[two_rows] == 2, axis=1) + 1
+    square = (width == top) & (heights[np.arange(len(heights)), width - 1] == top)
+    lost[square] = 0
+    # L-shapes last, they include the single row and column, a square of one field and two columns of heights 2 and 1
+    l_shapes = second <= 1
+    lost[l_shapes] = top[l_shapes] == width[l_shapes]
+    lost[width == 0] = 0
+    return lost
@@ -0,0 +1,90 @@
+import argparse
+import time
+from copy import deepcopy
+from easyAI import Negamax
+from chomp_game.Chomp import Chomp
+
+
+class CountingChomp(Chomp):
+    """
+    Chomp counting every move made, i.e. every node the search visits.
+    The counter is a class attribute, so it survives both copies and deep copies of the game.
+    """
+    nodes: int = 0
+
+    def make_move(self, move: int):
+        CountingChomp.nodes += 1
+        super().make_move(move)
+
+
+class CopyingChomp(CountingChomp):
+    """
+    Chomp searched the way easyAI does without unmake_move: copying the game for every node.
+    """
+
+    @property
+    def unmake_move(self):
+        # easyAI checks hasattr(game, "unmake_move"), an AttributeError makes it copy the game instead
+        raise AttributeError("unmake_move")
+
+
+class DeepCopyingChomp(CopyingChomp):
+    """
+    Chomp copied with easyAI's default deepcopy for every node, as before the staircase board.
+    """
+
+    def copy(self) -> 'DeepCopyingChomp':
+        return deepcopy(self)
+
+
+MODES = {
+    "deepcopy": DeepCopyingChomp,
+    "copy": CopyingChomp,
+    "unmake": CountingChomp,
+}
+
+
+def benchmark(game_class: type[CountingChomp], width: int, height: int, depth: int) -> tuple[int, float]:
+    """
+    Runs a single Negamax search from the starting position.
+
+    Parameters:
+    game_class (type[CountingChomp]): The game variant to search.
+    width (int): The board width.
+    height (int): The board height.
+    depth (int): The Negamax depth.
+
+    Returns:
+    tuple[int, float]: Visited nodes and the search time in seconds.
+    """
+    game = game_class(None, width, height)
+    CountingChomp.nodes = 0
+    start = time.perf_counter()
+    Negamax(depth)(game)
+    return CountingChomp.nodes, time.perf_counter() - start
+
+
+def main() -> None:
+    """
+    Compares the nodes per second of Negamax with copied and with unmade moves.
+    """
+    parser = argparse.ArgumentParser(description="Chomp Negamax nodes/sec benchmark.")
+    parser.add_argument("--boards", nargs="+", default=["4x4", "5x5"], help="board sizes, e.g. 4x4")
+    parser.add_argument("--depth", type=int, default=15, help="Negamax depth")
+    parser.add_argument("--repeat", type=int, default=3, help="searches per measurement, the best one is kept")
+    args = parser.parse_args()
+
+    print(f"{'board':>6} {'mode':>9} {'nodes':>10} {'seconds':>9} {'nodes/s':>11} {'speedup':>8}")
+    for board in args.boards:
+        width, height = map(int, board.lower().split("x"))
+        baseline = None
+        for mode, game_class in MODES.items():
+            nodes, seconds = min((benchmark(game_class, width, height, args.depth) for _ in range(args.repeat)),
+                                 key=lambda result: result[1])
+            rate = nodes / seconds
+            baseline = baseline or rate
+            print(f"{board:>6} {mode:>9} {nodes:>10} {seconds:>9.3f} {rate:>11.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
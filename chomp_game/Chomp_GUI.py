@@ -1,11 +1,32 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox
-from typing import Optional
-from easyAI import Negamax, Human_Player, AI_Player
+from typing import Callable, Optional
+from easyAI import Human_Player, AI_Player
 from chomp_game.Chomp import Chomp
+from chomp_game.Chomp_TT import ChompTranspositionTable
+from chomp_game.Chomp_Tablebase import ChompTablebase, TABLEBASE_PATH
+from chomp_game.Chomp_Search import IterativeDeepening
+from chomp_game.Chomp_Stats import SearchLog
+from chomp_game.Chomp_Parallel import ParallelNegamax
 
 MIN_SIZE = 2
-MAX_SIZE = 5
+MAX_SIZE = 100
+# Fixed-depth searches only fit small boards, larger ones are played under the AI time budget
+SEARCH_MAX_SIZE = 5
+# Cells shrink on larger boards, so the board fits in about BOARD_PIXELS x BOARD_PIXELS
+CELL_SIZE = 60
+BOARD_PIXELS = 720
+# Cells smaller than this are drawn without the "X"
+MIN_TEXT_CELL_SIZE = 24
+MODE_WINDOW_WIDTH = 400
+MODE_WINDOW_HEIGHT = 500
+# Room for the search statistics of the AI
+DEBUG_PANEL_WIDTH = 560
+DEBUG_PANEL_HEIGHT = 260
+AI_TIME_BUDGET_MS = 2000
+AI_POLL_MS = 50
 DEFAULT_COLOR = "#4CAF50"
 PLAYER1_COLOR = "#BBEE22"
 PLAYER2_COLOR = "#22FF00"
@@ -26,40 +47,60 @@ styles = {
         "relief": "raised",
         "width": 20
     },
+    "cell": {
+        "outline": "white",
+        "width": 1
+    },
+    "cell_text": {
+        "text": "X",
+        "fill": "white",
+        "font": ("Arial", 12)
+    },
     "label": {
         "font": ("Arial", 14),
         "bg": "#e8f5e9"
     },
+    "debug_label": {
+        "font": ("Courier", 9),
+        "justify": tk.LEFT,
+        "anchor": "w"
+    },
     "title_label": {
         "font": ("Arial", 24, "bold"),
         "bg": "#e8f5e9"
     }
 }
 
+
 class ChompGUI:
-    def __init__(self, game: Chomp, window_width: int, window_height: int) -> None:
+    def __init__(self, window: tk.Tk, on_restart: Callable[[], None]) -> None:
         """
-        Initializes the main game window and sets up the buttons.
+        Creates the game screen in the main window, it is shown by start() and reused for every game.
 
         Parameters:
-        game (Chomp): The game object.
-        window_width (int): Width of the window.
-        window_height (int): Height of the window.
+        window (tk.Tk): The main window.
+        on_restart (Callable[[], None]): Called when the game is restarted, shows the mode selection.
         """
-        self.button_frame = None
-        self.label = None
-        self.game = game
-        self.window = tk.Tk()
-        self.window.title("Chomp Game")
+        self.window = window
+        self.on_restart = on_restart
+        self.game: Optional[Chomp] = None
+        self.search_results: Optional[queue.Queue] = None
+        self.ai_after_id: Optional[str] = None
+        self.thinking_ticks = 0
+        # Canvas items of the cells, indexed by move, and the column heights they currently show
+        self.cells: list[int] = []
+        self.drawn_size: tuple[int, int] = (0, 0)
+        self.drawn_heights: tuple[int, ...] = ()
+        self.cell_size = CELL_SIZE
+        self.debug = False
+        self.notice = ""
         self.colors = {
             "default": DEFAULT_COLOR,
             "player1": PLAYER1_COLOR,
             "player2": PLAYER2_COLOR,
         }
-        self.setup_window(window_width, window_height)
+        self.frame = tk.Frame(self.window)
         self.create_widgets()
-        self.update_buttons()
-        self.window.mainloop()
 
     def setup_window(self, width: int, height: int) -> None:
         """
@@ -69,47 +110,80 @@ class ChompGUI:
         width (int): Width of the window.
         height (int): Height of the window.
         """
-        self.window.geometry(f"{width}x{height}")
-        screen_width = self.window.winfo_screenwidth()
-        screen_height = self.window.winfo_screenheight()
-        x = (screen_width // 2) - (width // 2)
-        y = (screen_height // 2) - (height // 2)
-        self.window.geometry(f"+{x}+{y}")
+        setup_window(self.window, width, height)
 
     def create_widgets(self) -> None:
         """
-        Creates the UI components of the game, including buttons and labels.
+        Creates the UI components of the game: the current player label, the board canvas, the debug panel
+        and the restart button. The debug panel is only shown when the game is started with it.
         """
-        self.label = tk.Label(self.window, text=self.current_player_text(), **styles["label"])
+        self.label = tk.Label(self.frame, text="", **styles["label"])
         self.label.pack(pady=10)
 
-        self.button_frame = tk.Frame(self.window)
-        self.button_frame.pack(pady=10)
+        self.canvas = tk.Canvas(self.frame, highlightthickness=0)
+        self.canvas.pack(pady=10)
+        self.canvas.bind("<Button-1>", self.handle_click)
 
-        self.buttons = [
-            [self.create_button(x, y) for x in range(self.game.max_x)]
-            for y in range(self.game.max_y)
-        ]
+        self.debug_label = tk.Label(self.frame, text="", **styles["debug_label"])
 
-        for x in range(self.game.max_x):
-            self.button_frame.grid_columnconfigure(x, weight=1)
+        restart_button = tk.Button(self.frame, text="Restart", command=self.restart_game, **styles["button"])
+        restart_button.pack(pady=10)
 
-    def create_button(self, x: int, y: int) -> tk.Button:
+    def start(self, game: Chomp, debug: bool = False, notice: str = "") -> None:
         """
-        Creates a button for the game board.
+        Shows the game screen for a new game.
 
         Parameters:
-        x (int): The x-coordinate for the button.
-        y (int): The y-coordinate for the button.
+        game (Chomp): The game object.
+        debug (bool): Whether to show the search statistics of the AI.
+        notice (str): Shown below the current player for the whole game, e.g. that an option is not available.
+        """
+        self.game = game
+        self.debug = debug
+        self.notice = notice
+        self.cell_size = max(1, min(CELL_SIZE, BOARD_PIXELS // max(game.max_x, game.max_y)))
+        board_width = self.cell_size * game.max_x
+        board_height = self.cell_size * game.max_y
+        # Room for the current player label and the restart button
+        window_width = max(board_width + 40, MODE_WINDOW_WIDTH)
+        window_height = board_height + 170 + (30 if notice else 0)
+        if debug:
+            window_width = max(window_width, DEBUG_PANEL_WIDTH)
+            window_height += DEBUG_PANEL_HEIGHT
+            self.debug_label.config(text="No search yet")
+            self.debug_label.pack(after=self.canvas, pady=5)
+        else:
+            self.debug_label.pack_forget()
+        self.setup_window(window_width, window_height)
+        self.draw_board()
+        self.frame.pack(fill=tk.BOTH, expand=True)
 
-        Returns:
-        tk.Button: The created button.
+    def draw_board(self) -> None:
+        """
+        Prepares the board canvas for a new game. The cells of the previous game are reused if the board
+        has the same size, only the eaten ones are recolored.
         """
-        button = tk.Button(self.button_frame, text="X",
-                           command=lambda xy=f"{x + 1}{y + 1}": self.handle_button_click(xy),
-                           **styles["button"])
-        button.grid(row=y, column=x, padx=5, pady=5)
-        return button
+        game = self.game
+        if self.drawn_size == (game.max_x, game.max_y) and self.cells:
+            for x, drawn in enumerate(self.drawn_heights):
+                for y in range(drawn, game.max_y):
+                    self.canvas.itemconfigure(self.cells[game.move_at(x, y)], fill=self.colors["default"])
+        else:
+            size = self.cell_size
+            self.canvas.delete("all")
+            self.canvas.config(width=size * game.max_x, height=size * game.max_y)
+            self.cells = [
+                self.canvas.create_rectangle(x * size, y * size, (x + 1) * size, (y + 1) * size,
+                                             fill=self.colors["default"], **styles["cell"])
+                for y in range(game.max_y) for x in range(game.max_x)
+            ]
+            if size >= MIN_TEXT_CELL_SIZE:
+                for y in range(game.max_y):
+                    for x in range(game.max_x):
+                        self.canvas.create_text((x + 0.5) * size, (y + 0.5) * size, **styles["cell_text"])
+            self.drawn_size = (game.max_x, game.max_y)
+        self.drawn_heights = game.heights
+        self.update_label()
 
     def current_player_text(self) -> str:
         """
@@ -122,28 +196,47 @@ class ChompGUI:
             return "Current Player: Computer"
         return f"Current Player: Player {self.game.current_player}"
 
-    def update_buttons(self) -> None:
+    def update_label(self) -> None:
+        """
+        Updates the current player label.
+        """
+        text = self.current_player_text()
+        self.label.config(text=f"{text}\n{self.notice}" if self.notice else text)
+
+    def update_board(self) -> None:
+        """
+        Colors the cells eaten since the last update with the color of the current player.
+        Only the changed cells are redrawn.
+        """
+        game = self.game
+        color = self.colors["player1" if game.current_player == 1 else "player2"]
+        for x, (drawn, height) in enumerate(zip(self.drawn_heights, game.heights)):
+            for y in range(height, drawn):
+                self.canvas.itemconfigure(self.cells[game.move_at(x, y)], fill=color)
+        self.drawn_heights = game.heights
+
+    def handle_click(self, event: tk.Event) -> None:
         """
-        Updates the state of the buttons and the current player label.
+        Handles a click on the board canvas, the clicked cell is the player's move.
+
+        Parameters:
+        event (tk.Event): The click event.
         """
-        for y in range(self.game.max_y):
-            for x in range(self.game.max_x):
-                if self.game.board[y][x] == 0:
-                    self.buttons[y][x].config(text="X", state=tk.DISABLED, bg=self.colors["player1" if self.game.current_player == 1 else "player2"])
-                else:
-                    self.buttons[y][x].config(text="X", state=tk.NORMAL, bg=self.colors["default"])
-        self.label.config(text=self.current_player_text())
+        x = event.x // self.cell_size
+        y = event.y // self.cell_size
+        if 0 <= x < self.game.max_x and 0 <= y < self.game.max_y and self.game.is_available(x, y):
+            self.handle_cell_click(self.game.move_at(x, y))
 
-    def handle_button_click(self, move: str) -> None:
+    def handle_cell_click(self, move: int) -> None:
         """
-        Handles a button click event for a player's move.
+        Handles a click on an available cell for a player's move.
 
         Parameters:
-        move (str): The move made by the player in the format "xy".
+        move (int): The move made by the player, see Chomp.move_at.
         """
         if not self.game.is_over() and not isinstance(self.game.players[self.game.current_player - 1], AI_Player):
             self.game.make_move(move)
-            self.update_buttons()
+            self.update_board()
             self.switch_player_if_needed()
 
     def switch_player_if_needed(self) -> None:
@@ -152,43 +245,76 @@ class ChompGUI:
         """
         if not self.game.is_over():
             self.game.current_player = 2 if self.game.current_player == 1 else 1
+            self.update_label()
             if isinstance(self.game.players[self.game.current_player - 1], AI_Player):
-                self.update_buttons()
-                self.window.after(1000, self.ai_move)
+                self.ai_after_id = self.window.after(1000, self.ai_move)
         if self.game.is_over():
             self.show_winner_message()
 
     def ai_move(self) -> None:
+        """
+        Starts the AI player's search in a background thread, so the window stays responsive.
+        The result is picked up by poll_ai_move.
+        """
+        player = self.game.players[self.game.current_player - 1]
+        game = self.game.copy()
+        results = queue.Queue(maxsize=1)
+        self.search_results = results
+
+        def search() -> None:
+            try:
+                results.put(player.ask_move(game))
+            except Exception as error:
+                results.put(error)
+
+        threading.Thread(target=search, name="chomp-ai", daemon=True).start()
+        self.thinking_ticks = 0
+        self.ai_after_id = self.window.after(AI_POLL_MS, self.poll_ai_move, results)
+
+    def poll_ai_move(self, results: queue.Queue) -> None:
+        """
+        Checks whether the AI search has finished, shows the thinking indicator until it has.
+
+        Parameters:
+        results (queue.Queue): The queue the search puts its move into.
+        """
+        try:
+            ai_move = results.get_nowait()
+        except queue.Empty:
+            self.thinking_ticks += 1
+            dots = "." * (self.thinking_ticks // 5 % 4)
+            self.label.config(text=f"Computer is thinking{dots}")
+            self.ai_after_id = self.window.after(AI_POLL_MS, self.poll_ai_move, results)
+            return
+        self.search_results = None
+        self.ai_after_id = None
+        if isinstance(ai_move, Exception):
+            raise ai_move
+        self.finish_ai_move(ai_move)
+
+    def finish_ai_move(self, ai_move: int) -> None:
         """
         Executes the AI player's move and updates the game state accordingly.
+
+        Parameters:
+        ai_move (int): The move found by the AI.
         """
-        self.lock_buttons()
-        ai_move = self.game.players[self.game.current_player - 1].ask_move(self.game)
+        if self.debug:
+            self.update_debug_panel()
         self.game.make_move(ai_move)
-        self.update_buttons()
+        self.update_board()
         if self.game.is_over():
             self.show_winner_message()
         else:
             self.game.current_player = 2 if self.game.current_player == 1 else 1
-            self.update_buttons()
-        self.unlock_buttons()
-
-    def lock_buttons(self) -> None:
-        """
-        Disables all buttons on the board.
-        """
-        for row in self.buttons:
-            for button in row:
-                button.config(state=tk.DISABLED)
+            self.update_label()
 
-    def unlock_buttons(self) -> None:
+    def update_debug_panel(self) -> None:
         """
-        Enables the buttons on the board that are available for the move.
+        Shows the statistics of the last search of the current AI player.
         """
-        for y in range(self.game.max_y):
-            for x in range(self.game.max_x):
-                if self.game.board[y][x] == 1:
-                    self.buttons[y][x].config(state=tk.NORMAL)
+        stats = getattr(getattr(self.game.players[self.game.current_player - 1], "AI_algo", None), "stats", None)
+        self.debug_label.config(text=stats.summary() if stats is not None else "No statistics for this AI")
 
     def show_winner_message(self) -> None:
         """
@@ -203,43 +329,104 @@ class ChompGUI:
         if result:
             self.restart_game()
         else:
-            self.window.destroy()
+            self.close()
 
-    def restart_game(self) -> None:
+    def cancel_ai_move(self) -> None:
+        """
+        Stops a pending or running AI search, its result is ignored.
+        """
+        if self.ai_after_id is not None:
+            self.window.after_cancel(self.ai_after_id)
+            self.ai_after_id = None
+        if self.search_results is None:
+            return
+        self.search_results = None
+        for player in self.game.players:
+            cancel = getattr(getattr(player, "AI_algo", None), "cancel", None)
+            if cancel is not None:
+                cancel()
+
+    def end_game(self) -> None:
+        """
+        Stops the AI search and releases the resources of the AI players.
+        """
+        if self.game is None:
+            return
+        self.cancel_ai_move()
+        for player in self.game.players:
+            close = getattr(getattr(player, "AI_algo", None), "close", None)
+            # The tablebase stays open for the next games
+            if close is not None and not isinstance(player.AI_algo, ChompTablebase):
+                close()
+        self.game = None
+
+    def close(self) -> None:
         """
-        Restarts the game.
+        Closes the window, stopping the AI search and releasing its resources first.
         """
+        self.end_game()
         self.window.destroy()
-        choose_game_mode()
 
-def choose_game_mode(default_negamax_depth: int = 15) -> None:
+    def restart_game(self) -> None:
+        """
+        Restarts the game, the window and the board are kept for the next one.
+        """
+        self.end_game()
+        self.frame.pack_forget()
+        self.on_restart()
+
+def setup_window(window: tk.Tk, width: int, height: int) -> None:
     """
-    Displays the game mode selection window.
+    Sets up the window's dimensions and centers it on the screen.
+
+    Parameters:
+    window (tk.Tk): The window.
+    width (int): Width of the window.
+    height (int): Height of the window.
+    """
+    screen_width = window.winfo_screenwidth()
+    screen_height = window.winfo_screenheight()
+    x = (screen_width // 2) - (width // 2)
+    y = (screen_height // 2) - (height // 2)
+    window.geometry(f"{width}x{height}+{x}+{y}")
+
+def choose_game_mode(default_negamax_depth: int = 15, search_log: Optional[str] = None) -> None:
+    """
+    Creates the main window and displays the game mode selection in it.
+    Both the mode selection and the game screen are kept for the whole session, restarting a game
+    switches back to the mode selection without rebuilding the window.
 
     Parameters:
     default_negamax_depth (int): Default Negamax depth for AI player.
+    search_log (Optional[str]): JSON Lines file the statistics of every AI search are appended to.
     """
-    mode_window = tk.Tk()
-    mode_window.title("Choose Game Mode")
-    mode_window.configure(bg="#e8f5e9")
+    tablebase = ChompTablebase(TABLEBASE_PATH) if TABLEBASE_PATH.exists() else None
+    log = SearchLog(search_log) if search_log is not None else None
+
+    window = tk.Tk()
+    window.title("Chomp Game")
+    window.configure(bg="#e8f5e9")
+    mode_frame = tk.Frame(window, bg="#e8f5e9")
 
-    window_width = 400
-    window_height = 400
-    mode_window.geometry(f"{window_width}x{window_height}")
+    def show_mode_selection() -> None:
+        """
+        Shows the mode selection screen.
+        """
+        window.title("Choose Game Mode")
+        setup_window(window, MODE_WINDOW_WIDTH, MODE_WINDOW_HEIGHT)
+        mode_frame.pack(fill=tk.BOTH, expand=True)
 
-    screen_width = mode_window.winfo_screenwidth()
-    screen_height = mode_window.winfo_screenheight()
-    x = (screen_width // 2) - (window_width // 2)
-    y = (screen_height // 2) - (window_height // 2)
-    mode_window.geometry(f"+{x}+{y}")
+    gui = ChompGUI(window, show_mode_selection)
+    window.protocol("WM_DELETE_WINDOW", gui.close)
 
-    def start_game(is_ai: bool, negamax_depth: Optional[int]) -> None:
+    def start_game(is_ai: bool, negamax_depth: Optional[int], parallel: bool = False) -> None:
         """
         Starts the game based on the selected mode and board size.
 
         Parameters:
         is_ai (bool): Whether the game is played against AI.
         negamax_depth (Optional[int]): Negamax depth for AI.
+        parallel (bool): Whether the AI searches on all CPU cores.
         """
         try:
             width = int(x_entry.get())
@@ -252,36 +439,31 @@ def choose_game_mode(default_negamax_depth: int = 15) -> None:
             messagebox.showerror("Invalid Size", str(e))
             return
 
-        mode_window.destroy()
-        players = [Human_Player(), AI_Player(Negamax(negamax_depth))] if is_ai else [Human_Player(), Human_Player()]
-        game = Chomp(players, width, height)
-
-        button_width = 10
-        button_height = 11
-        button_padding_x = 5
-        button_padding_y = 4
-
-        label_height = 130 if height < 3 else 120
-        label_width = 60 if width > 3 else 120
-        if height >= 4:
-            button_height = 12
-        if height >= 5:
-            button_height += 1
-        if height >= 8:
-            button_height += 1
-
-        window_width = button_width * width * button_padding_x + label_width
-        window_height = button_height * height * button_padding_y + label_height
-
-        ChompGUI(game, window_width, window_height)
-
-    title_label = tk.Label(mode_window, text="Chomp Game", **styles["title_label"])
+        mode_frame.pack_forget()
+        notice = ""
+        if not is_ai:
+            players = [Human_Player(), Human_Player()]
+        else:
+            if parallel and width <= SEARCH_MAX_SIZE and height <= SEARCH_MAX_SIZE:
+                ai_algo = ParallelNegamax(negamax_depth)
+            elif tablebase is not None and tablebase.covers(width, height):
+                ai_algo = tablebase
+            else:
+                ai_algo = IterativeDeepening(negamax_depth, budget_ms=AI_TIME_BUDGET_MS,
+                                             tt=ChompTranspositionTable(), log=log)
+            if parallel and not isinstance(ai_algo, ParallelNegamax):
+                notice = f"All cores only up to {SEARCH_MAX_SIZE}x{SEARCH_MAX_SIZE}, the AI uses one core"
+            players = [Human_Player(), AI_Player(ai_algo)]
+        window.title("Chomp Game")
+        gui.start(Chomp(players, width, height), debug=debug.get(), notice=notice)
+
+    title_label = tk.Label(mode_frame, text="Chomp Game", **styles["title_label"])
     title_label.pack(pady=20)
 
-    size_label = tk.Label(mode_window, text=f"Enter map size \n\n(width X height, min 2x2, max {MAX_SIZE}x{MAX_SIZE}):", **styles["label"])
+    size_label = tk.Label(mode_frame, text=f"Enter map size \n\n(width X height, min 2x2, max {MAX_SIZE}x{MAX_SIZE}):", **styles["label"])
     size_label.pack(pady=10)
 
-    size_frame = tk.Frame(mode_window, bg="#e8f5e9")
+    size_frame = tk.Frame(mode_frame, bg="#e8f5e9")
     size_frame.pack(pady=10)
 
     x_entry = tk.Entry(size_frame, **styles["default"])
@@ -292,13 +474,26 @@ def choose_game_mode(default_negamax_depth: int = 15) -> None:
     y_entry = tk.Entry(size_frame, **styles["default"])
     y_entry.pack(side=tk.LEFT)
 
-    ai_button = tk.Button(mode_window, text="Play with AI", command=lambda: start_game(True, default_negamax_depth), **styles["button"])
+    ai_button = tk.Button(mode_frame, text="Play with AI", command=lambda: start_game(True, default_negamax_depth), **styles["button"])
     ai_button.pack(pady=10)
 
-    player_button = tk.Button(mode_window, text="Play with another player", command=lambda: start_game(False, None), **styles["button"])
+    parallel_button = tk.Button(mode_frame, text="Play with AI (all cores)",
+                                command=lambda: start_game(True, default_negamax_depth, parallel=True), **styles["button"])
+    parallel_button.pack(pady=10)
+
+    player_button = tk.Button(mode_frame, text="Play with another player", command=lambda: start_game(False, None), **styles["button"])
     player_button.pack(pady=10)
 
-    mode_window.mainloop()
+    debug = tk.BooleanVar(mode_frame, value=False)
+    debug_check = tk.Checkbutton(mode_frame, text="Show search statistics", variable=debug, bg="#e8f5e9")
+    debug_check.pack(pady=5)
+
+    show_mode_selection()
+    window.mainloop()
+    if tablebase is not None:
+        tablebase.close()
+    if log is not None:
+        log.close()
 
 if __name__ == '__main__':
     choose_game_mode(15)
@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from chomp_game.Chomp import Chomp
+from chomp_game.Chomp_SelfPlay import percentile
+from chomp_game.Chomp_Server import DEFAULT_HOST, DEFAULT_PORT
+
+
+def random_positions(boards: list[tuple[int, int]], count: int, seed: int) -> list[dict]:
+    """
+    Builds requests for positions reached by random moves, as games in progress would send them.
+
+    Parameters:
+    boards (list[tuple[int, int]]): Board sizes as (width, height).
+    count (int): Number of positions.
+    seed (int): Seed of the random moves.
+
+    Returns:
+    list[dict]: The requests, without ids.
+    """
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        width, height = rng.choice(boards)
+        game = Chomp(None, width, height)
+        for _ in range(rng.randrange(4)):
+            moves = game.possible_moves()[1:]
+            if not moves:
+                break
+            game.make_move(rng.choice(moves))
+        positions.append({"width": width, "height": height, "heights": list(game.heights)})
+    return positions
+
+
+async def run_client(host: str, port: int, requests: list[dict], latencies: list[float], counters: dict) -> None:
+    """
+    Sends requests over one connection, each after the previous answer, and records the latencies.
+
+    Parameters:
+    host (str): The service address.
+    port (int): The service port.
+    requests (list[dict]): The requests to send.
+    latencies (list[float]): Latencies in milliseconds, appended to.
+    counters (dict): Counts of cached, coalesced and failed answers, updated.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for request_id, request in enumerate(requests):
+            start = time.perf_counter()
+            writer.write(json.dumps(dict(request, id=request_id)).encode() + b"\n")
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append((time.perf_counter() - start) * 1000)
+            if "error" in response:
+                counters["errors"] += 1
+            else:
+                counters["cached"] += response["cached"]
+                counters["coalesced"] += response["coalesced"]
+    finally:
+        writer.close()
+
+
+async def load_test(host: str, port: int, clients: int, requests: int, positions: list[dict], seed: int) -> dict:
+    """
+    Runs concurrent clients against the service.
+
+    Parameters:
+    host (str): The service address.
+    port (int): The service port.
+    clients (int): Number of concurrent connections.
+    requests (int): Requests sent by every client.
+    positions (list[dict]): Positions the requests are drawn from.
+    seed (int): Seed of the request order.
+
+    Returns:
+    dict: Throughput, latency percentiles and the share of cached and coalesced answers.
+    """
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    counters = {"cached": 0, "coalesced": 0, "errors": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, [rng.choice(positions) for _ in range(requests)], latencies, counters)
+                           for _ in range(clients)))
+    seconds = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"stats": true}\n')
+    await writer.drain()
+    service = json.loads(await reader.readline())
+    writer.close()
+
+    total = len(latencies)
+    return {
+        "clients": clients,
+        "requests": total,
+        "seconds": seconds,
+        "throughput": total / seconds,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies),
+        },
+        "cached": counters["cached"] / total,
+        "coalesced": counters["coalesced"] / total,
+        "errors": counters["errors"],
+        "service": service,
+    }
+
+
+def main() -> None:
+    """
+    Load-tests a running solver service and prints throughput and latency as JSON.
+    """
+    parser = argparse.ArgumentParser(description="Load test for the Chomp best move service.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="service address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="service port")
+    parser.add_argument("--clients", type=int, default=50, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=20, help="requests sent by every client")
+    parser.add_argument("--boards", nargs="+", default=["5x5", "6x5", "7x6"], help="board sizes, e.g. 5x5")
+    parser.add_argument("--positions", type=int, default=200, help="distinct positions the requests are drawn from")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the positions and of the request order")
+    args = parser.parse_args()
+
+    boards = [tuple(map(int, board.lower().split("x"))) for board in args.boards]
+    positions = random_positions(boards, args.positions, args.seed)
+    report = asyncio.run(load_test(args.host, args.port, args.clients, args.requests, positions, args.seed))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+import math
+import random
+import threading
+import time
+from typing import Optional
+import numpy as np
+from chomp_game.Chomp import Chomp
+from chomp_game.Chomp_Batch import known_lost, make_moves, random_moves
+from chomp_game.Chomp_Stats import SearchLog, SearchStats
+from chomp_game.Chomp_Theory import canonical, known_result
+
+DEFAULT_BUDGET_MS = 2000
+DEFAULT_BATCH = 64
+DEFAULT_EXPLORATION = 1.4
+
+
+class Node:
+    """
+    Node of the search tree, a position reached by a move.
+    wins counts the playouts won by the player who made the move, out of visits.
+    """
+    __slots__ = ("heights", "move", "parent", "children", "untried", "visits", "wins", "result")
+
+    def __init__(self, heights: tuple[int, ...], move: Optional[int] = None, parent: Optional["Node"] = None) -> None:
+        self.heights: tuple[int, ...] = heights
+        self.move: Optional[int] = move
+        self.parent: Optional[Node] = parent
+        self.children: list[Node] = []
+        # Moves without a child yet, filled in on the first visit
+        self.untried: Optional[list[int]] = None
+        self.visits: int = 0
+        self.wins: float = 0
+        # Whether the player to move wins, for positions solved without playouts
+        self.result: Optional[bool] = None
+
+    def uct_child(self, exploration: float) -> "Node":
+        """
+        Selects the child with the best UCT score.
+
+        Parameters:
+        exploration (float): Weight of the exploration term.
+
+        Returns:
+        Node: The selected child.
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits))
+
+
+def random_playouts(heights: tuple[int, ...], count: int, rng: np.random.Generator) -> int:
+    """
+    Plays random games from a position, all at once on a count x width array of column heights.
+    Every move eats a random field other than the poisoned one. A game ends when it reaches a
+    position with a known result (see Chomp_Batch.known_lost), at the latest when only the
+    poisoned field is left.
+
+    Parameters:
+    heights (tuple[int, ...]): Column heights of the position.
+    count (int): Number of games to play.
+    rng (np.random.Generator): Random number generator.
+
+    Returns:
+    int: Number of games won by the player to move in the position.
+    """
+    # An eaten column at the end, so even a single column board has a second column to look at
+    boards = np.tile(np.asarray(heights + (0,), dtype=np.int32), (count, 1))
+    # Player who lost each game, 0 - the player to move in the position
+    losers = np.zeros(count, dtype=np.int32)
+    active = np.arange(count)
+    turn = 0
+    while active.size:
+        lost = known_lost(boards)
+        finished = lost >= 0
+        if finished.any():
+            losers[active[finished]] = turn ^ (lost[finished] == 0)
+            keep = ~finished
+            active, boards = active[keep], boards[keep]
+            if not active.size:
+                break
+        boards = make_moves(boards, random_moves(boards, rng))
+        turn ^= 1
+    return int(np.count_nonzero(losers))
+
+
+class MCTS:
+    """
+    easyAI algorithm playing Chomp with Monte Carlo Tree Search: UCT selection and batches of
+    random playouts run together in NumPy. It answers within the time budget on any board size.
+    The tree is kept between moves, the subtree of the current position is reused.
+    The telemetry of the last search is kept in stats, its nodes are the tree iterations.
+    Use it as AI_Player(MCTS(budget_ms=2000)).
+    """
+
+    def __init__(self, budget_ms: Optional[int] = DEFAULT_BUDGET_MS, iterations: Optional[int] = None,
+                 batch: int = DEFAULT_BATCH, exploration: float = DEFAULT_EXPLORATION,
+                 reuse_tree: bool = True, seed: Optional[int] = None, log: Optional[SearchLog] = None) -> None:
+        """
+        Parameters:
+        budget_ms (Optional[int]): Wall-clock time for a single move, in milliseconds, None for no limit.
+        iterations (Optional[int]): Number of tree iterations for a single move, None for no limit.
+        batch (int): Random playouts run from every new node.
+        exploration (float): Weight of the exploration term of UCT.
+        reuse_tree (bool): Whether to keep the tree between moves.
+        seed (Optional[int]): Seed of the random playouts, for reproducible games.
+        log (Optional[SearchLog]): Log the statistics of every search are written to.
+        """
+        if budget_ms is None and iterations is None:
+            raise ValueError("MCTS needs a time budget or an iteration limit.")
+        self.budget_ms: Optional[int] = budget_ms
+        self.iterations: Optional[int] = iterations
+        self.batch: int = batch
+        self.exploration: float = exploration
+        self.reuse_tree: bool = reuse_tree
+        self.rng = np.random.default_rng(seed)
+        self.random = random.Random(seed)
+        self.root: Optional[Node] = None
+        self.iterations_done: int = 0
+        self.playouts: int = 0
+        self.value: float = 0
+        self._board: Optional[Chomp] = None
+        self.log: Optional[SearchLog] = log
+        self.stats: Optional[SearchStats] = None
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """
+        Stops a running search, it returns the best move found so far. Safe to call from another thread.
+        """
+        self._cancelled.set()
+
+    def find_root(self, game: Chomp) -> Node:
+        """
+        Returns the node of the current position, taken from the previous tree if it is there.
+
+        Parameters:
+        game (Chomp): The game in the current position.
+
+        Returns:
+        Node: The root of the search.
+        """
+        board = self._board
+        if (self.reuse_tree and self.root is not None and board is not None
+                and (board.max_x, board.max_y) == (game.max_x, game.max_y)):
+            # The position is usually two moves below the previous root: our move and the opponent's
+            nodes = [self.root]
+            for _ in range(3):
+                for node in nodes:
+                    if node.heights == game.heights:
+                        node.parent = None
+                        return node
+                nodes = [child for node in nodes for child in node.children]
+        self._board = Chomp(None, game.max_x, game.max_y)
+        return Node(game.heights)
+
+    def expand(self, node: Node) -> None:
+        """
+        Lists the moves of a node on its first visit, solving it right away if possible.
+
+        Parameters:
+        node (Node): The node to expand.
+        """
+        board = self._board
+        board.heights = node.heights
+        # Eating the poisoned field is never better than any other move
+        node.untried = board.possible_moves()[1:]
+        self.random.shuffle(node.untried)
+        if not node.untried:
+            node.result = False
+        else:
+            known = known_result(canonical(node.heights)[0])
+            if known is not None:
+                node.result = known[0]
+
+    def child(self, node: Node, move: int) -> Node:
+        """
+        Adds the child reached by a move to a node.
+
+        Parameters:
+        node (Node): The parent node.
+        move (int): The move.
+
+        Returns:
+        Node: The new child.
+        """
+        board = self._board
+        board.heights = node.heights
+        board.make_move(move)
+        child = Node(board.heights, move, node)
+        board.unmake_move(move)
+        node.children.append(child)
+        return child
+
+    def iterate(self, root: Node) -> None:
+        """
+        Runs one iteration: selects a node with UCT, adds a child to it, plays a batch of random
+        games from the child and backs the results up the tree. Solved positions are backed up
+        too: a position with a move into a lost position is won, a position with all of its moves
+        into won positions is lost.
+
+        Parameters:
+        root (Node): The root of the search.
+        """
+        node = root
+        while node.result is None and not node.untried and node.children:
+            node = node.uct_child(self.exploration)
+        if node.result is None and node.untried:
+            node = self.child(node, node.untried.pop())
+            self.expand(node)
+
+        if node.result is not None:
+            # Solved positions are worth a whole batch of certain results
+            to_move_wins = self.batch if node.result else 0
+        else:
+            to_move_wins = random_playouts(node.heights, self.batch, self.rng)
+            self.playouts += self.batch
+        # wins are counted for the player who moved into the node, the players alternate going up
+        wins = self.batch - to_move_wins
+        while node is not None:
+            node.visits += self.batch
+            node.wins += wins
+            wins = self.batch - wins
+            parent = node.parent
+            if parent is not None and parent.result is None and node.result is not None:
+                if not node.result:
+                    parent.result = True
+                elif not parent.untried and all(child.result for child in parent.children):
+                    parent.result = False
+            node = parent
+
+    def __call__(self, game: Chomp) -> int:
+        """
+        Returns the most visited move after searching within the budget, or a proven win.
+
+        Parameters:
+        game (Chomp): The game to find a move for, it is not modified.
+
+        Returns:
+        int: The move.
+        """
+        self._cancelled.clear()
+        start = time.perf_counter()
+        stats = SearchStats(type(self).__name__, game)
+        root = self.find_root(game)
+        reused_visits = root.visits
+        move = self.search(root, game, None if self.budget_ms is None else start + self.budget_ms / 1000)
+
+        stats.move = game.move_to_str(move)
+        stats.value = self.value
+        stats.nodes = self.iterations_done
+        # Length of the principal variation, the most visited line of the tree
+        node = root
+        while node.children:
+            node = max(node.children, key=lambda child: child.visits)
+            stats.depth_reached += 1
+        stats.seconds = time.perf_counter() - start
+        stats.extra = {"playouts": self.playouts, "reused_visits": reused_visits, "root_visits": root.visits,
+                       "solved": root.result}
+        self.stats = stats
+        if self.log is not None:
+            self.log.write(stats)
+        return move
+
+    def search(self, root: Node, game: Chomp, deadline: Optional[float]) -> int:
+        """
+        Searches from the root until the deadline, the iteration limit or a proof.
+
+        Parameters:
+        root (Node): The node of the current position.
+        game (Chomp): The game in the current position.
+        deadline (Optional[float]): perf_counter time to stop at, None for no limit.
+
+        Returns:
+        int: The move.
+        """
+        if root.untried is None:
+            self.expand(root)
+        self.root = root
+        self.iterations_done = 0
+        self.playouts = 0
+
+        if sum(root.heights) == 1:
+            self.value = 0
+            return game.move_at(0, 0)
+        key, transposed = canonical(root.heights)
+        known = known_result(key)
+        if known is not None:
+            won, (x, y) = known
+            self.value = 1 if won else 0
+            return game.move_at(y, x) if transposed else game.move_at(x, y)
+
+        # At least one iteration, so the root has a child to play
+        while True:
+            self.iterate(root)
+            self.iterations_done += 1
+            if root.result is not None or self._cancelled.is_set():
+                break
+            if self.iterations is not None and self.iterations_done >= self.iterations:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        # A move into a lost position wins, moves into won positions are only played when all moves lose
+        best = min(root.children, key=lambda child: (child.result is not False, child.result is True, -child.visits))
+        self.value = best.wins / best.visits
+        return best.move
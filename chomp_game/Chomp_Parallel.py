@@ -0,0 +1,172 @@
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Optional
+from easyAI.AI.Negamax import negamax
+from chomp_game.Chomp import Chomp
+from chomp_game.Chomp_Search import PROVEN_SCORE
+from chomp_game.Chomp_TT import ChompTranspositionTable
+
+inf = float("infinity")
+CANCEL_POLL_S = 0.1
+
+# Every worker process keeps its own table between tasks, so later root moves and later turns reuse it
+_worker_tt: Optional[ChompTranspositionTable] = None
+
+
+def _init_worker(tt_capacity: int) -> None:
+    global _worker_tt
+    _worker_tt = ChompTranspositionTable(tt_capacity)
+
+
+def _worker_pid(_) -> int:
+    return os.getpid()
+
+
+def search_root_move(heights: tuple[int, ...], max_x: int, max_y: int, move: int, depth: int) -> float:
+    """
+    Searches the position after a single root move, this is the task run by the worker processes.
+
+    Parameters:
+    heights (tuple[int, ...]): Column heights of the root position.
+    max_x (int): The board width.
+    max_y (int): The board height.
+    move (int): The root move to search.
+    depth (int): The depth of the whole search, including the root move.
+
+    Returns:
+    float: The Negamax value of the root move for the player making it.
+    """
+    game = Chomp(None, max_x, max_y)
+    game.heights = heights
+    game.make_move(move)
+    game.switch_player()
+    # Same remaining depth and score bonus as the child of a sequential Negamax(depth) root
+    return -negamax(game, depth - 1, depth - 1, lambda g: g.scoring(), -inf, inf, _worker_tt)
+
+
+class ParallelNegamax:
+    """
+    easyAI algorithm splitting the root moves of a Negamax search across a pool of processes.
+    Each root move is searched to full width by one worker with its own transposition table.
+    The best value wins and, without stop_on_win, ties go to the first move, as in easyAI.
+    Use it as AI_Player(ParallelNegamax(15)), call close() when done with it.
+    """
+
+    def __init__(self, depth: int, workers: Optional[int] = None, tt_capacity: int = 100_000,
+                 stop_on_win: bool = True) -> None:
+        """
+        Parameters:
+        depth (int): The Negamax depth.
+        workers (Optional[int]): Number of worker processes, all CPU cores by default.
+        tt_capacity (int): Size of the transposition table of each worker.
+        stop_on_win (bool): Whether to play the first forced win found instead of waiting for all root moves.
+        """
+        self.depth: int = depth
+        self.workers: int = workers or os.cpu_count() or 1
+        self.tt_capacity: int = tt_capacity
+        self.stop_on_win: bool = stop_on_win
+        self.alpha: float = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cancelled = threading.Event()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned workers do not inherit the Tk state of the GUI process
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_worker, initargs=(self.tt_capacity,))
+        return self._pool
+
+    def start(self) -> None:
+        """
+        Starts all the worker processes, otherwise they are started by the first search.
+        """
+        list(self._get_pool().map(_worker_pid, range(self.workers)))
+
+    def cancel(self) -> None:
+        """
+        Stops waiting for the running search, it returns the best move found so far.
+        Root moves already being searched by the workers are left to finish in the background.
+        """
+        self._cancelled.set()
+
+    def __call__(self, game: Chomp) -> int:
+        """
+        Returns the best move, searching the root moves in parallel.
+
+        Parameters:
+        game (Chomp): The game to find a move for, it is not modified.
+
+        Returns:
+        int: The move.
+        """
+        self._cancelled.clear()
+        moves = game.possible_moves()
+        pool = self._get_pool()
+        futures: dict[Future, int] = {
+            pool.submit(search_root_move, game.heights, game.max_x, game.max_y, move, self.depth): index
+            for index, move in enumerate(moves)
+        }
+        values: list[Optional[float]] = [None] * len(moves)
+        pending = set(futures)
+        try:
+            while pending and not self._cancelled.is_set():
+                done, pending = wait(pending, timeout=CANCEL_POLL_S, return_when=FIRST_COMPLETED)
+                for future in done:
+                    values[futures[future]] = future.result()
+                # A forced win cannot be improved on, the remaining moves are not needed
+                if self.stop_on_win and any(values[futures[future]] >= PROVEN_SCORE for future in done):
+                    break
+        finally:
+            for future in futures:
+                future.cancel()
+
+        best_index = 0
+        for index, value in enumerate(values):
+            if value is not None and (values[best_index] is None or value > values[best_index]):
+                best_index = index
+        self.alpha = values[best_index] if values[best_index] is not None else 0
+        return moves[best_index]
+
+    def close(self) -> None:
+        """
+        Shuts the worker processes down.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def main() -> None:
+    """
+    Benchmarks the parallel search from the starting position with different numbers of workers.
+    """
+    parser = argparse.ArgumentParser(description="Chomp parallel Negamax benchmark.")
+    parser.add_argument("--board", default="7x7", help="board size, e.g. 7x7")
+    parser.add_argument("--depth", type=int, default=10, help="Negamax depth")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="worker counts to compare")
+    args = parser.parse_args()
+
+    width, height = map(int, args.board.lower().split("x"))
+    print(f"{'workers':>7} {'move':>8} {'value':>8} {'seconds':>9} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        # Every root move is searched, so all runs do the same work
+        algo = ParallelNegamax(args.depth, workers, stop_on_win=False)
+        # Start the processes before timing, so only the search is measured
+        algo.start()
+        game = Chomp(None, width, height)
+        start = time.perf_counter()
+        move = algo(game)
+        seconds = time.perf_counter() - start
+        algo.close()
+        baseline = baseline or seconds
+        print(f"{workers:>7} {game.move_to_str(move):>8} {algo.alpha:>8.2f} {seconds:>9.3f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import threading
+import time
+from typing import Optional
+from easyAI import Negamax
+from chomp_game.Chomp import Chomp
+from chomp_game.Chomp_Theory import smallest_bite
+from chomp_game.Chomp_Stats import DepthStats, NodeCounter, SearchLog, SearchStats
+from chomp_game.Chomp_TT import ChompTranspositionTable
+
+DEFAULT_BUDGET_MS = 2000
+# Scores above this mean the search found a forced win or loss, see Chomp.scoring
+PROVEN_SCORE = 100
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget is spent or the search is cancelled.
+    """
+
+
+class IterativeDeepening:
+    """
+    easyAI algorithm running Negamax at depth 1, 2, ... until the time budget is spent.
+    The move of the deepest finished search is played, so there is always an answer within the budget.
+    The telemetry of the last search is kept in stats.
+    Use it as AI_Player(IterativeDeepening(15, budget_ms=2000)).
+    """
+
+    def __init__(self, max_depth: int, budget_ms: int = DEFAULT_BUDGET_MS,
+                 tt: Optional[ChompTranspositionTable] = None, log: Optional[SearchLog] = None) -> None:
+        """
+        Parameters:
+        max_depth (int): The deepest Negamax search to run.
+        budget_ms (int): Wall-clock time for a single move, in milliseconds.
+        tt (Optional[ChompTranspositionTable]): Table shared by all depths, the shallower searches
+        fill it with the best moves, which are then tried first by the deeper ones.
+        log (Optional[SearchLog]): Log the statistics of every search are written to.
+        """
+        self.max_depth: int = max_depth
+        self.budget_ms: int = budget_ms
+        self.tt: Optional[ChompTranspositionTable] = tt
+        self.depth_reached: int = 0
+        self.value: float = 0
+        self.log: Optional[SearchLog] = log
+        self.stats: Optional[SearchStats] = None
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """
+        Stops a running search, it returns the best move found so far. Safe to call from another thread.
+        """
+        self._cancelled.set()
+
+    def __call__(self, game: Chomp) -> int:
+        """
+        Returns the best move found within the time budget.
+
+        Parameters:
+        game (Chomp): The game to find a move for, it is not modified.
+
+        Returns:
+        int: The move.
+        """
+        self._cancelled.clear()
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000
+        stats = SearchStats(type(self).__name__, game)
+        tt = self.tt
+        cancelled = self._cancelled
+
+        def scoring(searched_game: Chomp) -> int:
+            # Leaves are reached often enough to check the clock without slowing the search down
+            if cancelled.is_set() or time.perf_counter() >= deadline:
+                raise SearchTimeout
+            return searched_game.scoring()
+
+        # Until depth 1 finishes, eat a single field: move 0 is the poisoned field and loses at once,
+        # the smallest bite is the poisoned field only when nothing else is left
+        best_move = game.move_at(*smallest_bite(game.ttentry()))
+        self.depth_reached = 0
+        self.value = 0
+        # The game cannot last longer than the number of fields left
+        max_depth = min(self.max_depth, sum(game.heights))
+        for depth in range(1, max_depth + 1):
+            negamax = Negamax(depth, scoring=scoring, tt=tt)
+            # An interrupted search leaves its moves made, so every depth works on a fresh copy
+            searched = game.copy()
+            counter = NodeCounter(searched)
+            tt_before = (tt.hits, tt.misses, tt.theory_hits) if tt is not None else (0, 0, 0)
+            depth_start = time.perf_counter()
+            try:
+                move = negamax(searched)
+                completed = True
+            except SearchTimeout:
+                completed = False
+            tt_after = (tt.hits, tt.misses, tt.theory_hits) if tt is not None else (0, 0, 0)
+            hits, misses, theory_hits = (after - before for after, before in zip(tt_after, tt_before))
+            stats.depths.append(DepthStats(depth, counter.nodes, time.perf_counter() - depth_start, counter.branching,
+                                           hits, misses, theory_hits, completed,
+                                           game.move_to_str(move) if completed else None,
+                                           negamax.alpha if completed else None))
+            stats.nodes += counter.nodes
+            if not completed:
+                break
+            best_move = move
+            self.depth_reached = depth
+            self.value = negamax.alpha
+            if abs(negamax.alpha) >= PROVEN_SCORE:
+                break
+
+        stats.move = game.move_to_str(best_move)
+        stats.value = self.value
+        stats.depth_reached = self.depth_reached
+        stats.seconds = time.perf_counter() - start
+        self.stats = stats
+        if self.log is not None:
+            self.log.write(stats)
+        return best_move
@@ -0,0 +1,176 @@
+import argparse
+import itertools
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from easyAI import Negamax
+from chomp_game.Chomp_Benchmark import CountingChomp
+from chomp_game.Chomp_TT import ChompTranspositionTable
+
+
+def play_game(width: int, height: int, depths: tuple[int, int], opening_moves: int, seed: int,
+              tt_capacity: int) -> dict:
+    """
+    Plays a single AI-vs-AI game without the GUI.
+
+    Parameters:
+    width (int): The board width.
+    height (int): The board height.
+    depths (tuple[int, int]): Negamax depth of the first and of the second player.
+    opening_moves (int): Number of random moves played before the AIs take over, so games differ.
+    seed (int): Seed of the random opening.
+    tt_capacity (int): Size of the transposition table of each player, 0 plays without one.
+
+    Returns:
+    dict: The winner, the number of moves and the nodes and seconds of every AI move.
+    """
+    rng = random.Random(seed)
+    game = CountingChomp(None, width, height)
+    algorithms = [Negamax(depth, tt=ChompTranspositionTable(tt_capacity) if tt_capacity else None)
+                  for depth in depths]
+    searches = []
+    moves = 0
+    while not game.is_over():
+        if moves < opening_moves:
+            # The poisoned field is only eaten when nothing else is left
+            move = rng.choice(game.possible_moves()[1:] or [0])
+        else:
+            CountingChomp.nodes = 0
+            start = time.perf_counter()
+            move = algorithms[game.current_player - 1](game)
+            searches.append((game.current_player, CountingChomp.nodes, time.perf_counter() - start))
+        game.make_move(move)
+        game.switch_player()
+        moves += 1
+    # The player who ate the poisoned field has just handed the turn to the winner
+    return {"winner": game.current_player, "moves": moves, "searches": searches}
+
+
+def percentile(values: list[float], percent: int) -> float:
+    """
+    Returns the given percentile of the values, interpolated between the closest ones.
+
+    Parameters:
+    values (list[float]): The values, at least one.
+    percent (int): The percentile, between 1 and 99.
+
+    Returns:
+    float: The percentile.
+    """
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def summarize(games: list[dict]) -> dict:
+    """
+    Aggregates the games played with one configuration.
+
+    Parameters:
+    games (list[dict]): Results of play_game.
+
+    Returns:
+    dict: Win rates, nodes searched, nodes/sec and time per move percentiles in milliseconds.
+    """
+    searches = [search for game in games for search in game["searches"]]
+    nodes = sum(search_nodes for _, search_nodes, _ in searches)
+    seconds = sum(search_seconds for _, _, search_seconds in searches)
+    move_ms = [search_seconds * 1000 for _, _, search_seconds in searches] or [0.0]
+    first_wins = sum(game["winner"] == 1 for game in games)
+    return {
+        "games": len(games),
+        "win_rate": {"first": first_wins / len(games), "second": 1 - first_wins / len(games)},
+        "moves_per_game": statistics.fmean(game["moves"] for game in games),
+        "ai_moves": len(searches),
+        "nodes": nodes,
+        "search_seconds": seconds,
+        "nodes_per_sec": nodes / seconds if seconds else 0.0,
+        "move_ms": {
+            "mean": statistics.fmean(move_ms),
+            "p50": percentile(move_ms, 50),
+            "p90": percentile(move_ms, 90),
+            "p99": percentile(move_ms, 99),
+            "max": max(move_ms),
+        },
+    }
+
+
+def _play_task(task: tuple) -> dict:
+    return play_game(*task)
+
+
+def run_tournament(boards: list[tuple[int, int]], depths: list[int], games: int, opening_moves: int = 1,
+                   seed: int = 0, tt_capacity: int = 100_000, processes: int = 1) -> list[dict]:
+    """
+    Plays every pairing of the depths on every board and aggregates the results.
+
+    Parameters:
+    boards (list[tuple[int, int]]): Board sizes as (width, height).
+    depths (list[int]): Negamax depths, every ordered pair of them plays.
+    games (int): Games per board and pairing.
+    opening_moves (int): Random moves at the start of every game.
+    seed (int): Base seed of the random openings, the results are reproducible for a given seed.
+    tt_capacity (int): Size of the transposition table of each player, 0 plays without one.
+    processes (int): Number of processes playing the games.
+
+    Returns:
+    list[dict]: One summary per board and pairing.
+    """
+    configs = [(width, height, pairing) for width, height in boards
+               for pairing in itertools.product(depths, repeat=2)]
+    tasks = [(width, height, pairing, opening_moves, seed + game, tt_capacity)
+             for width, height, pairing in configs for game in range(games)]
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_play_task, tasks, chunksize=max(1, len(tasks) // (processes * 4))))
+    else:
+        results = [_play_task(task) for task in tasks]
+
+    summaries = []
+    for index, (width, height, pairing) in enumerate(configs):
+        summary = {"board": f"{width}x{height}", "depths": list(pairing)}
+        summary.update(summarize(results[index * games:(index + 1) * games]))
+        summaries.append(summary)
+    return summaries
+
+
+def main() -> None:
+    """
+    Runs a headless self-play tournament and prints the results as JSON.
+    """
+    parser = argparse.ArgumentParser(description="Headless Chomp self-play tournament.")
+    parser.add_argument("--boards", nargs="+", default=["4x4", "5x5"], help="board sizes, e.g. 4x4")
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 4], help="Negamax depths, all pairings play")
+    parser.add_argument("--games", type=int, default=100, help="games per board and pairing")
+    parser.add_argument("--openings", type=int, default=1, help="random moves at the start of every game")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random openings")
+    parser.add_argument("--tt-capacity", type=int, default=100_000, help="transposition table size, 0 disables it")
+    parser.add_argument("--processes", type=int, default=1, help="processes playing the games")
+    parser.add_argument("--output", help="file to write the JSON to instead of stdout")
+    args = parser.parse_args()
+
+    boards = [tuple(map(int, board.lower().split("x"))) for board in args.boards]
+    start = time.perf_counter()
+    results = run_tournament(boards, args.depths, args.games, args.openings, args.seed,
+                             args.tt_capacity, args.processes)
+    report = {
+        "settings": vars(args),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seconds": time.perf_counter() - start,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from easyAI.AI.Negamax import EXACT
+from chomp_game.Chomp import Chomp
+from chomp_game.Chomp_Search import PROVEN_SCORE, IterativeDeepening
+from chomp_game.Chomp_Theory import canonical
+from chomp_game.Chomp_TT import ChompTranspositionTable
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_DEPTH = 15
+DEFAULT_BUDGET_MS = 1000
+DEFAULT_CACHE_CAPACITY = 100_000
+inf = float("infinity")
+
+# Every worker process keeps its own table between requests, see Chomp_Parallel
+_worker_tt: Optional[ChompTranspositionTable] = None
+
+
+def _init_worker(tt_capacity: int) -> None:
+    global _worker_tt
+    _worker_tt = ChompTranspositionTable(tt_capacity)
+
+
+def search_position(heights: tuple[int, ...], depth: int, budget_ms: int) -> tuple[tuple[int, int], float, int]:
+    """
+    Searches a position, this is the task run by the worker processes.
+
+    Parameters:
+    heights (tuple[int, ...]): Column heights of the position, without the eaten columns.
+    depth (int): The deepest Negamax search to run.
+    budget_ms (int): Wall-clock time for the search, in milliseconds.
+
+    Returns:
+    tuple[tuple[int, int], float, int]: Zero-based (x, y) of the best move, its value and the depth reached.
+    """
+    game = Chomp(None, len(heights), heights[0])
+    game.heights = heights
+    search = IterativeDeepening(depth, budget_ms, _worker_tt)
+    move = search(game)
+    return game.field(move), search.value, search.depth_reached
+
+
+class ChompSolverService:
+    """
+    Answers "best move for position" requests for many games at once. All requests share one
+    bounded position cache, keyed on the symmetry-canonical position, searches run in a pool of
+    processes and identical positions requested while one is being searched wait for that search.
+    """
+
+    def __init__(self, workers: Optional[int] = None, cache_capacity: int = DEFAULT_CACHE_CAPACITY,
+                 tt_capacity: int = 100_000, max_depth: int = DEFAULT_DEPTH,
+                 budget_ms: int = DEFAULT_BUDGET_MS) -> None:
+        """
+        Parameters:
+        workers (Optional[int]): Number of search processes, all CPU cores by default.
+        cache_capacity (int): Positions kept in the shared cache.
+        tt_capacity (int): Size of the transposition table of each search process.
+        max_depth (int): The deepest search a request can ask for.
+        budget_ms (int): Wall-clock time for a single search, in milliseconds.
+        """
+        self.workers: int = workers or os.cpu_count() or 1
+        self.max_depth: int = max_depth
+        self.budget_ms: int = budget_ms
+        # The transposition table is used as the cache: it keys on canonical positions and translates the moves
+        self.cache = ChompTranspositionTable(cache_capacity)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_init_worker, initargs=(tt_capacity,))
+        self.in_flight: dict[tuple[tuple[int, ...], int], asyncio.Future] = {}
+        self.requests: int = 0
+        self.coalesced: int = 0
+        self.searches: int = 0
+
+    async def best_move(self, width: int, height: int, heights: list[int], depth: Optional[int] = None) -> dict:
+        """
+        Finds the best move for a position.
+
+        Parameters:
+        width (int): The board width.
+        height (int): The board height.
+        heights (list[int]): Column heights of the position.
+        depth (Optional[int]): The deepest search to run, max_depth by default.
+
+        Returns:
+        dict: The move (see Chomp.move_at), its zero-based field, value and search depth, and whether
+        it came from the cache or from a search requested by someone else.
+        """
+        self.requests += 1
+        depth = min(depth or self.max_depth, self.max_depth)
+        game = Chomp(None, width, height)
+        game.heights = tuple(heights)
+        if (len(game.heights) != width or any(not 0 <= h <= height for h in game.heights)
+                or any(left < right for left, right in zip(game.heights, game.heights[1:]))):
+            raise ValueError(f"Heights {heights} are not a position on a {width}x{height} board.")
+        if game.is_over():
+            raise ValueError("The game is over.")
+
+        entry = self.cache.lookup(game)
+        # A search cut short by the budget got as deep as the budget allows, it answers requests up to its depth
+        if entry is not None and max(entry["depth"], entry.get("requested", 0)) >= depth:
+            return self.response(game, entry["move"], entry["value"], entry["depth"], cached=True)
+
+        key, transposed = canonical(game.ttentry())
+        coalesced = (key, depth) in self.in_flight
+        if coalesced:
+            self.coalesced += 1
+            future = self.in_flight[key, depth]
+        else:
+            self.searches += 1
+            future = asyncio.get_running_loop().run_in_executor(self.pool, search_position, key, depth, self.budget_ms)
+            self.in_flight[key, depth] = future
+            future.add_done_callback(lambda _: self.in_flight.pop((key, depth), None))
+        # Shielded, so a client going away does not cancel the search others are waiting for
+        (x, y), value, depth_reached = await asyncio.shield(future)
+        # Proven results hold at any depth, the others only as deep as the search got within the budget
+        stored_depth = inf if abs(value) >= PROVEN_SCORE else depth_reached
+        # Without a finished depth the move is only a fallback, it is not cached
+        if not coalesced and depth_reached > 0:
+            searched = Chomp(None, len(key), key[0])
+            searched.heights = key
+            self.cache.store(game=searched, depth=stored_depth, value=value, move=searched.move_at(x, y), flag=EXACT,
+                             requested=depth)
+        move = game.move_at(y, x) if transposed else game.move_at(x, y)
+        return self.response(game, move, value, stored_depth, coalesced=coalesced)
+
+    @staticmethod
+    def response(game: Chomp, move: int, value: float, depth: float, cached: bool = False,
+                 coalesced: bool = False) -> dict:
+        return {"move": move, "field": list(game.field(move)), "value": value,
+                "depth": depth if depth != inf else None, "cached": cached, "coalesced": coalesced}
+
+    def stats(self) -> dict:
+        """
+        Returns the usage counters of the service.
+
+        Returns:
+        dict: Requests, coalesced requests, searches, searches running and the cache counters.
+        """
+        return {"requests": self.requests, "coalesced": self.coalesced, "searches": self.searches,
+                "in_flight": len(self.in_flight), "cache": self.cache.stats()}
+
+    async def respond(self, line: bytes) -> dict:
+        """
+        Answers a single request line.
+
+        Parameters:
+        line (bytes): JSON request, {"stats": true} or {"width", "height", "heights", optional "depth"},
+        with an optional "id" copied to the response.
+
+        Returns:
+        dict: The response.
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            if request.get("stats"):
+                response = self.stats()
+            else:
+                response = await self.best_move(request["width"], request["height"], request["heights"],
+                                                request.get("depth"))
+        except Exception as error:
+            # Bad requests and failed searches are reported to the client, the service keeps running
+            response = {"error": f"{type(error).__name__}: {error}"}
+        response["id"] = request_id
+        return response
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves one connection: a JSON request per line, a JSON response per line. Requests are
+        answered as soon as they are ready, not necessarily in order, the id tells them apart.
+
+        Parameters:
+        reader (asyncio.StreamReader): The connection input.
+        writer (asyncio.StreamWriter): The connection output.
+        """
+        async def answer(line: bytes) -> None:
+            response = await self.respond(line)
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """
+        Accepts connections until cancelled.
+
+        Parameters:
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        """
+        server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        """
+        Shuts the search processes down.
+        """
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main() -> None:
+    """
+    Runs the solver service.
+    """
+    parser = argparse.ArgumentParser(description="Chomp best move service.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on")
+    parser.add_argument("--workers", type=int, help="search processes, all CPU cores by default")
+    parser.add_argument("--cache-capacity", type=int, default=DEFAULT_CACHE_CAPACITY, help="positions in the shared cache")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="deepest search a request can ask for")
+    parser.add_argument("--budget-ms", type=int, default=DEFAULT_BUDGET_MS, help="time for a single search")
+    args = parser.parse_args()
+
+    service = ChompSolverService(args.workers, args.cache_capacity, max_depth=args.depth, budget_ms=args.budget_ms)
+    print(f"Serving Chomp best moves on {args.host}:{args.port} with {service.workers} workers")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+import json
+import time
+from typing import Optional, TextIO
+from chomp_game.Chomp import Chomp
+
+
+class NodeCounter:
+    """
+    Counts the nodes a search visits on a game, by wrapping the make_move and possible_moves of that
+    single game object. Searches on unmade moves (see Chomp.unmake_move) keep working on it.
+    """
+
+    def __init__(self, game: Chomp) -> None:
+        """
+        Parameters:
+        game (Chomp): The game the search works on, its methods are wrapped.
+        """
+        self.nodes: int = 0
+        self.expanded: int = 0
+        self.moves: int = 0
+        make_move = game.make_move
+        possible_moves = game.possible_moves
+
+        def counting_make_move(move: int) -> None:
+            self.nodes += 1
+            make_move(move)
+
+        def counting_possible_moves() -> list[int]:
+            moves = possible_moves()
+            self.expanded += 1
+            self.moves += len(moves)
+            return moves
+
+        game.make_move = counting_make_move
+        game.possible_moves = counting_possible_moves
+
+    @property
+    def branching(self) -> float:
+        """
+        Returns the average number of moves in the positions the search expanded.
+
+        Returns:
+        float: The average branching factor.
+        """
+        return self.moves / self.expanded if self.expanded else 0.0
+
+
+class DepthStats:
+    """
+    Statistics of one iteration of an iterative deepening search.
+    """
+
+    def __init__(self, depth: int, nodes: int, seconds: float, branching: float, tt_hits: int, tt_misses: int,
+                 theory_hits: int, completed: bool, move: Optional[str] = None, value: Optional[float] = None) -> None:
+        """
+        Parameters:
+        depth (int): The search depth.
+        nodes (int): Moves made by the search.
+        seconds (float): Wall time of the search.
+        branching (float): Average number of moves in the expanded positions.
+        tt_hits (int): Positions found in the transposition table.
+        tt_misses (int): Positions not found in the transposition table.
+        theory_hits (int): Positions answered by known theory.
+        completed (bool): Whether the search finished within the time budget.
+        move (Optional[str]): The best move found, None if the search did not finish.
+        value (Optional[float]): The value of the best move, None if the search did not finish.
+        """
+        self.depth = depth
+        self.nodes = nodes
+        self.seconds = seconds
+        self.branching = branching
+        self.tt_hits = tt_hits
+        self.tt_misses = tt_misses
+        self.theory_hits = theory_hits
+        self.completed = completed
+        self.move = move
+        self.value = value
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class SearchStats:
+    """
+    Telemetry of the search for a single move, filled in by the AI algorithm.
+    """
+
+    def __init__(self, algorithm: str, game: Chomp) -> None:
+        """
+        Parameters:
+        algorithm (str): Name of the algorithm.
+        game (Chomp): The game in the searched position.
+        """
+        self.algorithm = algorithm
+        self.board = f"{game.max_x}x{game.max_y}"
+        self.fields = sum(game.heights)
+        self.player = game.current_player
+        self.timestamp = time.time()
+        self.move: Optional[str] = None
+        self.value: Optional[float] = None
+        self.depth_reached = 0
+        self.nodes = 0
+        self.seconds = 0.0
+        self.depths: list[DepthStats] = []
+        # Algorithm specific counters, e.g. MCTS iterations
+        self.extra: dict = {}
+
+    @property
+    def nodes_per_sec(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        """
+        Returns the statistics as plain data, ready for JSON.
+
+        Returns:
+        dict: The statistics.
+        """
+        data = {key: value for key, value in vars(self).items() if key != "depths"}
+        data["nodes_per_sec"] = self.nodes_per_sec
+        data["depths"] = [depth.to_dict() for depth in self.depths]
+        return data
+
+    def summary(self) -> str:
+        """
+        Describes the statistics in a few lines of text, for the debug panel of the GUI.
+
+        Returns:
+        str: The description.
+        """
+        lines = [
+            f"{self.algorithm} on {self.board}, {self.fields} fields left",
+            f"move {self.move}, value {self.value if self.value is None else round(self.value, 2)}",
+            f"depth {self.depth_reached}, {self.nodes} nodes in {self.seconds * 1000:.0f} ms "
+            f"({self.nodes_per_sec:.0f}/s)",
+        ]
+        lines += [f"{key} {value}" for key, value in self.extra.items()]
+        for depth in self.depths:
+            status = "" if depth.completed else " (timed out)"
+            lines.append(f"  d{depth.depth}: {depth.nodes} nodes, {depth.seconds * 1000:.1f} ms, "
+                         f"branching {depth.branching:.1f}, tt {depth.tt_hits}/{depth.tt_hits + depth.tt_misses}, "
+                         f"theory {depth.theory_hits}{status}")
+        return "\n".join(lines)
+
+
+class SearchLog:
+    """
+    Appends the statistics of every search to a JSON Lines file, one object per move.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Parameters:
+        path (str): The log file, it is appended to.
+        """
+        self.file: TextIO = open(path, "a", encoding="utf-8")
+
+    def write(self, stats: SearchStats) -> None:
+        """
+        Writes the statistics of a search as a single line.
+
+        Parameters:
+        stats (SearchStats): The statistics.
+        """
+        self.file.write(json.dumps(stats.to_dict()) + "\n")
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
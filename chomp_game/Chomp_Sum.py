@@ -0,0 +1,279 @@
+import argparse
+import time
+from functools import reduce
+from operator import xor
+from typing import Optional
+from easyAI import AI_Player, Human_Player, Player, TwoPlayerGame
+from chomp_game.Chomp import Chomp
+from chomp_game.Chomp_Theory import canonical, smallest_bite
+
+
+class ChompSum(TwoPlayerGame):
+    """
+    Disjunctive sum of Chomp boards: on every turn the player picks one board and chomps it.
+    Eating a poisoned field loses, so it is only played when every board is down to its poisoned field.
+    Moves are (board, move) pairs, where move is the Chomp move on that board (see Chomp.move_at).
+    """
+
+    def __init__(self, players: list[Player] = None, sizes: list[tuple[int, int]] = ((5, 5),)):
+        """
+        Parameters:
+        players (list[Player]): The two players.
+        sizes (list[tuple[int, int]]): Width and height of every board.
+        """
+        self.players: list[Player] = players
+        self.boards: list[Chomp] = [Chomp(None, width, height) for width, height in sizes]
+        # Boards the moves were made on, unmake_move takes them back in reverse order
+        self.moved_boards: list[int] = []
+        self.current_player: int = 1
+
+    def possible_moves(self) -> list[tuple[int, int]]:
+        """
+        function required by easyAI, lists possible moves.
+        The poisoned fields are only listed when nothing else is left.
+
+        Returns:
+        list[tuple[int, int]]:Returning value
+        """
+        moves = [(index, move) for index, board in enumerate(self.boards) for move in board.possible_moves()[1:]]
+        return moves or [(index, 0) for index in range(len(self.boards))]
+
+    def make_move(self, move: tuple[int, int]):
+        """
+        Chomps one of the boards.
+
+        Parameters:
+        move (tuple[int, int]): The index of the board and the move on it.
+        """
+        index, board_move = move
+        self.boards[index].make_move(board_move)
+        self.moved_boards.append(index)
+
+    def unmake_move(self, move: tuple[int, int]):
+        """
+        function used by easyAI, takes back the last move made.
+
+        Parameters:
+        move (tuple[int, int]): The move to take back, it has to be the last move made.
+        """
+        self.boards[self.moved_boards.pop()].unmake_move(move[1])
+
+    def copy(self) -> 'ChompSum':
+        """
+        function used by easyAI instead of deepcopy, the players are shared.
+
+        Returns:
+        ChompSum:Returning value
+        """
+        game = type(self).__new__(type(self))
+        game.__dict__.update(self.__dict__)
+        game.boards = [board.copy() for board in self.boards]
+        game.moved_boards = self.moved_boards.copy()
+        return game
+
+    def ttentry(self) -> tuple[tuple[int, ...], ...]:
+        """
+        function used by easyAI transposition tables, describes the position.
+
+        Returns:
+        tuple[tuple[int, ...], ...]:Returning value
+        """
+        return tuple(board.ttentry() for board in self.boards)
+
+    def win(self) -> bool:
+        """
+        function required by easyAI, determines whether a player wins: the opponent has eaten a poisoned field.
+
+        Returns:
+        bool:Returning value
+        """
+        return any(board.win() for board in self.boards)
+
+    def is_over(self) -> bool:
+        """
+        function required by easyAI, returns win() function result
+
+        Returns:
+        bool:Returning value
+        """
+        return self.win()
+
+    def show(self):
+        """
+        function that display the boards in terminal.
+        """
+        for index, board in enumerate(self.boards):
+            print(f"Board {index}:")
+            for row in board.board:
+                print(row)
+        print()
+        if self.win():
+            print(f"Player {2 if self.current_player == 1 else 1} wins!")
+
+    def scoring(self) -> int:
+        """
+        function required by easyAI, determines when to reward ai for his move
+
+        Returns:
+        int:Returning value
+        """
+        return 100 if self.win() else 0
+
+
+class GrundySolver:
+    """
+    Memoized Sprague-Grundy values of single Chomp positions. A board down to its poisoned field
+    has no moves and the value 0, any other position has the mex (minimum excluded value) of the
+    values of the positions its moves lead to. A position and its transpose share one entry.
+    """
+
+    def __init__(self) -> None:
+        self.values: dict[tuple[int, ...], int] = {(1,): 0}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @staticmethod
+    def successors(heights: tuple[int, ...]) -> list[tuple[tuple[int, ...], tuple[int, int]]]:
+        """
+        Lists the positions reachable in one move, except by eating the poisoned field.
+
+        Parameters:
+        heights (tuple[int, ...]): Column heights of the position, without the eaten columns.
+
+        Returns:
+        list[tuple[tuple[int, ...], tuple[int, int]]]: The positions, without the eaten columns,
+        with the zero-based (x, y) of the field eaten to reach them.
+        """
+        positions = []
+        for x, height in enumerate(heights):
+            for y in range(1 if x == 0 else 0, height):
+                if y == 0:
+                    positions.append((heights[:x], (x, y)))
+                else:
+                    positions.append((heights[:x] + tuple(h if h < y else y for h in heights[x:]), (x, y)))
+        return positions
+
+    def grundy(self, heights: tuple[int, ...]) -> int:
+        """
+        Returns the Grundy value of a position.
+
+        Parameters:
+        heights (tuple[int, ...]): Column heights of the position.
+
+        Returns:
+        int: The Grundy value, 0 for a lost position.
+        """
+        key, _ = canonical(heights)
+        value = self.values.get(key)
+        if value is not None:
+            return value
+        # Iterative post-order over the unsolved positions, deep boards would exceed the recursion limit
+        stack = [key]
+        # Successors of the positions on the stack, so they are listed once
+        expanded: dict[tuple[int, ...], set[tuple[int, ...]]] = {}
+        while stack:
+            position = stack[-1]
+            if position in self.values:
+                stack.pop()
+                continue
+            successors = expanded.get(position)
+            if successors is None:
+                successors = expanded[position] = {canonical(successor)[0] for successor, _ in self.successors(position)}
+            pending = [successor for successor in successors if successor not in self.values]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            del expanded[position]
+            seen = {self.values[successor] for successor in successors}
+            value = 0
+            while value in seen:
+                value += 1
+            self.values[position] = value
+        return self.values[key]
+
+    def move_to_value(self, heights: tuple[int, ...], target: int) -> Optional[tuple[int, int]]:
+        """
+        Finds a move into a position with the given Grundy value.
+
+        Parameters:
+        heights (tuple[int, ...]): Column heights of the position.
+        target (int): The Grundy value to reach.
+
+        Returns:
+        Optional[tuple[int, int]]: Zero-based (x, y) of the move, None if there is none.
+        """
+        heights = heights[:len(heights) - heights.count(0)]
+        for successor, field in self.successors(heights):
+            if self.grundy(successor) == target:
+                return field
+        return None
+
+
+class SpragueGrundy:
+    """
+    easyAI algorithm playing a ChompSum perfectly without searching the product of the boards:
+    the sum is lost for the player to move exactly when the XOR of the Grundy values of the boards is 0,
+    otherwise a move on one board brings it to 0. In a lost sum the smallest bite is taken.
+    Use it as AI_Player(SpragueGrundy()).
+    """
+
+    def __init__(self, solver: Optional[GrundySolver] = None) -> None:
+        """
+        Parameters:
+        solver (Optional[GrundySolver]): Grundy values shared with other players, a new solver by default.
+        """
+        self.solver: GrundySolver = solver or GrundySolver()
+        self.value: int = 0
+
+    def __call__(self, game: ChompSum) -> tuple[int, int]:
+        """
+        Returns the move for the current position of the game.
+
+        Parameters:
+        game (ChompSum): The game to find a move for.
+
+        Returns:
+        tuple[int, int]: The board and the move on it.
+        """
+        values = [self.solver.grundy(board.ttentry()) for board in game.boards]
+        self.value = reduce(xor, values, 0)
+        if self.value:
+            for index, (board, value) in enumerate(zip(game.boards, values)):
+                target = value ^ self.value
+                if target < value:
+                    # A position with value v has moves into every smaller value
+                    return index, board.move_at(*self.solver.move_to_value(board.heights, target))
+        playable = [(index, board) for index, board in enumerate(game.boards) if sum(board.heights) > 1]
+        if not playable:
+            return 0, 0
+        index, board = playable[0]
+        return index, board.move_at(*smallest_bite(board.ttentry()))
+
+
+def main() -> None:
+    """
+    Solves a sum of Chomp boards and plays it, AI against AI or against a human in the terminal.
+    """
+    parser = argparse.ArgumentParser(description="Sums of Chomp boards solved with Sprague-Grundy values.")
+    parser.add_argument("--boards", nargs="+", default=["3x4", "5x2", "4x4", "6x3", "2x7"], help="board sizes, e.g. 4x4")
+    parser.add_argument("--human", action="store_true", help="play against the AI in the terminal")
+    args = parser.parse_args()
+
+    sizes = [tuple(map(int, board.lower().split("x"))) for board in args.boards]
+    solver = GrundySolver()
+    start = time.perf_counter()
+    values = [solver.grundy((height,) * width) for width, height in sizes]
+    total = reduce(xor, values, 0)
+    print(f"Grundy values {values}, XOR {total}: the first player {'wins' if total else 'loses'} "
+          f"({len(solver)} positions solved in {time.perf_counter() - start:.3f} s)")
+
+    first = Human_Player() if args.human else AI_Player(SpragueGrundy(solver))
+    game = ChompSum([first, AI_Player(SpragueGrundy(solver))], sizes)
+    game.play(verbose=args.human)
+    print(f"Player {game.current_player} wins after {len(game.moved_boards)} moves.")
+
+
+if __name__ == '__main__':
+    main()
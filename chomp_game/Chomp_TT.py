@@ -0,0 +1,157 @@
+from collections import OrderedDict
+from typing import Optional
+from easyAI.AI.Negamax import EXACT
+from chomp_game.Chomp import Chomp
+from chomp_game.Chomp_Theory import WIN_SCORE, canonical, known_result
+
+DEFAULT_CAPACITY = 100_000
+inf = float("infinity")
+
+
+class ChompTranspositionTable:
+    """
+    Bounded transposition table for the easyAI Negamax playing Chomp.
+
+    Entries are keyed by the canonical form of the position (see Chomp_Theory.canonical), so a
+    position and its transpose share one entry, and hold what Negamax stores: depth, value, move
+    and an EXACT / LOWERBOUND / UPPERBOUND flag. Moves are kept as fields of the canonical
+    position and translated back for the board they are looked up on. When a position is stored
+    again, the deeper search is kept (depth-preferred replacement). When the table is full,
+    the least recently used entry is evicted.
+
+    Positions with a known winning strategy are answered without being stored, as exact results
+    of an infinitely deep search.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, theory: bool = True) -> None:
+        """
+        Initializes an empty table.
+
+        Parameters:
+        capacity (int): Maximum number of positions kept in the table.
+        theory (bool): Whether to answer the positions with a known winning strategy.
+        """
+        if capacity < 1:
+            raise ValueError("Transposition table capacity must be at least 1.")
+        self.capacity: int = capacity
+        self.theory: bool = theory
+        self.entries: OrderedDict[tuple[int, ...], dict] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stores: int = 0
+        self.evictions: int = 0
+        self.theory_hits: int = 0
+
+    def lookup(self, game: Chomp) -> Optional[dict]:
+        """
+        function required by easyAI, returns the stored entry for the position or None.
+
+        Parameters:
+        game (Chomp): The game in the position to look up.
+
+        Returns:
+        Optional[dict]: The stored entry.
+        """
+        key, transposed = canonical(game.ttentry())
+        if self.theory:
+            known = known_result(key)
+            if known is not None:
+                self.theory_hits += 1
+                won, field = known
+                return {"depth": inf, "value": WIN_SCORE if won else -WIN_SCORE,
+                        "move": self._to_move(game, field, transposed), "flag": EXACT}
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return dict(entry, move=self._to_move(game, entry["move"], transposed))
+
+    def store(self, **data) -> None:
+        """
+        function required by easyAI, stores the search result for a position.
+
+        Parameters:
+        data (dict): The game and the depth, value, move and flag of the search.
+        """
+        game = data.pop("game")
+        key, transposed = canonical(game.ttentry())
+        x, y = game.field(data["move"])
+        data["move"] = (y, x) if transposed else (x, y)
+        entry = self.entries.get(key)
+        if entry is not None:
+            # Keep the deeper result, an exact value wins a tie with a bound
+            if entry["depth"] > data["depth"] or (entry["depth"] == data["depth"] and entry["flag"] == EXACT
+                                                  and data["flag"] != EXACT):
+                self.entries.move_to_end(key)
+                return
+        elif len(self.entries) >= self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        self.entries[key] = data
+        self.entries.move_to_end(key)
+        self.stores += 1
+
+    def __call__(self, game: Chomp) -> int:
+        """
+        Lets the table be used as an easyAI algorithm, it has to contain the position.
+
+        Parameters:
+        game (Chomp): The game to find a move for.
+
+        Returns:
+        int: The stored best move.
+        """
+        key, transposed = canonical(game.ttentry())
+        return self._to_move(game, self.entries[key]["move"], transposed)
+
+    @staticmethod
+    def _to_move(game: Chomp, field: tuple[int, int], transposed: bool) -> int:
+        x, y = field
+        return game.move_at(y, x) if transposed else game.move_at(x, y)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Returns the fraction of lookups that found a stored position.
+
+        Returns:
+        float: Hit rate between 0 and 1.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        """
+        Returns the usage counters of the table.
+
+        Returns:
+        dict: Entries, capacity, hits, misses, hit rate, stores, evictions and theory hits.
+        """
+        return {
+            "entries": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "theory_hits": self.theory_hits,
+        }
+
+    def reset_stats(self) -> None:
+        """
+        Resets the usage counters, the stored positions are kept.
+        """
+        self.hits = self.misses = self.stores = self.evictions = self.theory_hits = 0
+
+    def clear(self) -> None:
+        """
+        Removes all stored positions and resets the counters.
+        """
+        self.entries.clear()
+        self.reset_stats()
@@ -0,0 +1,278 @@
+import argparse
+import mmap
+import struct
+import sys
+import time
+from array import array
+from math import comb
+from pathlib import Path
+from typing import Iterator, Optional
+from easyAI import AI_Player
+from chomp_game.Chomp import Chomp
+from chomp_game.Chomp_Theory import smallest_bite, transpose
+
+TABLEBASE_PATH = Path(__file__).with_name("chomp_tablebase.bin")
+MAGIC = b"CHMP"
+VERSION = 1
+# magic, version, columns, rows, number of positions
+HEADER = struct.Struct("<4sHHHQ")
+CODE = struct.Struct("<H")
+LOSS = 0
+
+
+def rank_weights(columns: int, rows: int) -> list[list[int]]:
+    """
+    Builds the weights of the perfect rank of a staircase shape.
+
+    The shapes that fit in columns x rows are the non-increasing sequences of column heights, there are
+    comb(columns + rows, columns) of them. Ranking them in lexicographic order gives
+    rank(heights) = sum(weights[x][heights[x]]) with weights[x][v] = comb(k + v, k + 1), k = columns - x - 1.
+
+    Parameters:
+    columns (int): The number of columns of the largest board.
+    rows (int): The number of rows of the largest board.
+
+    Returns:
+    list[list[int]]: weights[x][height] for every column and height.
+    """
+    return [[comb(columns - x - 1 + height, columns - x) for height in range(rows + 1)] for x in range(columns)]
+
+
+def staircases(columns: int, rows: int) -> Iterator[tuple[int, ...]]:
+    """
+    Generates every staircase shape that fits in columns x rows, in the order of their rank.
+
+    Parameters:
+    columns (int): The number of columns of the largest board.
+    rows (int): The number of rows of the largest board.
+
+    Returns:
+    Iterator[tuple[int, ...]]: Column heights of the shapes.
+    """
+    if columns == 0:
+        yield ()
+        return
+    for first in range(rows + 1):
+        for rest in staircases(columns - 1, first):
+            yield (first,) + rest
+
+
+def solve(columns: int, rows: int) -> array:
+    """
+    Solves every position up to columns x rows by retrograde analysis.
+
+    Successors of a position always have a smaller rank, so positions are labelled in the order of
+    their rank: a position is won when some move leads to a lost position. The empty board is the
+    position after the poisoned field was eaten, the player to move has already won there.
+
+    Parameters:
+    columns (int): The number of columns of the largest board.
+    rows (int): The number of rows of the largest board.
+
+    Returns:
+    array: One code per rank, 0 for a lost position, otherwise x * rows + y + 1 of a winning move.
+    """
+    if columns * rows >= 1 << 16:
+        raise ValueError("Tablebase moves are stored on 16 bits, columns * rows must be below 65536.")
+    weights = rank_weights(columns, rows)
+    # row_sums[y][x] - sum of weights[j][y] for j >= x, the rank part of columns cut down to height y
+    row_sums = [[0] * (columns + 1) for _ in range(rows + 1)]
+    for y in range(rows + 1):
+        for x in range(columns - 1, -1, -1):
+            row_sums[y][x] = row_sums[y][x + 1] + weights[x][y]
+
+    total = comb(columns + rows, columns)
+    codes = array("H", bytes(CODE.size * total))
+    lost = bytearray(total)
+    prefix = [0] * (columns + 1)
+    suffix = [0] * (columns + 1)
+    reach = [0] * (rows + 1)
+
+    for rank, heights in enumerate(staircases(columns, rows)):
+        if rank == 0:
+            continue
+        for x in range(columns):
+            prefix[x + 1] = prefix[x] + weights[x][heights[x]]
+        for x in range(columns - 1, -1, -1):
+            suffix[x] = suffix[x + 1] + weights[x][heights[x]]
+        # reach[y] - number of columns at least y high, the columns a bite at height y can lower
+        for y in range(rows + 1):
+            reach[y] = 0
+        for height in heights:
+            for y in range(height + 1):
+                reach[y] += 1
+
+        code = LOSS
+        for x in range(columns):
+            height = heights[x]
+            if height == 0:
+                break
+            for y in range(height):
+                if x == 0 and y == 0:
+                    continue  # Eating the poisoned field never wins
+                end = reach[y]
+                successor = prefix[x] + row_sums[y][x] - row_sums[y][end] + suffix[end]
+                if lost[successor]:
+                    code = x * rows + y + 1
+                    break
+            if code != LOSS:
+                break
+        if code == LOSS:
+            lost[rank] = 1
+        else:
+            codes[rank] = code
+    return codes
+
+
+def write_tablebase(path: Path, columns: int, rows: int, codes: array) -> None:
+    """
+    Writes solved codes to a binary file: the header followed by one little-endian uint16 per rank.
+
+    Parameters:
+    path (Path): The file to write.
+    columns (int): The number of columns of the largest board.
+    rows (int): The number of rows of the largest board.
+    codes (array): Codes returned by solve().
+    """
+    if sys.byteorder == "big":
+        codes = array("H", codes)
+        codes.byteswap()
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, columns, rows, len(codes)))
+        file.write(codes.tobytes())
+
+
+class ChompTablebase:
+    """
+    Memory-mapped tablebase written by this module. It is an easyAI algorithm, use it as
+    AI_Player(ChompTablebase(path)) or TablebasePlayer(path): every move is a single lookup, no search.
+    """
+
+    def __init__(self, path: Path = TABLEBASE_PATH) -> None:
+        """
+        Opens and maps the tablebase file.
+
+        Parameters:
+        path (Path): The tablebase file.
+        """
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.columns, self.rows, self.positions = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a Chomp tablebase (version {VERSION}).")
+        if len(self._map) != HEADER.size + CODE.size * self.positions:
+            self._map.close()
+            raise ValueError(f"{path} is truncated.")
+        self._weights = rank_weights(self.columns, self.rows)
+
+    def covers(self, width: int, height: int) -> bool:
+        """
+        Checks whether every position of a width x height board, or of its transpose, is in the tablebase.
+
+        Parameters:
+        width (int): The board width.
+        height (int): The board height.
+
+        Returns:
+        bool: Whether the board fits in the tablebase.
+        """
+        return (width <= self.columns and height <= self.rows) or (height <= self.columns and width <= self.rows)
+
+    def rank(self, heights: tuple[int, ...]) -> int:
+        """
+        Returns the index of a position in the tablebase.
+
+        Parameters:
+        heights (tuple[int, ...]): Column heights of the position.
+
+        Returns:
+        int: The rank of the position.
+        """
+        weights = self._weights
+        return sum(weights[x][height] for x, height in enumerate(heights) if height)
+
+    def winning_move(self, heights: tuple[int, ...]) -> Optional[tuple[int, int]]:
+        """
+        Looks up the winning move of a position.
+
+        Parameters:
+        heights (tuple[int, ...]): Column heights of the position.
+
+        Returns:
+        Optional[tuple[int, int]]: Zero-based (x, y) of a winning move, None if the position is lost.
+        """
+        code, = CODE.unpack_from(self._map, HEADER.size + CODE.size * self.rank(heights))
+        if code == LOSS:
+            return None
+        return divmod(code - 1, self.rows)
+
+    def __call__(self, game: Chomp) -> int:
+        """
+        Returns the move for the current position of the game. In a lost position the smallest
+        possible bite is taken, the opponent still has to find the win. Positions that only fit
+        in the tablebase transposed are looked up transposed.
+
+        Parameters:
+        game (Chomp): The game to find a move for.
+
+        Returns:
+        int: The move.
+        """
+        heights = game.ttentry()
+        transposed = len(heights) > self.columns or heights[0] > self.rows
+        if transposed:
+            heights = transpose(heights)
+            if len(heights) > self.columns or heights[0] > self.rows:
+                raise ValueError(f"Position does not fit in the {self.columns}x{self.rows} tablebase.")
+        field = self.winning_move(heights) or smallest_bite(heights)
+        x, y = field
+        return game.move_at(y, x) if transposed else game.move_at(x, y)
+
+    def close(self) -> None:
+        """
+        Unmaps the tablebase file.
+        """
+        self._map.close()
+
+    def __enter__(self) -> "ChompTablebase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TablebasePlayer(AI_Player):
+    """
+    AI player answering every move from a precomputed tablebase.
+    """
+
+    def __init__(self, path: Path = TABLEBASE_PATH, name: str = "Tablebase") -> None:
+        """
+        Parameters:
+        path (Path): The tablebase file.
+        name (str): The player name.
+        """
+        super().__init__(ChompTablebase(path), name)
+
+
+def main() -> None:
+    """
+    Solves every position up to the given size and writes the tablebase.
+    """
+    parser = argparse.ArgumentParser(description="Precompute a Chomp tablebase.")
+    parser.add_argument("--columns", type=int, default=9, help="largest board width")
+    parser.add_argument("--rows", type=int, default=9, help="largest board height")
+    parser.add_argument("--output", type=Path, default=TABLEBASE_PATH, help="tablebase file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    codes = solve(args.columns, args.rows)
+    write_tablebase(args.output, args.columns, args.rows, codes)
+    lost = codes.count(LOSS) - 1  # The empty board is stored as 0 too
+    print(f"{len(codes)} positions ({lost} lost) up to {args.columns}x{args.rows} "
+          f"solved in {time.perf_counter() - start:.1f} s, written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
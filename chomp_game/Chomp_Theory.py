@@ -0,0 +1,101 @@
+from typing import Optional
+
+# Value of a position known to be won for the player to move, the same as Chomp.scoring gives a win
+WIN_SCORE = 100
+
+
+def transpose(heights: tuple[int, ...]) -> tuple[int, ...]:
+    """
+    Returns the position mirrored along the diagonal, its columns become rows.
+    A position and its transpose are strategically equivalent, a move (x, y) in one is (y, x) in the other.
+
+    Parameters:
+    heights (tuple[int, ...]): Column heights of the position.
+
+    Returns:
+    tuple[int, ...]: Column heights of the transposed position, without the eaten columns.
+    """
+    width = len(heights) - heights.count(0)
+    transposed = []
+    for y in range(heights[0] if width else 0):
+        # Heights never grow to the right, so the row lengths never grow upwards
+        while heights[width - 1] <= y:
+            width -= 1
+        transposed.append(width)
+    return tuple(transposed)
+
+
+def canonical(heights: tuple[int, ...]) -> tuple[tuple[int, ...], bool]:
+    """
+    Returns the canonical form of a position, the lexicographically smaller of the position and its transpose.
+
+    Parameters:
+    heights (tuple[int, ...]): Column heights of the position.
+
+    Returns:
+    tuple[tuple[int, ...], bool]: The canonical heights, without the eaten columns, and whether they are transposed.
+    """
+    heights = heights[:len(heights) - heights.count(0)]
+    transposed = transpose(heights)
+    if transposed < heights:
+        return transposed, True
+    return heights, False
+
+
+def smallest_bite(heights: tuple[int, ...]) -> tuple[int, int]:
+    """
+    Returns the top field of the last column, the move eating a single field.
+
+    Parameters:
+    heights (tuple[int, ...]): Column heights of the position, without the eaten columns.
+
+    Returns:
+    tuple[int, int]: Zero-based (x, y) of the field.
+    """
+    x = len(heights) - 1
+    return x, heights[x] - 1
+
+
+def known_result(heights: tuple[int, ...]) -> Optional[tuple[bool, tuple[int, int]]]:
+    """
+    Solves the positions with a known winning strategy without searching:
+    - L-shapes (including a single row or column) are Nim with two heaps, the arms,
+      they are lost when the arms are equal and won by evening them out,
+    - square boards are won by eating (2, 2) which leaves an L-shape with equal arms,
+    - positions with two rows (or two columns) are lost when the bottom row is one field
+      longer than the top one and won by moving to such a position.
+    In a lost position the move is the smallest bite, the opponent still has to find the win.
+
+    Parameters:
+    heights (tuple[int, ...]): Column heights of the position, without the eaten columns.
+
+    Returns:
+    Optional[tuple[bool, tuple[int, int]]]: Whether the player to move wins and the zero-based (x, y)
+    of the move to play, None if the position is not known.
+    """
+    if not heights:
+        return None
+    width = len(heights)
+    height = heights[0]
+
+    if heights.count(1) >= width - 1:
+        # L-shape, the arms are the fields above and to the right of the poisoned one
+        up, right = height - 1, width - 1
+        if up == right:
+            return False, smallest_bite(heights)
+        return True, ((0, right + 1) if up > right else (up + 1, 0))
+
+    if width == height and heights[-1] == height:
+        return True, (1, 1)
+
+    if height == 2:
+        top = heights.count(2)
+        if width == top + 1:
+            return False, smallest_bite(heights)
+        return True, ((top + 1, 0) if width > top + 1 else (width - 1, 1))
+
+    if width == 2:
+        won, (x, y) = known_result(transpose(heights))
+        return won, (y, x)
+
+    return None
@@ -0,0 +1,19 @@
+import numpy as np
+
+from chomp_game.Chomp_Batch import known_lost
+from chomp_game.Chomp_Theory import known_result
+
+
+def test_known_lost_empty_board():
+    # The poisoned field was eaten, Chomp.win counts the board as won by the player to move
+    heights = np.array([[0, 0, 0], [3, 3, 0], [1, 0, 0]], dtype=np.int32)
+    assert known_lost(heights).tolist() == [0, 0, 1]
+
+
+def test_known_lost_matches_known_result():
+    rows = [(1,), (2, 1), (2, 2), (3, 1, 1), (3, 2), (2, 2, 1), (3, 3, 3), (3, 3, 2), (4, 2, 1)]
+    width = max(map(len, rows)) + 1
+    heights = np.array([row + (0,) * (width - len(row)) for row in rows], dtype=np.int32)
+    for row, lost in zip(rows, known_lost(heights)):
+        result = known_result(row)
+        assert lost == (-1 if result is None else int(not result[0])), row
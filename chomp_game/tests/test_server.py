@@ -0,0 +1,19 @@
+import asyncio
+
+from chomp_game.Chomp_Server import ChompSolverService
+
+
+def test_repeated_unproven_request_is_cached():
+    async def requests() -> list[dict]:
+        service = ChompSolverService(workers=1, budget_ms=50)
+        try:
+            # A full 9x8 board is not solved within the budget, the search is cut short
+            return [await service.best_move(9, 8, [8] * 9) for _ in range(2)]
+        finally:
+            service.close()
+
+    first, second = asyncio.run(requests())
+    assert first["depth"] is not None and first["depth"] < 15
+    assert not first["cached"]
+    assert second["cached"]
+    assert (second["move"], second["depth"]) == (first["move"], first["depth"])